@@ -0,0 +1,235 @@
+"""
+오프라인 부하 벤치마크: main.app을 프로세스 안에서 띄우고 시나리오별로 고정 동시성 요청을 보내 처리량/지연 분위수 측정
+
+사용법 (AI 디렉터리에서):
+    python -m bench.run                                   # SQLite(/tmp/t4p_bench.db) + 대역 OpenAI/ODSAY
+    python -m bench.run --scenarios schedule,restaurant --requests 200 --concurrency 16
+    python -m bench.run --database-url postgresql://... --database-url-async postgresql+asyncpg://...
+    python -m bench.run --json results.json               # 변경 전후 비교용 결과 저장
+    python -m bench.run --upstream http://127.0.0.1:8900  # bench.standin_server 로 실제 HTTP 호출 (장애 주입)
+
+OpenAI / ODSAY는 bench.standins 의 대역으로 교체되므로 API 키나 네트워크가 필요 없음
+--upstream 을 주면 교체 대신 base URL만 대역 서버로 돌려 HTTP 클라이언트/재시도/타임아웃 경로까지 측정
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_DB = "/tmp/t4p_bench.db"
+
+EMOTIONS = [["설렘", "힐링"], ["신남"], ["여유", "감성"]]
+COMPANIONS = [["친구"], ["연인"], ["가족"], ["혼자"]]
+ATMOSPHERES = [["조용한"], ["데이트"], ["가족모임", "뷰 맛집"]]
+FOODS = [["한식"], ["일식", "양식"], ["카페"]]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="T4P API 오프라인 벤치마크")
+    parser.add_argument("--scenarios", default="all", help="쉼표 구분 시나리오 이름 또는 all")
+    parser.add_argument("--requests", type=int, default=100, help="시나리오당 측정 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5, help="시나리오당 측정 제외 요청 수")
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--llm-jitter-ms", type=float, default=300)
+    parser.add_argument("--odsay-latency-ms", type=float, default=120)
+    parser.add_argument("--odsay-jitter-ms", type=float, default=60)
+    parser.add_argument("--database-url", default=f"sqlite:///{DEFAULT_DB}")
+    parser.add_argument("--database-url-async", default=f"sqlite+aiosqlite:///{DEFAULT_DB}")
+    parser.add_argument("--llm-cache", action="store_true", help="LLM 응답 캐시 사용 (기본은 꺼서 매번 호출)")
+    parser.add_argument("--reseed", action="store_true", help="샘플 데이터를 지우고 다시 적재")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--upstream", help="bench.standin_server 주소 (예: http://127.0.0.1:8900)")
+    return parser.parse_args()
+
+
+def configure_env(args):
+    # config.settings 가 import 시점에 환경변수를 읽으므로 app import 전에 설정
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["DATABASE_URL_ASYNC"] = args.database_url_async
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ.setdefault("ODSAY_API_KEY", "bench")
+    os.environ["LLM_CACHE_ENABLED"] = "true" if args.llm_cache else "false"
+    if args.upstream:
+        upstream = args.upstream.rstrip("/")
+        os.environ["OPENAI_BASE_URL"] = f"{upstream}/v1"
+        os.environ["ODSAY_BASE_URL"] = f"{upstream}/v1/api"
+
+
+# 시나리오 ----------------------------------------------------------------------------
+
+def build_scenarios(samples: dict) -> dict:
+    """이름 → (method, path, payload 생성 함수)"""
+    rng = random.Random(7)
+    destinations = samples["destinations"]
+    meals = samples["meals"]
+
+    def trip_dates():
+        start = date.today() + timedelta(days=rng.randint(7, 60))
+        return start.isoformat(), (start + timedelta(days=rng.randint(0, 2))).isoformat()
+
+    def schedule():
+        start, end = trip_dates()
+        return {
+            "endCity": "서울", "startDate": start, "endDate": end,
+            "emotions": rng.choice(EMOTIONS), "companions": rng.choice(COMPANIONS),
+            "peopleCount": rng.randint(1, 4),
+        }
+
+    def restaurant():
+        return {
+            "companion": rng.choice(COMPANIONS), "foodPreference": rng.choice(FOODS),
+            "atmospheres": rng.choice(ATMOSPHERES), "city": "서울", "region": rng.choice(["마포구", "종로구", "강남구"]),
+        }
+
+    def place_detail():
+        return {
+            "placeId": rng.choice(destinations)[0], "emotions": rng.choice(EMOTIONS),
+            "companions": rng.choice(COMPANIONS), "peopleCount": rng.randint(1, 4),
+        }
+
+    def food_detail():
+        return {
+            "placeId": rng.choice(meals)[0], "companions": rng.choice(COMPANIONS),
+            "atmospheres": rng.choice(ATMOSPHERES),
+        }
+
+    def schedule_budget():
+        plans = []
+        for day in (1, 2):
+            picks = rng.sample(destinations, 2) + rng.sample(meals, 2)
+            plans.append({"day": day, "schedule": [
+                {"time": f"{9 + 3 * i:02d}:00", "place": name, "placeId": pid, "latitude": lat, "longitude": lng}
+                for i, (pid, name, lat, lng) in enumerate(picks)
+            ]})
+        return {"plans": plans, "peopleCount": rng.randint(1, 4), "endCity": "서울"}
+
+    def quick_budget():
+        start, end = trip_dates()
+        return {"startCity": "부산", "endCity": "서울", "startDate": start, "endDate": end,
+                "peopleNum": rng.randint(1, 4)}
+
+    return {
+        "schedule": ("POST", "/ai/schedule", schedule),
+        "restaurant": ("POST", "/ai/restaurant", restaurant),
+        "place_detail": ("POST", "/api/places-detail", place_detail),
+        "food_detail": ("POST", "/api/food-places-detail", food_detail),
+        "schedule_budget": ("POST", "/api/schedules/budgets", schedule_budget),
+        "quick_budget": ("POST", "/api/budgets", quick_budget),
+        "popular": ("GET", "/popular-places", None),
+    }
+
+
+async def run_scenario(client, method: str, path: str, payload, total: int, concurrency: int) -> dict:
+    latencies = []
+    errors = {}
+    counter = itertools.count()
+
+    async def worker():
+        while next(counter) < total:
+            body = payload() if payload else None
+            started = time.perf_counter()
+            try:
+                resp = await client.request(method, path, json=body)
+                status = resp.status_code
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors[str(status)] = errors.get(str(status), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {"latencies": latencies, "errors": errors, "elapsed": time.perf_counter() - started}
+
+
+def summarize(name: str, result: dict) -> dict:
+    import numpy as np
+
+    latencies = np.array(result["latencies"]) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0, 0, 0)
+    return {
+        "scenario": name,
+        "requests": len(latencies),
+        "errors": sum(result["errors"].values()),
+        "errorCodes": result["errors"],
+        "rps": round(len(latencies) / result["elapsed"], 2) if result["elapsed"] else 0,
+        "p50Ms": round(float(p50), 1),
+        "p95Ms": round(float(p95), 1),
+        "p99Ms": round(float(p99), 1),
+        "maxMs": round(float(latencies.max()), 1) if len(latencies) else 0,
+    }
+
+
+def print_table(rows: list):
+    header = f"{'scenario':<16}{'n':>6}{'err':>6}{'rps':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['scenario']:<16}{r['requests']:>6}{r['errors']:>6}{r['rps']:>9}"
+              f"{r['p50Ms']:>10}{r['p95Ms']:>10}{r['p99Ms']:>10}{r['maxMs']:>10}")
+        if r["errorCodes"]:
+            print(f"{'':<16}  errors: {r['errorCodes']}")
+
+
+async def main(args):
+    import httpx
+
+    from bench import seed, standins
+
+    # 인기 장소 시드도 같은 Redis(fakeredis)에 들어가도록 교체 후 적재
+    standins.use_fake_redis()
+    samples = seed.ensure_seeded(reseed=args.reseed)
+
+    import main as app_module
+
+    # 요청마다 찍히는 클라이언트/풀 로그는 결과 표를 가리므로 숨김
+    for name in ("httpx", "database"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    if not args.upstream:
+        standins.install(
+            standins.Latency(args.llm_latency_ms, args.llm_jitter_ms),
+            standins.Latency(args.odsay_latency_ms, args.odsay_jitter_ms),
+        )
+
+    scenarios = build_scenarios(samples)
+    selected = list(scenarios) if args.scenarios == "all" else [s.strip() for s in args.scenarios.split(",")]
+    unknown = [s for s in selected if s not in scenarios]
+    if unknown:
+        raise SystemExit(f"알 수 없는 시나리오: {unknown} (가능: {', '.join(scenarios)})")
+
+    app = app_module.app
+    rows = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            for name in selected:
+                method, path, payload = scenarios[name]
+                if args.warmup:
+                    await run_scenario(client, method, path, payload, args.warmup, min(args.warmup, args.concurrency))
+                result = await run_scenario(client, method, path, payload, args.requests, args.concurrency)
+                rows.append(summarize(name, result))
+
+    upstreams = (f"upstream={args.upstream}" if args.upstream else
+                 f"llm={args.llm_latency_ms}±{args.llm_jitter_ms}ms odsay={args.odsay_latency_ms}±{args.odsay_jitter_ms}ms")
+    print(f"\nconcurrency={args.concurrency} {upstreams} db={args.database_url_async.split(':')[0]}\n")
+    print_table(rows)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": rows}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_env(arguments)
+    asyncio.run(main(arguments))
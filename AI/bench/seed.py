@@ -0,0 +1,187 @@
+"""
+벤치마크용 샘플 데이터 적재 (SQLite / 로컬 Postgres)
+서울 자치구별로 관광지·맛집·숙소·리뷰를 만들고, 인기 장소 집계용 ai_schedule_places 테이블도 생성
+"""
+import json
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select, text
+
+from config import redis_client
+from database import Base, SessionLocal, engine
+from models import Accommodation, Destination, Meal, Review
+from services import popularity
+
+DISTRICTS = {
+    # 자치구: (위도, 경도) 대략적인 중심
+    "종로구": (37.5735, 126.9788),
+    "중구": (37.5641, 126.9979),
+    "용산구": (37.5324, 126.9900),
+    "마포구": (37.5663, 126.9019),
+    "강남구": (37.5172, 127.0473),
+    "송파구": (37.5145, 127.1059),
+    "성동구": (37.5634, 127.0369),
+    "영등포구": (37.5264, 126.8962),
+}
+
+FOOD_TYPES = ["한식", "일식", "중식", "양식", "카페", "분식", "고기", "해산물"]
+MEAL_STYLES = ["style_quiet", "style_date", "style_family", "style_view", "style_modern", "style_traditional"]
+DESTINATION_STYLES = [
+    "style_activity", "style_hotplace", "style_nature", "style_landmark", "style_healing",
+    "style_culture", "style_photo", "style_shopping", "style_exotic",
+]
+REVIEW_COMMENTS = [
+    "분위기가 좋고 사진 찍기 좋아요", "주말엔 사람이 많아요", "음식이 정갈하고 맛있어요",
+    "가족끼리 가기 좋아요", "재방문 의사 있어요", "야경이 정말 예뻐요",
+]
+
+# 인기 장소 집계용 분석 테이블 (ORM 모델이 없어 벤치용 메타데이터에 따로 정의)
+_analytics_metadata = MetaData()
+ai_schedule_places = Table(
+    "ai_schedule_places", _analytics_metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("schedule_id", Integer),
+    Column("place_id", String),
+    Column("place_type", String),
+    Column("created_at", DateTime, default=datetime.utcnow),
+)
+
+
+def _jitter(rng: random.Random, center: tuple, spread: float = 0.02) -> tuple:
+    return center[0] + rng.uniform(-spread, spread), center[1] + rng.uniform(-spread, spread)
+
+
+def ensure_schema():
+    Base.metadata.create_all(bind=engine)
+    _analytics_metadata.create_all(bind=engine)
+    # 운영 DB의 meals에는 수집기가 만든 분위기 컬럼이 있지만 ORM 모델에는 없음
+    existing = {c["name"] for c in inspect(engine).get_columns("meals")}
+    with engine.begin() as conn:
+        for style in MEAL_STYLES:
+            if style not in existing:
+                conn.execute(text(f"ALTER TABLE meals ADD COLUMN {style} BOOLEAN"))
+
+
+def seed(per_district: int = 12, seed_value: int = 42):
+    rng = random.Random(seed_value)
+    db = SessionLocal()
+    try:
+        for district, center in DISTRICTS.items():
+            address = f"대한민국 서울특별시 {district}"
+            for i in range(per_district):
+                lat, lng = _jitter(rng, center)
+                db.add(Destination(
+                    name=f"{district} 명소 {i + 1}", area=address, location=f"{address} 관광로 {i + 1}",
+                    rating=round(rng.uniform(3.5, 5.0), 1), review_count=rng.randint(10, 5000),
+                    price_level=rng.randint(0, 3), opening_hours="09:00~18:00",
+                    image_url=f"https://example.com/d/{district}/{i}.jpg",
+                    place_id=f"bench_d_{district}_{i}", latitude=lat, longitude=lng,
+                    keywords=rng.sample(["야경", "산책", "역사", "전시", "사진"], 2),
+                    **{style: rng.random() < 0.3 for style in DESTINATION_STYLES},
+                ))
+
+                lat, lng = _jitter(rng, center)
+                db.add(Meal(
+                    name=f"{district} 맛집 {i + 1}", food_type=rng.choice(FOOD_TYPES),
+                    location=f"{address} 먹자골목 {i + 1}",
+                    rating=round(rng.uniform(3.5, 5.0), 1), review_count=rng.randint(10, 3000),
+                    price_level=rng.randint(1, 4), opening_hours="11:00~22:00",
+                    image_url=f"https://example.com/m/{district}/{i}.jpg",
+                    place_id=f"bench_m_{district}_{i}", latitude=lat, longitude=lng,
+                    keywords=rng.sample(["친절", "가성비", "웨이팅", "분위기", "양많음"], 2),
+                ))
+
+                if i < per_district // 2:
+                    lat, lng = _jitter(rng, center)
+                    db.add(Accommodation(
+                        name=f"{district} 호텔 {i + 1}", location=f"{address} 숙박로 {i + 1}",
+                        price=rng.randint(60, 300) * 1000, rating=str(round(rng.uniform(3.5, 5.0), 1)),
+                        review_count=rng.randint(10, 2000), category=rng.choice(["호텔", "게스트하우스", "모텔"]),
+                        image_url=f"https://example.com/a/{district}/{i}.jpg",
+                        place_id=f"bench_a_{district}_{i}", latitude=lat, longitude=lng,
+                    ))
+        db.flush()
+
+        # 분위기 컬럼은 ORM 밖이라 한 번에 갱신
+        for offset, style in enumerate(MEAL_STYLES):
+            db.execute(text(f"UPDATE meals SET {style} = ((id + {offset}) % 3 = 0)"))
+
+        now = datetime.utcnow()
+        for meal_id in db.execute(select(Meal.id)).scalars():
+            for _ in range(3):
+                db.add(Review(meal_id=meal_id, comment=rng.choice(REVIEW_COMMENTS),
+                              created_at=now - timedelta(days=rng.randint(0, 365))))
+        for destination_id in db.execute(select(Destination.id)).scalars():
+            for _ in range(3):
+                db.add(Review(destination_id=destination_id, comment=rng.choice(REVIEW_COMMENTS),
+                              created_at=now - timedelta(days=rng.randint(0, 365))))
+        db.commit()
+    finally:
+        db.close()
+
+
+def seed_popular_places():
+    """/popular-places가 읽는 cron 집계 키와 실시간 카운터(현재 시간/일 버킷)를 채움"""
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(Destination.place_id, Destination.name, Destination.image_url, Destination.city_key).limit(16)
+        ).all()
+    finally:
+        db.close()
+    popular = [
+        {"placeId": pid, "name": name, "type": "관광지", "count": 16 - i, "imageUrl": image_url}
+        for i, (pid, name, image_url, _) in enumerate(rows)
+    ]
+    increments = popularity.bucket_increments(
+        {"place_id": pid, "place_type": "destination", "city_key": city_key}
+        for i, (pid, _, _, city_key) in enumerate(rows)
+        for _ in range(16 - i)
+    )
+    try:
+        redis_client.set("popular_places", json.dumps(popular, ensure_ascii=False))
+        with redis_client.pipeline(transaction=False) as pipe:
+            for key, counts in increments.items():
+                pipe.zadd(key, counts)
+            pipe.execute()
+    except Exception as e:
+        print(f"[bench] popular_places Redis 저장 실패: {e}")
+
+
+def sample_ids(limit: int = 50) -> dict:
+    """시나리오 요청에 쓸 장소 ID / 좌표"""
+    db = SessionLocal()
+    try:
+        destinations = db.execute(
+            select(Destination.place_id, Destination.name, Destination.latitude, Destination.longitude).limit(limit)
+        ).all()
+        meals = db.execute(
+            select(Meal.place_id, Meal.name, Meal.latitude, Meal.longitude).limit(limit)
+        ).all()
+    finally:
+        db.close()
+    return {
+        "destinations": [tuple(row) for row in destinations],
+        "meals": [tuple(row) for row in meals],
+    }
+
+
+def ensure_seeded(reseed: bool = False, per_district: int = 12) -> dict:
+    ensure_schema()
+    db = SessionLocal()
+    try:
+        count = db.execute(select(func.count()).select_from(Destination)).scalar()
+        if reseed and count:
+            for table in ("reviews", "destinations", "meals", "accommodations", "ai_schedule_places"):
+                db.execute(text(f"DELETE FROM {table}"))
+            db.commit()
+            count = 0
+    finally:
+        db.close()
+
+    if not count:
+        seed(per_district)
+        print(f"[bench] 샘플 데이터 적재 완료 (자치구 {len(DISTRICTS)}곳 × {per_district})")
+    seed_popular_places()
+    return sample_ids()
@@ -0,0 +1,255 @@
+"""
+OpenAI chat completions / ODSAY searchPubTransPathT 를 흉내 내는 로컬 HTTP 서버
+라우트별로 지연 분포, 429, 타임아웃(응답 지연), 깨진 JSON 을 확률적으로 주입
+
+사용법 (AI 디렉터리에서):
+    python -m bench.standin_server --port 8900 \\
+        --chat "dist=lognormal,latency=800,sigma=0.6,p429=0.03,timeout=0.01,malformed=0.02" \\
+        --odsay "latency=120,jitter=60,p429=0.05,timeout=0.02"
+
+앱/벤치마크는 아래 환경변수로 이 서버를 바라보게 함:
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 ODSAY_BASE_URL=http://127.0.0.1:8900/v1/api
+    (python -m bench.run --upstream http://127.0.0.1:8900 도 같은 설정)
+
+실행 중 변경 / 확인:
+    curl -X POST localhost:8900/_faults/chat -d '{"p429": 0.2}'
+    curl localhost:8900/_stats
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.standins import canned_reply
+
+OUTCOMES = ("ok", "429", "timeout", "malformed")
+
+
+class Faults:
+    """
+    라우트 하나의 장애 주입 설정
+    dist=uniform: latency ± jitter (ms), dist=lognormal: 중앙값 latency(ms), 표준편차 sigma (꼬리가 긴 분포)
+    p429/timeout/malformed: 요청마다 독립적으로 뽑는 확률
+    """
+
+    FIELDS = {
+        "dist": str, "latency": float, "jitter": float, "sigma": float,
+        "p429": float, "timeout": float, "malformed": float, "hang": float,
+    }
+
+    def __init__(self, dist="uniform", latency=0.0, jitter=0.0, sigma=0.5,
+                 p429=0.0, timeout=0.0, malformed=0.0, hang=120.0):
+        self.dist = dist
+        self.latency = latency
+        self.jitter = jitter
+        self.sigma = sigma
+        self.p429 = p429
+        self.timeout = timeout
+        self.malformed = malformed
+        self.hang = hang  # 타임아웃 주입 시 응답을 붙잡고 있는 시간(초), 클라이언트 타임아웃보다 길게
+
+    @classmethod
+    def parse(cls, spec: str) -> "Faults":
+        faults = cls()
+        faults.update(dict(part.split("=", 1) for part in spec.split(",") if part.strip()))
+        return faults
+
+    def update(self, values: dict):
+        for key, value in values.items():
+            key = key.strip()
+            if key not in self.FIELDS:
+                raise ValueError(f"알 수 없는 설정: {key} (가능: {', '.join(self.FIELDS)})")
+            setattr(self, key, self.FIELDS[key](value.strip() if isinstance(value, str) else value))
+        if self.dist not in ("uniform", "lognormal"):
+            raise ValueError(f"지원하지 않는 분포: {self.dist}")
+
+    def as_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+    def delay(self) -> float:
+        if self.latency <= 0:
+            return 0.0
+        if self.dist == "lognormal":
+            ms = random.lognormvariate(math.log(self.latency), self.sigma)
+        else:
+            ms = self.latency + random.uniform(-self.jitter, self.jitter)
+        return max(ms, 0.0) / 1000
+
+    def pick(self) -> str:
+        roll = random.random()
+        for outcome, probability in (("429", self.p429), ("timeout", self.timeout), ("malformed", self.malformed)):
+            if roll < probability:
+                return outcome
+            roll -= probability
+        return "ok"
+
+
+class StandinState:
+    def __init__(self, routes: dict):
+        self.routes = routes
+        self.stats = {route: Counter() for route in routes}
+        self.ids = 0
+
+    def begin(self, route: str) -> str:
+        outcome = self.routes[route].pick()
+        self.stats[route][outcome] += 1
+        return outcome
+
+
+STATE_KEY = web.AppKey("standin_state", StandinState)
+
+
+# OpenAI ------------------------------------------------------------------------------
+
+def _usage(messages: list, reply: str) -> dict:
+    prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 2
+    completion_tokens = len(reply) // 2
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+def _rate_limited() -> web.Response:
+    return web.json_response(
+        {"error": {"message": "Rate limit reached (stand-in)", "type": "requests", "code": "rate_limit_exceeded"}},
+        status=429, headers={"retry-after": "1"},
+    )
+
+
+async def chat_completions(request: web.Request) -> web.StreamResponse:
+    state = request.app[STATE_KEY]
+    faults = state.routes["chat"]
+    outcome = state.begin("chat")
+    body = await request.json()
+    if outcome == "429":
+        return _rate_limited()
+    if outcome == "timeout":
+        await asyncio.sleep(faults.hang)
+
+    messages = body.get("messages") or []
+    reply = canned_reply(messages)
+    finish_reason = "stop"
+    if outcome == "malformed":
+        # max_tokens에 걸려 잘린 응답처럼 JSON 중간에서 끊음
+        reply = reply[: max(len(reply) // 2, 1)]
+        finish_reason = "length"
+
+    state.ids += 1
+    envelope = {"id": f"chatcmpl-standin-{state.ids}", "created": int(time.time()), "model": body.get("model")}
+    usage = _usage(messages, reply)
+
+    if not body.get("stream"):
+        await asyncio.sleep(faults.delay())
+        return web.json_response({
+            **envelope, "object": "chat.completion",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply},
+                         "finish_reason": finish_reason}],
+            "usage": usage,
+        })
+
+    response = web.StreamResponse(headers={"content-type": "text/event-stream", "cache-control": "no-cache"})
+    await response.prepare(request)
+
+    async def send(choices, **extra):
+        chunk = {**envelope, "object": "chat.completion.chunk", "choices": choices, **extra}
+        await response.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode())
+
+    # 첫 토큰까지 전체 지연의 20%, 나머지는 청크 사이에 나눔
+    total = faults.delay()
+    pieces = [reply[i:i + 20] for i in range(0, len(reply), 20)]
+    await asyncio.sleep(total * 0.2)
+    for piece in pieces:
+        await send([{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+        await asyncio.sleep(total * 0.8 / len(pieces))
+    await send([{"index": 0, "delta": {}, "finish_reason": finish_reason}])
+    if (body.get("stream_options") or {}).get("include_usage"):
+        await send([], usage=usage)
+    await response.write(b"data: [DONE]\n\n")
+    await response.write_eof()
+    return response
+
+
+# ODSAY -------------------------------------------------------------------------------
+
+async def search_pub_trans_path(request: web.Request) -> web.Response:
+    state = request.app[STATE_KEY]
+    faults = state.routes["odsay"]
+    outcome = state.begin("odsay")
+    if outcome == "429":
+        return _rate_limited()
+    if outcome == "timeout":
+        await asyncio.sleep(faults.hang)
+    await asyncio.sleep(faults.delay())
+
+    try:
+        distance_deg = math.hypot(float(request.query["EX"]) - float(request.query["SX"]),
+                                  float(request.query["EY"]) - float(request.query["SY"]))
+    except (KeyError, ValueError):
+        return web.json_response({"error": [{"code": "-8", "message": "필수 입력값 형식 및 범위 오류"}]})
+
+    km = distance_deg * 100
+    payment = 1400 if km < 10 else 1400 + int((km - 10) // 5 + 1) * 100
+    body = json.dumps({"result": {"path": [{"pathType": 1, "info": {
+        "payment": payment, "totalTime": int(km * 3) + 10, "totalDistance": int(km * 1000),
+    }}]}})
+    if outcome == "malformed":
+        body = body[: len(body) // 2]
+    return web.Response(text=body, content_type="application/json")
+
+
+# 제어용 ------------------------------------------------------------------------------
+
+async def get_stats(request: web.Request) -> web.Response:
+    state = request.app[STATE_KEY]
+    return web.json_response({
+        route: {"faults": faults.as_dict(), "outcomes": {o: state.stats[route][o] for o in OUTCOMES}}
+        for route, faults in state.routes.items()
+    })
+
+
+async def update_faults(request: web.Request) -> web.Response:
+    state = request.app[STATE_KEY]
+    route = request.match_info["route"]
+    if route not in state.routes:
+        raise web.HTTPNotFound(text=f"알 수 없는 라우트: {route}")
+    try:
+        state.routes[route].update(await request.json())
+    except (ValueError, TypeError) as e:
+        raise web.HTTPBadRequest(text=str(e))
+    return web.json_response(state.routes[route].as_dict())
+
+
+def create_app(chat: Faults, odsay: Faults) -> web.Application:
+    app = web.Application()
+    app[STATE_KEY] = StandinState({"chat": chat, "odsay": odsay})
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    app.router.add_get("/v1/api/searchPubTransPathT", search_pub_trans_path)
+    app.router.add_get("/_stats", get_stats)
+    app.router.add_post("/_faults/{route}", update_faults)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI / ODSAY 장애 주입 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--chat", default="latency=800,jitter=300", help="OpenAI chat completions 장애 설정")
+    parser.add_argument("--odsay", default="latency=120,jitter=60", help="ODSAY 장애 설정")
+    parser.add_argument("--seed", type=int, help="재현 가능한 장애 순서를 위한 난수 시드")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    web.run_app(create_app(Faults.parse(args.chat), Faults.parse(args.odsay)), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+벤치마크용 OpenAI / ODSAY 대역 (네트워크 없이 지연시간만 흉내 내고 정해진 형식의 응답 반환)
+"""
+import asyncio
+import json
+import random
+import re
+from types import SimpleNamespace
+
+_HANDLE_LINE = re.compile(r"^([DMAR]\d+)\|", re.MULTILINE)
+_TRIP_DAYS = re.compile(r"총 (\d+)일")
+
+
+class Latency:
+    """평균 ± 지터(ms) 범위의 지연"""
+
+    def __init__(self, mean_ms: float, jitter_ms: float = 0.0):
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+
+    async def sleep(self, scale: float = 1.0):
+        ms = self.mean_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if ms > 0:
+            await asyncio.sleep(ms * scale / 1000)
+
+
+# 프롬프트 종류별 응답 ---------------------------------------------------------------
+
+def _schedule_reply(prompt: str) -> str:
+    handles = _HANDLE_LINE.findall(prompt)
+    groups = {p: [h for h in handles if h.startswith(p)] for p in "DMA"}
+    match = _TRIP_DAYS.search(prompt)
+    days = int(match.group(1)) if match else 1
+    plans = []
+    for day in range(1, days + 1):
+        picks = []
+        for prefix, count in (("D", 2), ("M", 2), ("A", 0 if day == days else 1)):
+            pool = groups[prefix]
+            for i in range(count):
+                if pool:
+                    picks.append(pool[((day - 1) * count + i) % len(pool)])
+        plans.append({
+            "day": day,
+            "schedule": [{"placeId": h, "aiComment": "동선이 편한 추천 장소예요 ✨"} for h in picks],
+        })
+    return json.dumps({"aiEmpathy": "설레는 여행이 될 거예요!", "tags": ["벤치마크"], "plans": plans},
+                      ensure_ascii=False)
+
+
+def _restaurant_reply(prompt: str) -> str:
+    handles = [h for h in _HANDLE_LINE.findall(prompt) if h.startswith("R")][:5]
+    return json.dumps({
+        "aiComment": "분위기 좋은 맛집들을 골라봤어요 😋",
+        "places": [{"placeId": h, "aiFoodComment": "대표 메뉴가 맛있어요", "tags": ["데이트"]} for h in handles],
+    }, ensure_ascii=False)
+
+
+def canned_reply(messages: list) -> str:
+    system = messages[0]["content"] if messages else ""
+    prompt = messages[-1]["content"] if messages else ""
+    if "travel planner" in system:
+        return _schedule_reply(prompt)
+    if "맛집 추천 AI" in system:
+        return _restaurant_reply(prompt)
+    if "여행 비용 추정" in system:
+        return json.dumps({"food": 30000, "entry": 12000, "transport": 7000})
+    if "입장료" in prompt:
+        return str(random.choice([0, 3000, 5000, 12000]))
+    return "함께 가면 더 즐거운 곳이에요 🌿 여유롭게 둘러보기 좋아요."
+
+
+# OpenAI 클라이언트 대역 ---------------------------------------------------------------
+
+def _usage(prompt_text: str, reply: str):
+    return SimpleNamespace(prompt_tokens=len(prompt_text) // 2, completion_tokens=len(reply) // 2)
+
+
+class FakeStream:
+    """openai.AsyncStream 처럼 async for 와 close() 를 지원"""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    def __aiter__(self):
+        return self._chunks
+
+    async def close(self):
+        await self._chunks.aclose()
+
+
+class FakeChatCompletions:
+    def __init__(self, latency: Latency, chunk_size: int = 20):
+        self.latency = latency
+        self.chunk_size = chunk_size
+        self.calls = 0
+
+    async def create(self, messages, stream: bool = False, **params):
+        self.calls += 1
+        reply = canned_reply(messages)
+        usage = _usage("".join(m["content"] for m in messages), reply)
+        if stream:
+            return FakeStream(self._stream(reply, usage))
+        await self.latency.sleep()
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=reply))],
+            usage=usage,
+        )
+
+    async def _stream(self, reply: str, usage):
+        # 첫 토큰까지 지연의 20%, 나머지는 청크에 나눠서
+        await self.latency.sleep(0.2)
+        pieces = [reply[i:i + self.chunk_size] for i in range(0, len(reply), self.chunk_size)]
+        for piece in pieces:
+            await self.latency.sleep(0.8 / max(len(pieces), 1))
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))], usage=None)
+        yield SimpleNamespace(choices=[], usage=usage)
+
+
+class FakeOpenAI:
+    def __init__(self, latency: Latency):
+        self.chat = SimpleNamespace(completions=FakeChatCompletions(latency))
+
+    async def close(self):
+        pass
+
+
+# 설치 ---------------------------------------------------------------------------
+
+def install(llm_latency: Latency, odsay_latency: Latency):
+    """llm_gateway 클라이언트와 ODSAY 호출을 대역으로 교체 (app import 이후 호출)"""
+    from services import llm_gateway, http_client
+
+    llm_gateway._client = FakeOpenAI(llm_latency)
+
+    original_get_json = http_client.get_json
+
+    async def get_json(upstream: str, url: str, params: dict = None) -> dict:
+        if upstream != "odsay":
+            return await original_get_json(upstream, url, params)
+        async with http_client._semaphore(upstream):
+            await odsay_latency.sleep()
+        return {"result": {"path": [{"info": {"payment": random.choice([1400, 1500, 1650, 1850])}}]}}
+
+    http_client.get_json = get_json
+
+
+def use_fake_redis() -> bool:
+    """로컬 Redis가 없으면 fakeredis(설치된 경우)로 교체, 교체했으면 True"""
+    from config import redis_client
+    try:
+        redis_client.ping()
+        return False
+    except Exception:
+        pass
+
+    try:
+        import fakeredis
+    except ImportError:
+        print("[bench] Redis에 연결할 수 없고 fakeredis도 없습니다. 캐시는 미스로 동작하고 /popular-places는 빈 목록을 반환합니다.")
+        return False
+
+    import importlib
+    server = fakeredis.FakeServer()
+    sync_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    async_client = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    # `from config import redis_client` 로 가져간 모듈들도 함께 교체
+    for name in ("config", "services.llm_cache", "services.fare_cache", "services.budget_service",
+                 "services.schedule_jobs", "services.singleflight", "services.itinerary_templates",
+                 "services.popularity", "services.popular_service", "bench.seed"):
+        module = importlib.import_module(name)
+        if hasattr(module, "redis_client"):
+            module.redis_client = sync_client
+        if hasattr(module, "async_redis_client"):
+            module.async_redis_client = async_client
+    return True
@@ -1,5 +1,7 @@
 import os
+from typing import Optional
 import redis
+import redis.asyncio as aioredis
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,9 +16,89 @@ class Settings:
     # 비동기 DB URL, env에 없으면 아래 __init__에서 자동 생성
     DATABASE_URL_ASYNC: str = os.getenv("DATABASE_URL_ASYNC", None)
 
+    # DB 커넥션 풀 설정 (워커 수 x (POOL_SIZE + MAX_OVERFLOW) <= Postgres max_connections)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 5))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
     ODSAY_API_KEY: str = os.getenv("ODSAY_API_KEY")
 
+    # 외부 API 주소 (부하 테스트 시 bench/standin_server.py 로 돌릴 수 있도록)
+    OPENAI_BASE_URL: Optional[str] = os.getenv("OPENAI_BASE_URL") or None  # None이면 SDK 기본값
+    ODSAY_BASE_URL: str = os.getenv("ODSAY_BASE_URL", "https://api.odsay.com/v1/api").rstrip("/")
+
+    # OpenAI HTTP 커넥션 풀 설정 (services/llm_gateway.py)
+    OPENAI_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", 50))
+    OPENAI_MAX_KEEPALIVE: int = int(os.getenv("OPENAI_MAX_KEEPALIVE", 20))
+    OPENAI_KEEPALIVE_EXPIRY: float = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", 60))
+    OPENAI_TIMEOUT: float = float(os.getenv("OPENAI_TIMEOUT", 60))
+    OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", 2))
+    OPENAI_MAX_CONCURRENCY: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", 30))
+
+    # 외부 HTTP 호출 설정 (services/http_client.py)
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+    HTTP_LIMIT_PER_HOST: int = int(os.getenv("HTTP_LIMIT_PER_HOST", 20))
+    ODSAY_MAX_CONCURRENCY: int = int(os.getenv("ODSAY_MAX_CONCURRENCY", 10))
+    ODSAY_TIMEOUT: float = float(os.getenv("ODSAY_TIMEOUT", 5))
+
+    # ODSAY 요금 캐시 (services/fare_cache.py)
+    FARE_GRID_DEG: float = float(os.getenv("FARE_GRID_DEG", 0.002))  # 약 200m 격자
+    FARE_SYMMETRIC: bool = os.getenv("FARE_SYMMETRIC", "true").lower() == "true"
+    FARE_CACHE_L1_SIZE: int = int(os.getenv("FARE_CACHE_L1_SIZE", 4096))
+    FARE_CACHE_L1_TTL: int = int(os.getenv("FARE_CACHE_L1_TTL", 3600))
+    FARE_CACHE_TTL: int = int(os.getenv("FARE_CACHE_TTL", 7 * 24 * 3600))
+    # 이 거리(km) 미만 구간은 ODSAY 호출 없이 거리별 추정 요금 사용
+    # 기본값은 도보 기준(2km)과 같아 도보 외 전 구간을 조회 (호출을 줄이려면 5 등으로 올림)
+    FARE_ESTIMATE_MAX_KM: float = float(os.getenv("FARE_ESTIMATE_MAX_KM", 2))
+
+    # ai_schedule_places write-behind 큐 (services/analytics_writer.py)
+    ANALYTICS_QUEUE_SIZE: int = int(os.getenv("ANALYTICS_QUEUE_SIZE", 10000))
+    ANALYTICS_BATCH_SIZE: int = int(os.getenv("ANALYTICS_BATCH_SIZE", 500))
+    ANALYTICS_FLUSH_INTERVAL: float = float(os.getenv("ANALYTICS_FLUSH_INTERVAL", 2.0))
+
+    # 장소 좌표 인덱스 (services/geo_index.py)
+    GEO_INDEX_CELL_DEG: float = float(os.getenv("GEO_INDEX_CELL_DEG", 0.01))  # 약 1km 격자
+    GEO_INDEX_MAX_RADIUS_KM: float = float(os.getenv("GEO_INDEX_MAX_RADIUS_KM", 50))
+    GEO_INDEX_REFRESH_SECONDS: int = int(os.getenv("GEO_INDEX_REFRESH_SECONDS", 300))
+    GEO_INDEX_REBUILD_SECONDS: int = int(os.getenv("GEO_INDEX_REBUILD_SECONDS", 6 * 3600))
+
+    # 사전 생성 일정 템플릿 (services/itinerary_templates.py, scripts/precompute_templates.py)
+    ITINERARY_TEMPLATES_ENABLED: bool = os.getenv("ITINERARY_TEMPLATES_ENABLED", "true").lower() == "true"
+    ITINERARY_TEMPLATE_TTL: int = int(os.getenv("ITINERARY_TEMPLATE_TTL", 48 * 3600))  # 매일 갱신, 하루 실패해도 유지
+
+    # 인기 장소 조회 (services/popular_service.py, 카운터는 services/popularity.py)
+    POPULAR_CACHE_TTL: int = int(os.getenv("POPULAR_CACHE_TTL", 60))
+
+    # 동일 요청 합치기 (services/singleflight.py)
+    SINGLEFLIGHT_ENABLED: bool = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+    SINGLEFLIGHT_LOCK_TTL: float = float(os.getenv("SINGLEFLIGHT_LOCK_TTL", 90))  # LLM 타임아웃보다 길게
+    SINGLEFLIGHT_RESULT_TTL: int = int(os.getenv("SINGLEFLIGHT_RESULT_TTL", 30))
+    SINGLEFLIGHT_WAIT_TIMEOUT: float = float(os.getenv("SINGLEFLIGHT_WAIT_TIMEOUT", 90))
+    SINGLEFLIGHT_POLL_INTERVAL: float = float(os.getenv("SINGLEFLIGHT_POLL_INTERVAL", 0.1))
+
+    # 일정 생성 백그라운드 작업 (services/schedule_jobs.py)
+    SCHEDULE_JOB_WORKERS: int = int(os.getenv("SCHEDULE_JOB_WORKERS", 4))  # 웹 프로세스당 워커 수, 0이면 전용 워커만 처리
+    SCHEDULE_JOB_MAX_QUEUE: int = int(os.getenv("SCHEDULE_JOB_MAX_QUEUE", 200))
+    SCHEDULE_JOB_TIMEOUT: float = float(os.getenv("SCHEDULE_JOB_TIMEOUT", 120))
+    SCHEDULE_JOB_TTL: int = int(os.getenv("SCHEDULE_JOB_TTL", 3600))  # 작업 상태/결과 보관 시간
+    SCHEDULE_JOB_POLL_INTERVAL: float = float(os.getenv("SCHEDULE_JOB_POLL_INTERVAL", 0.5))
+    SCHEDULE_JOB_SHUTDOWN_GRACE: float = float(os.getenv("SCHEDULE_JOB_SHUTDOWN_GRACE", 10))
+    SCHEDULE_JOB_HEARTBEAT_TTL: int = int(os.getenv("SCHEDULE_JOB_HEARTBEAT_TTL", 30))  # 이 시간 동안 갱신 없는 워커의 작업은 대기열로 복귀
+
+    # LLM 응답 캐시 (services/llm_cache.py)
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_L1_SIZE: int = int(os.getenv("LLM_CACHE_L1_SIZE", 512))
+    LLM_CACHE_L1_TTL: int = int(os.getenv("LLM_CACHE_L1_TTL", 600))
+
+    # 요청별 프로파일링 (profiling.py): 아래 기준을 넘는 요청은 경고 로그
+    PROFILE_ENABLED: bool = os.getenv("PROFILE_ENABLED", "true").lower() == "true"
+    PROFILE_SLOW_REQUEST_MS: float = float(os.getenv("PROFILE_SLOW_REQUEST_MS", 5000))
+    PROFILE_MAX_QUERIES: int = int(os.getenv("PROFILE_MAX_QUERIES", 15))
+    PROFILE_SLOW_DB_MS: float = float(os.getenv("PROFILE_SLOW_DB_MS", 500))
+
     def __init__(self):
         # DATABASE_URL_ASYNC가 없으면, asyncpg 드라이버 접두사 추가
         if not self.DATABASE_URL_ASYNC and self.DATABASE_URL:
@@ -32,3 +114,11 @@ redis_client = redis.Redis(
     db=0,
     decode_responses=True  # 문자열 자동 디코딩
 )
+
+# 이벤트 루프를 막지 않도록 async 코드에서는 같은 Redis의 비동기 클라이언트 사용
+async_redis_client = aioredis.Redis(
+    host="localhost",
+    port=6379,
+    db=0,
+    decode_responses=True
+)
@@ -1,6 +1,8 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import models, schemas
 import json, ast
+import asyncio
 from passlib.context import CryptContext
 from typing import Optional
 from schemas import ScheduleDBResponse
@@ -13,21 +15,23 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
-def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password = get_password_hash(user.password)
+async def create_user(db: AsyncSession, user: schemas.UserCreate):
+    hashed_password = await asyncio.to_thread(get_password_hash, user.password)
     db_user = models.User(username=user.username, hashed_password=hashed_password, email=user.email)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
-def get_user_by_username(db: Session, username: str):
-    return db.query(models.User).filter(models.User.username == username).first()
+async def get_user_by_username(db: AsyncSession, username: str):
+    result = await db.execute(select(models.User).where(models.User.username == username))
+    return result.scalars().first()
 
-def get_user_by_id(db: Session, user_id: int):
-    return db.query(models.User).filter(models.User.id == user_id).first()
+async def get_user_by_id(db: AsyncSession, user_id: int):
+    result = await db.execute(select(models.User).where(models.User.id == user_id))
+    return result.scalars().first()
 
-def create_schedule(db: Session, schedule: schemas.ScheduleCreate, user_id: Optional[int] = None):
+async def create_schedule(db: AsyncSession, schedule: schemas.ScheduleCreate, user_id: Optional[int] = None):
     schedule_json = schedule.schedule_json
 
     if not schedule_json:
@@ -79,18 +83,22 @@ def create_schedule(db: Session, schedule: schemas.ScheduleCreate, user_id: Opti
         ai_empathy=schedule.aiEmpathy
     )
     db.add(db_schedule)
-    db.commit()
-    db.refresh(db_schedule)
+    await db.commit()
+    await db.refresh(db_schedule)
     return db_schedule
 
-def get_schedules_by_user(db: Session, user_id: int):
-    return db.query(models.Schedule).filter(models.Schedule.user_id == user_id).all()
+async def get_schedules_by_user(db: AsyncSession, user_id: int):
+    result = await db.execute(select(models.Schedule).where(models.Schedule.user_id == user_id))
+    return result.scalars().all()
 
-def get_schedule(db: Session, schedule_id: int, user_id: int):
-    return db.query(models.Schedule).filter(models.Schedule.id == schedule_id, models.Schedule.user_id == user_id).first()
+async def get_schedule(db: AsyncSession, schedule_id: int, user_id: int):
+    result = await db.execute(
+        select(models.Schedule).where(models.Schedule.id == schedule_id, models.Schedule.user_id == user_id)
+    )
+    return result.scalars().first()
 
-def update_schedule(db: Session, schedule_id: int, user_id: int, updates: dict):
-    db_schedule = get_schedule(db, schedule_id, user_id)
+async def update_schedule(db: AsyncSession, schedule_id: int, user_id: int, updates: dict):
+    db_schedule = await get_schedule(db, schedule_id, user_id)
     if not db_schedule:
         return None
 
@@ -119,16 +127,16 @@ def update_schedule(db: Session, schedule_id: int, user_id: int, updates: dict):
         else:
             db_schedule.schedule_json = updates["schedule_json"]
 
-    db.commit()
-    db.refresh(db_schedule)
+    await db.commit()
+    await db.refresh(db_schedule)
     return db_schedule
 
-def delete_schedule(db: Session, schedule_id: int, user_id: int):
-    db_schedule = get_schedule(db, schedule_id, user_id)
+async def delete_schedule(db: AsyncSession, schedule_id: int, user_id: int):
+    db_schedule = await get_schedule(db, schedule_id, user_id)
     if not db_schedule:
         return False
-    db.delete(db_schedule)
-    db.commit()
+    await db.delete(db_schedule)
+    await db.commit()
     return True
 
 # 안전한 문자열 리스트 파싱 함수
@@ -160,7 +168,7 @@ def convert_db_schedule_to_response(db_schedule):
         plans=schedule_json.get("plans", {})
     )
 
-def create_budget(db: Session, schedule_id: int, food_cost: int, entry_fees: int, transport_cost: int):
+async def create_budget(db: AsyncSession, schedule_id: int, food_cost: int, entry_fees: int, transport_cost: int):
     total = food_cost + entry_fees + transport_cost
     budget = models.Budget(
         schedule_id=schedule_id,
@@ -170,9 +178,10 @@ def create_budget(db: Session, schedule_id: int, food_cost: int, entry_fees: int
         total_budget=total
     )
     db.add(budget)
-    db.commit()
-    db.refresh(budget)
+    await db.commit()
+    await db.refresh(budget)
     return budget
 
-def get_budget_by_schedule_id(db: Session, schedule_id: int):
-    return db.query(models.Budget).filter(models.Budget.schedule_id == schedule_id).first()
+async def get_budget_by_schedule_id(db: AsyncSession, schedule_id: int):
+    result = await db.execute(select(models.Budget).where(models.Budget.schedule_id == schedule_id))
+    return result.scalars().first()
@@ -1,33 +1,131 @@
-import os
+import time
+import threading
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, exc
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+from config import settings
 
 # 환경변수 로드
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = settings.DATABASE_URL
 if DATABASE_URL is None:
     raise ValueError("DATABASE_URL 환경변수가 설정되지 않았습니다.")
 
-# DB 엔진 생성
-engine = create_engine(DATABASE_URL)
+
+class PoolStats:
+    """커넥션 풀 checkout 대기시간/타임아웃 누적 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+
+class _TimedPoolMixin:
+    # 풀 클래스마다 주입되는 통계 객체 (dispose/recreate 후에도 유지됨)
+    stats: PoolStats = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return conn
+
+
+# 엔진 레지스트리: 프로세스 내 모든 모듈이 이 엔진들만 사용
+_engines = {}
+
+
+def _build_engine(name: str, url: str, is_async: bool):
+    stats = PoolStats()
+    base_pool = AsyncAdaptedQueuePool if is_async else QueuePool
+    pool_class = type(f"Timed{base_pool.__name__}", (_TimedPoolMixin, base_pool), {"stats": stats})
+    factory = create_async_engine if is_async else create_engine
+    new_engine = factory(
+        url,
+        poolclass=pool_class,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    _engines[name] = (new_engine, stats)
+    return new_engine
+
+
+# 동기 DB 엔진 (cron/스크립트용, 첫 사용 시점에 커넥션 생성)
+engine = _build_engine("sync", DATABASE_URL, is_async=False)
+
+# 비동기 DB 엔진 (asyncpg, API 요청용)
+async_engine = _build_engine("async", settings.DATABASE_URL_ASYNC, is_async=True)
 
 # 세션 클래스 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,  # commit 후 속성 접근 시 lazy load(IO) 방지
+)
 
 # Base 클래스 생성 (ORM 모델들의 공통 부모)
 Base = declarative_base()
 
-# DB 초기화 함수 (테이블 생성)
-def init_db():
-    Base.metadata.create_all(bind=engine)
 
-# Dependency: 요청마다 DB 세션 생성/종료
-def get_db():
-    db = SessionLocal()
-    try:
+def get_pool_stats() -> dict:
+    """엔진별 풀 사용량/포화도/checkout 대기시간 스냅샷"""
+    result = {}
+    for name, (registered, stats) in _engines.items():
+        pool = registered.pool
+        capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        checked_out = pool.checkedout()
+        total = stats.checkouts + stats.timeouts
+        result[name] = {
+            "poolSize": pool.size(),
+            "maxOverflow": settings.DB_MAX_OVERFLOW,
+            "checkedOut": checked_out,
+            "checkedIn": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "avgWaitMs": round(stats.wait_total / total * 1000, 3) if total else 0.0,
+            "maxWaitMs": round(stats.wait_max * 1000, 3),
+        }
+    return result
+
+
+# DB 초기화 함수 (테이블 생성, 기존 테이블 컬럼 변경은 scripts/backfill_region_keys.py 로 배포 시 1회 실행)
+async def init_db():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+# Dependency: 요청마다 비동기 DB 세션 생성/종료
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+# 종료 시 풀 정리
+async def dispose_engines():
+    await async_engine.dispose()
+    engine.dispose()
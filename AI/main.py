@@ -1,6 +1,8 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from routers import auth_router, schedule_router, ai_router
-from database import init_db
+from database import init_db, dispose_engines, get_pool_stats
+import metrics
+import profiling
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from routers import restaurant_router
@@ -12,15 +14,34 @@ from routers import popular_router
 
 from routers.budget_router import router as budget_router
 from routers.quick_budget_router import router as quick_budget_router
+from services import llm_gateway, llm_cache, llm_json, budget_service, fare_cache, http_client, analytics_writer, geo_index, schedule_jobs, prompt_compact, gpt_service
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # startup 시 실행할 코드
-    init_db()
+    await init_db()
+    await prompt_compact.load_encodings([gpt_service.SCHEDULE_MODEL, restaurant_router.RESTAURANT_MODEL])
+    await http_client.start()
+    await analytics_writer.start()
+    await geo_index.start()
+    await schedule_jobs.start()
     yield
-    # shutdown 시 실행할 코드 (필요하면 여기에 추가)
+    # shutdown 시 실행할 코드
+    await schedule_jobs.stop()
+    await geo_index.stop()
+    await analytics_writer.stop()
+    await http_client.close()
+    await llm_gateway.close()
+    await dispose_engines()
 
 app = FastAPI(lifespan=lifespan)
+
+# 요청별 SQL 수/DB·LLM·HTTP 시간 (Server-Timing 헤더, 느린 요청 경고)
+profiling.install()
+app.add_middleware(profiling.ProfilingMiddleware, fastapi_app=app)
+
+# 라우트별 지연시간/처리 중 요청 수 (/metrics)
+app.add_middleware(metrics.MetricsMiddleware, fastapi_app=app)
         
 app.add_middleware(
     CORSMiddleware,
@@ -45,3 +66,28 @@ app.include_router(mypage_router.router)
 @app.get("/")
 def root():
     return {"message": "API 서버가 정상 동작 중입니다."}
+
+@app.get("/health/db-pool")
+def db_pool_status():
+    # 워커별 커넥션 풀 포화도/대기시간 (Postgres 커넥션 수 산정용)
+    return get_pool_stats()
+
+@app.get("/health/cache")
+def cache_status():
+    # 캐시별 hit/miss 카운터
+    return {
+        "llm": llm_cache.cache_stats(),
+        "entryFee": budget_service.entry_fee_stats,
+        "odsayFare": fare_cache.fare_cache_stats,
+    }
+
+@app.get("/health/llm-parse")
+def llm_parse_status():
+    # 엔드포인트별 LLM 응답 JSON 파싱 성공/복구/실패 비율
+    return llm_json.parse_stats()
+
+@app.get("/metrics")
+def metrics_endpoint():
+    # Prometheus scrape 용 (라우트 지연, OpenAI 지연/토큰, ODSAY 호출, 캐시 적중률, 커넥션 풀)
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
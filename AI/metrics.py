@@ -0,0 +1,152 @@
+import time
+
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.routing import Match
+
+# 요청 지연 버킷 (초): LLM 호출이 포함된 라우트는 수십 초까지 걸림
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "t4p_http_request_duration_seconds", "라우트별 요청 처리 시간",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "t4p_http_requests_in_flight", "라우트별 처리 중인 요청 수", ["method", "route"],
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "t4p_llm_request_duration_seconds", "모델별 OpenAI 호출 시간 (스트리밍은 전체 수신까지)",
+    ["model", "status"], buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "t4p_llm_tokens", "모델별 OpenAI 토큰 사용량", ["model", "kind"],
+)
+UPSTREAM_REQUEST_SECONDS = Histogram(
+    "t4p_upstream_request_duration_seconds", "외부 API(ODSAY 등) 호출 시간",
+    ["upstream", "status"], buckets=LATENCY_BUCKETS,
+)
+
+
+def observe_llm(model: str, seconds: float, status: str, usage=None):
+    LLM_REQUEST_SECONDS.labels(model, status).observe(seconds)
+    if usage is not None:
+        LLM_TOKENS.labels(model, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+        LLM_TOKENS.labels(model, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+
+class AppStatsCollector:
+    """서비스 모듈이 들고 있는 카운터(캐시, 커넥션 풀, 쓰기 큐)를 scrape 시점에 읽어 노출"""
+
+    def describe(self):
+        # 등록 시점에 collect가 호출되지 않도록 (서비스 모듈 import 전)
+        return []
+
+    def collect(self):
+        # 서비스 모듈이 llm_gateway → metrics 순으로 import하므로 순환 import를 피해 지연 import
+        from database import get_pool_stats
+        from services import llm_cache, llm_json, budget_service, fare_cache, analytics_writer, schedule_jobs, itinerary_templates, popularity, popular_service
+
+        requests = CounterMetricFamily("t4p_cache_requests", "캐시 조회 결과", labels=["cache", "result"])
+        ratio = GaugeMetricFamily("t4p_cache_hit_ratio", "캐시 적중률", labels=["cache"])
+
+        caches = {f"llm:{endpoint}": stats for endpoint, stats in llm_cache.cache_stats().items()}
+        caches["entry_fee"] = budget_service.entry_fee_stats
+        caches["odsay_fare"] = fare_cache.fare_cache_stats
+        caches["itinerary_template"] = itinerary_templates.template_stats
+        caches["popular_places"] = popular_service.popular_cache_stats
+        for name, stats in caches.items():
+            hits = 0
+            total = 0
+            for result, count in stats.items():
+                if not isinstance(count, int) or result == "hitRatio":
+                    continue
+                requests.add_metric([name, result], count)
+                total += count
+                if "hit" in result:
+                    hits += count
+            ratio.add_metric([name], hits / total if total else 0.0)
+        yield requests
+        yield ratio
+
+        parse = CounterMetricFamily("t4p_llm_json_parse", "LLM 응답 JSON 파싱 결과", labels=["endpoint", "result"])
+        for endpoint, stats in llm_json.parse_stats().items():
+            for result in ("ok", "stripped", "repaired", "failed"):
+                parse.add_metric([endpoint, result], stats[result])
+        yield parse
+
+        pool_gauges = {
+            "checkedOut": GaugeMetricFamily("t4p_db_pool_checked_out", "사용 중인 커넥션 수", labels=["engine"]),
+            "saturation": GaugeMetricFamily("t4p_db_pool_saturation", "풀 포화도 (0~1)", labels=["engine"]),
+            "avgWaitMs": GaugeMetricFamily("t4p_db_pool_avg_wait_ms", "평균 checkout 대기시간", labels=["engine"]),
+            "maxWaitMs": GaugeMetricFamily("t4p_db_pool_max_wait_ms", "최대 checkout 대기시간", labels=["engine"]),
+        }
+        timeouts = CounterMetricFamily("t4p_db_pool_timeouts", "checkout 타임아웃 횟수", labels=["engine"])
+        for engine_name, stats in get_pool_stats().items():
+            for key, family in pool_gauges.items():
+                family.add_metric([engine_name], stats[key])
+            timeouts.add_metric([engine_name], stats["timeouts"])
+        yield from pool_gauges.values()
+        yield timeouts
+
+        writer = CounterMetricFamily("t4p_analytics_rows", "ai_schedule_places 쓰기 큐 처리 건수", labels=["result"])
+        for result, count in analytics_writer.writer_stats.items():
+            writer.add_metric([result], count)
+        yield writer
+
+        popular = CounterMetricFamily("t4p_popularity_rows", "인기 장소 카운터(Redis) 반영 건수", labels=["result"])
+        for result, count in popularity.popularity_stats.items():
+            popular.add_metric([result], count)
+        yield popular
+
+        jobs = CounterMetricFamily("t4p_schedule_jobs", "일정 생성 작업 처리 건수 (이 프로세스)", labels=["result"])
+        for result, count in schedule_jobs.job_stats.items():
+            jobs.add_metric([result], count)
+        yield jobs
+
+
+REGISTRY.register(AppStatsCollector())
+
+
+def route_name(app, scope) -> str:
+    """경로 파라미터를 치환하지 않은 라우트 템플릿 (라벨 수가 늘어나지 않도록)"""
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", scope["path"])
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """라우트별 지연시간 히스토그램 / 처리 중 요청 게이지를 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app, fastapi_app=None):
+        self.app = app
+        self.fastapi_app = fastapi_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_name(self.fastapi_app, scope)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 스트리밍(SSE) 응답은 마지막 이벤트 전송까지 포함
+            HTTP_REQUEST_SECONDS.labels(method, route, str(status["code"])).observe(time.perf_counter() - started)
+            in_flight.dec()
+
+
+def render():
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
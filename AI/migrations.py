@@ -0,0 +1,77 @@
+import logging
+
+from sqlalchemy import inspect, text
+
+from services.city_index import parse_region_keys
+
+logger = logging.getLogger(__name__)
+
+# 테이블 → 지역 파싱에 쓸 컬럼 (앞쪽 우선)
+REGION_KEY_TABLES = {
+    "destinations": ["area", "location"],
+    "meals": ["location"],
+    "accommodations": ["location"],
+}
+REGION_KEY_COLUMNS = {"city_key": "VARCHAR(20)", "region_key": "VARCHAR(30)"}
+
+# 주소로 지역을 알 수 없는 행 표시 (region_key = '') → 다음 백필에서 다시 고르지 않음
+# 인덱스 조회에는 걸리지 않고 ILIKE 대체 조회로만 찾힘
+UNPARSEABLE = ""
+
+BATCH_SIZE = 1000
+
+
+def add_region_key_columns(conn):
+    """create_all은 기존 테이블에 컬럼을 추가하지 않으므로 컬럼/인덱스를 직접 추가 (여러 번 실행해도 안전)"""
+    existing_tables = set(inspect(conn).get_table_names())
+    for table in REGION_KEY_TABLES:
+        if table not in existing_tables:
+            continue
+        for column, column_type in REGION_KEY_COLUMNS.items():
+            if conn.dialect.name == "postgresql":
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {column_type}"))
+            elif column not in {c["name"] for c in inspect(conn).get_columns(table)}:
+                # SQLite(로컬 벤치)는 ADD COLUMN IF NOT EXISTS 미지원
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"))
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})"))
+
+
+def backfill_region_keys(conn, refill_all: bool = False) -> dict:
+    """
+    city_key/region_key가 비어 있는 장소를 주소로 채움
+    Node 수집기(Backend/server)가 넣은 행은 ORM 이벤트를 거치지 않으므로 수집 후 실행
+    반환: {테이블: (대상 행 수, 갱신 행 수)}, 지역을 알 수 없는 행은 UNPARSEABLE로 표시
+    """
+    result = {}
+    for table, columns in REGION_KEY_TABLES.items():
+        condition = "" if refill_all else "WHERE city_key IS NULL AND region_key IS NULL"
+        rows = conn.execute(text(f"SELECT id, {', '.join(columns)} FROM {table} {condition}")).fetchall()
+
+        updates = []
+        updated = 0
+        for row in rows:
+            city_key, region_key = parse_region_keys(*row[1:])
+            if city_key or region_key:
+                updated += 1
+            else:
+                region_key = UNPARSEABLE
+            updates.append({"id": row[0], "city_key": city_key, "region_key": region_key})
+
+        for i in range(0, len(updates), BATCH_SIZE):
+            conn.execute(
+                text(f"UPDATE {table} SET city_key = :city_key, region_key = :region_key WHERE id = :id"),
+                updates[i:i + BATCH_SIZE],
+            )
+        result[table] = (len(rows), updated)
+    return result
+
+
+def upgrade(conn, refill_all: bool = False) -> dict:
+    """배포 시 1회 실행하는 마이그레이션 (scripts/backfill_region_keys.py): 지역 키 컬럼 추가 후 비어 있는 키 채움"""
+    add_region_key_columns(conn)
+    result = backfill_region_keys(conn, refill_all)
+    for table, (targets, updated) in result.items():
+        if targets > updated:
+            logger.warning("%s: 주소로 지역 키를 만들 수 없는 장소 %d건 (ILIKE 대체 조회로만 검색됨)",
+                           table, targets - updated)
+    return result
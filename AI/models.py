@@ -1,6 +1,8 @@
 from sqlalchemy import Column, Integer, String, Float, Boolean, Text, DateTime, JSON, ForeignKey, Date
+from sqlalchemy import event
 from sqlalchemy.orm import relationship
 from database import Base
+from services.city_index import parse_region_keys
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -71,6 +73,9 @@ class Destination(Base):
     latitude = Column(Float)
     longitude = Column(Float)
     keywords = Column(JSON)
+    # 정규화된 시/도, 시군구 키 (ILIKE 대신 인덱스 조회용)
+    city_key = Column(String(20), index=True)
+    region_key = Column(String(30), index=True)
 
     reviews = relationship("Review", back_populates="destination")
 
@@ -91,6 +96,8 @@ class Meal(Base):
     latitude = Column(Float)
     longitude = Column(Float)
     keywords = Column(JSON)
+    city_key = Column(String(20), index=True)
+    region_key = Column(String(30), index=True)
 
     reviews = relationship("Review", back_populates="meal")
 
@@ -110,6 +117,8 @@ class Accommodation(Base):
     latitude = Column(Float)
     longitude = Column(Float)
     category = Column(Text, nullable=True)  # 예: 호텔, 게스트하우스 등
+    city_key = Column(String(20), index=True)
+    region_key = Column(String(30), index=True)
 
     reviews = relationship("Review", back_populates="accommodation")
 
@@ -158,3 +167,14 @@ class Review(Base):
     meal = relationship("Meal", back_populates="reviews")
     destination = relationship("Destination", back_populates="reviews")
     accommodation = relationship("Accommodation", back_populates="reviews")
+
+
+# 장소 저장 시점에 주소(area, location)로 city_key/region_key 채움
+def fill_region_keys(mapper, connection, target):
+    target.city_key, target.region_key = parse_region_keys(
+        getattr(target, "area", None), target.location
+    )
+
+for place_model in (Destination, Meal, Accommodation):
+    event.listen(place_model, "before_insert", fill_region_keys)
+    event.listen(place_model, "before_update", fill_region_keys)
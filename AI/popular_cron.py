@@ -1,8 +1,8 @@
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from AI.services.popular_service import update_popular_destinations
+from services.popular_service import update_popular_places
 
 if __name__ == "__main__":
-    update_popular_destinations()
\ No newline at end of file
+    update_popular_places()
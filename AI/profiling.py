@@ -0,0 +1,146 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import Histogram
+from sqlalchemy import event
+
+import metrics
+from config import settings
+from database import engine, async_engine
+
+logger = logging.getLogger(__name__)
+
+REQUEST_DB_QUERIES = Histogram(
+    "t4p_request_db_queries", "요청당 실행한 SQL 수", ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "t4p_request_db_seconds", "요청당 DB 실행 시간 합계", ["route"], buckets=metrics.LATENCY_BUCKETS,
+)
+
+
+class RequestProfile:
+    """요청 하나 동안 누적되는 DB / LLM / 외부 HTTP 사용량"""
+
+    __slots__ = ("db_queries", "db_seconds", "llm_calls", "llm_seconds", "http_calls", "http_seconds")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+        self.http_calls = 0
+        self.http_seconds = 0.0
+
+    def server_timing(self, total_seconds: float) -> str:
+        # 요청 전체 합계는 req- 접두사 (라우터의 단계별 이름 llm 등과 겹치지 않도록)
+        return ", ".join([
+            f'req-db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} queries"',
+            f'req-llm;dur={self.llm_seconds * 1000:.1f};desc="{self.llm_calls} calls"',
+            f'req-http;dur={self.http_seconds * 1000:.1f};desc="{self.http_calls} calls"',
+            f"req-total;dur={total_seconds * 1000:.1f}",
+        ])
+
+
+# 객체 자체를 공유하므로 asyncio.gather / to_thread 로 복사된 컨텍스트에서 기록해도 같은 요청에 합산됨
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def record_llm(seconds: float):
+    profile = _current.get()
+    if profile is not None:
+        profile.llm_calls += 1
+        profile.llm_seconds += seconds
+
+
+def record_http(seconds: float):
+    profile = _current.get()
+    if profile is not None:
+        profile.http_calls += 1
+        profile.http_seconds += seconds
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["profile_started"].pop()
+    profile = _current.get()
+    if profile is not None:
+        profile.db_queries += 1
+        profile.db_seconds += time.perf_counter() - started
+
+
+def _handle_error(exception_context):
+    # 실패한 쿼리는 after_cursor_execute가 호출되지 않으므로 시작 시각만 정리
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("profile_started"):
+        conn.info["profile_started"].pop()
+
+
+def install():
+    """동기/비동기 엔진에 커서 실행 이벤트 등록 (비동기 엔진은 내부 sync_engine에 등록)"""
+    for target in (engine, async_engine.sync_engine):
+        if event.contains(target, "before_cursor_execute", _before_cursor_execute):
+            continue
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+        event.listen(target, "handle_error", _handle_error)
+
+
+class ProfilingMiddleware:
+    """요청별 SQL 수/DB·LLM·HTTP 시간을 Server-Timing 헤더로 내보내고 기준 초과 시 경고"""
+
+    def __init__(self, app, fastapi_app=None):
+        self.app = app
+        self.fastapi_app = fastapi_app
+
+    async def __call__(self, scope, receive, send):
+        if not settings.PROFILE_ENABLED or scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                timing = profile.server_timing(time.perf_counter() - started).encode("latin-1")
+                headers = list(message.get("headers", []))
+                for i, (name, value) in enumerate(headers):
+                    # 라우터가 넣은 단계별 Server-Timing(ai_router 등)이 있으면 뒤에 이어 붙임
+                    if name.lower() == b"server-timing":
+                        headers[i] = (name, value + b", " + timing)
+                        break
+                else:
+                    headers.append((b"server-timing", timing))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            self._report(scope, profile, time.perf_counter() - started)
+
+    def _report(self, scope, profile: RequestProfile, total_seconds: float):
+        route = metrics.route_name(self.fastapi_app, scope)
+        REQUEST_DB_QUERIES.labels(route).observe(profile.db_queries)
+        REQUEST_DB_SECONDS.labels(route).observe(profile.db_seconds)
+
+        reasons = []
+        if profile.db_queries > settings.PROFILE_MAX_QUERIES:
+            reasons.append(f"SQL {profile.db_queries}회")
+        if profile.db_seconds * 1000 > settings.PROFILE_SLOW_DB_MS:
+            reasons.append(f"DB {profile.db_seconds * 1000:.0f}ms")
+        if total_seconds * 1000 > settings.PROFILE_SLOW_REQUEST_MS:
+            reasons.append(f"전체 {total_seconds * 1000:.0f}ms")
+        if reasons:
+            logger.warning(
+                "느린 요청 %s %s (%s) - %s",
+                scope["method"], route, ", ".join(reasons), profile.server_timing(total_seconds),
+            )
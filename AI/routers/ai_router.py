@@ -1,140 +1,110 @@
 import json
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-import schemas, crud, models
-from database import get_db
+from contextlib import aclosing
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+import schemas, crud
+from database import get_db, AsyncSessionLocal
 from auth import get_current_user_optional  # 로그인 선택적 처리
-from services.gpt_service import get_ai_schedule
-import re
+from services.gpt_service import stream_ai_schedule, format_server_timing
+from services.schedule_service import create_ai_schedule
+from services import schedule_jobs
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 
 @router.post("/schedule", response_model=schemas.ScheduleResponse)
-def recommend_schedule(
+async def recommend_schedule(
     schedule: schemas.ScheduleCreate,
+    response: Response,
     current_user=Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     user_id = current_user.id if current_user else None
+    timings = {}
 
     try:
-        # 1) DB에 기본 일정 데이터 저장 (AI 코멘트 제외)
-        new_schedule = crud.create_schedule(db, schedule, user_id)
-
-        # 2) 저장된 기본 일정 schedule_json 파싱
-        base_schedule_json = new_schedule.schedule_json
-        if isinstance(base_schedule_json, str):
-            base_schedule_data = json.loads(base_schedule_json)
-        elif isinstance(base_schedule_json, dict):
-            base_schedule_data = base_schedule_json
-        else:
-            raise HTTPException(status_code=500, detail="schedule_json 필드가 올바른 형식이 아님")
-
-        base_plans_raw = base_schedule_data.get("plans", None) or {}
-
-        # base_plans를 dict이면 list로 변환
-        if isinstance(base_plans_raw, dict):
-            base_plans_list = []
-            for day_key, base_day in base_plans_raw.items():
-                try:
-                    day_num = int(''.join(filter(str.isdigit, day_key)))
-                except Exception:
-                    day_num = 1
-                base_plans_list.append({
-                    "day": day_num,
-                    "schedule": base_day.get("schedule", []) if isinstance(base_day, dict) else []
-                })
-            base_plans_list.sort(key=lambda x: x["day"])
-        elif isinstance(base_plans_raw, list):
-            base_plans_list = base_plans_raw
-        else:
-            base_plans_list = []
-
-        if not base_plans_list or all(len(day.get("schedule", [])) == 0 for day in base_plans_list):
-            base_plans_list = [{"day": 1, "schedule": []}]
-
-        # 3) AI 호출
-        ai_response = get_ai_schedule(
-            db=db,
-            end_city=schedule.endCity,
-            start_date=schedule.startDate,
-            end_date=schedule.endDate,
-            emotions=schedule.emotions,
-            companions=schedule.companions or [],
-            peopleCount=schedule.peopleCount
-        )
-
-        if isinstance(ai_response, str):
-            ai_response_data = json.loads(ai_response)
-        elif hasattr(ai_response, "dict"):
-            ai_response_data = ai_response.dict()
-        else:
-            ai_response_data = ai_response
-
-        ai_plans_raw = ai_response_data.get("plans", {}) or {}
-
-        if isinstance(ai_plans_raw, list):
-            ai_plans_list = ai_plans_raw
-        elif isinstance(ai_plans_raw, dict):
-            ai_plans_list = []
-            for day_key, ai_day in ai_plans_raw.items():
-                try:
-                    day_num = int(''.join(filter(str.isdigit, day_key)))
-                except Exception:
-                    day_num = 1
-                ai_plans_list.append({
-                    "day": day_num,
-                    "schedule": ai_day.get("schedule", []) if isinstance(ai_day, dict) else []
-                })
-            ai_plans_list.sort(key=lambda x: x["day"])
-        else:
-            ai_plans_list = []
+        final_response = await create_ai_schedule(db, schedule, user_id, timings)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"AI 호출 또는 저장 실패: {str(e)}")
 
-        if not ai_plans_list or all(len(day.get("schedule", [])) == 0 for day in ai_plans_list):
-            ai_plans_list = [{"day": 1, "schedule": []}]
+    # 단계별 소요시간 (fetch_places / llm / parse / validate / route / save_places)
+    response.headers["Server-Timing"] = format_server_timing(timings)
 
-        # 4) aiComment 붙이기 (base_plans_list 안에 aiComment 추가)
-        for base_day in base_plans_list:
-            day_num = base_day["day"]
-            ai_day = next((d for d in ai_plans_list if d["day"] == day_num), None)
-            if ai_day:
-                for idx, base_place in enumerate(base_day["schedule"]):
-                    if idx < len(ai_day["schedule"]):
-                        ai_comment = ai_day["schedule"][idx].get("aiComment", "")
-                        base_place["aiComment"] = ai_comment
+    return final_response
 
-        # 5) AI plans를 DB에 저장할 형식으로 변환 (dict로 day1, day2 ...)
-        plans_to_save = {}
-        for day in ai_plans_list:
-            day_key = f"day{day['day']}"
-            plans_to_save[day_key] = day
 
-        # 6) GPT 응답에서 받은 aiEmpathy와 tags도 저장하도록 추가
-        update_data = {
-            "schedule_json": {
-                "plans": plans_to_save
-            },
-            "aiEmpathy": ai_response_data.get("aiEmpathy", ""),
-            "tags": ai_response_data.get("tags", [])
-        }
+def format_sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-        updated_schedule = crud.update_schedule(db, new_schedule.id, user_id, update_data)
 
-        # 7) 최종 응답을 위한 dict → list 변환
-        plans_list_for_response = []
-        for day_key in sorted(plans_to_save.keys(), key=lambda x: int(''.join(filter(str.isdigit, x)))):
-            day_data = plans_to_save[day_key]
-            plans_list_for_response.append(day_data)
+@router.post("/schedule/stream")
+async def recommend_schedule_stream(
+    schedule: schemas.ScheduleCreate,
+    current_user=Depends(get_current_user_optional)
+):
+    """
+    /ai/schedule 스트리밍 버전 (Server-Sent Events)
+    event: meta (aiEmpathy/tags) → day (하루치 확정 일정, 여러 번) → done (전체 결과) / error
+    """
+    user_id = current_user.id if current_user else None
 
-        # 8) 최종 응답 생성
-        final_response = schemas.ScheduleResponse(
-            aiEmpathy=ai_response_data.get("aiEmpathy", ""),
-            tags=ai_response_data.get("tags", []),
-            plans=plans_list_for_response
-        )
+    async def event_stream():
+        # 응답이 끝날 때까지 쓰는 세션이므로 의존성 대신 직접 생성
+        async with AsyncSessionLocal() as db:
+            try:
+                new_schedule = await crud.create_schedule(db, schedule, user_id)
+                # 클라이언트가 끊겨 이 제너레이터가 닫히면 LLM 스트림까지 바로 정리 (동시 호출 슬롯 반환)
+                async with aclosing(stream_ai_schedule(
+                    db=db,
+                    end_city=schedule.endCity,
+                    start_date=schedule.startDate,
+                    end_date=schedule.endDate,
+                    emotions=schedule.emotions,
+                    companions=schedule.companions or [],
+                    peopleCount=schedule.peopleCount,
+                )) as events:
+                    async for event, data in events:
+                        if event == "done":
+                            await crud.update_schedule(db, new_schedule.id, user_id, {
+                                "schedule_json": {"plans": {f"day{day['day']}": day for day in data["plans"]}},
+                                "aiEmpathy": data.get("aiEmpathy") or "",
+                                "tags": data.get("tags") or [],
+                            })
+                        yield format_sse(event, data)
+            except Exception as e:
+                yield format_sse("error", {"detail": f"AI 호출 또는 저장 실패: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/schedule/jobs", response_model=schemas.ScheduleJobResponse, status_code=202)
+async def enqueue_schedule_job(
+    schedule: schemas.ScheduleCreate,
+    current_user=Depends(get_current_user_optional)
+):
+    """
+    /ai/schedule 백그라운드 작업 버전: 작업을 Redis 대기열에 넣고 jobId를 바로 반환
+    결과는 GET /ai/schedule/jobs/{jobId} 로 조회 (wait로 롱 폴링 가능)
+    """
+    user_id = current_user.id if current_user else None
+    try:
+        return await schedule_jobs.enqueue(schedule, user_id)
+    except schedule_jobs.QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "10"})
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"AI 호출 또는 저장 실패: {str(e)}")
 
-    return final_response
+@router.get("/schedule/jobs/{job_id}", response_model=schemas.ScheduleJobResponse)
+async def get_schedule_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="완료될 때까지 최대 대기 시간(초)"),
+    current_user=Depends(get_current_user_optional)
+):
+    job = await (schedule_jobs.wait_job(job_id, wait) if wait else schedule_jobs.get_job(job_id))
+    # 다른 사용자의 작업은 존재 여부도 노출하지 않음
+    if job is None or (job["userId"] is not None and (current_user is None or current_user.id != job["userId"])):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
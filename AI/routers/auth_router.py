@@ -1,6 +1,6 @@
 # routers/auth_router.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 import schemas, crud, auth
 from database import get_db
@@ -10,15 +10,15 @@ from auth import authenticate_user, get_current_user
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/signup", response_model=schemas.UserResponse)
-def signup(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    if crud.get_user_by_username(db, user.username):
+async def signup(user: schemas.UserCreate, db: AsyncSession = Depends(get_db)):
+    if await crud.get_user_by_username(db, user.username):
         raise HTTPException(status_code=400, detail="Username already registered")
-    new_user = crud.create_user(db, user)  # 해싱된 비밀번호 직접 넘기지 말기
+    new_user = await crud.create_user(db, user)  # 해싱된 비밀번호 직접 넘기지 말기
     return new_user
 
 @router.post("/login", response_model=schemas.Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     access_token = create_access_token(data={"sub": user.username})
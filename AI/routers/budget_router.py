@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
 from schemas import BudgetRequest, BudgetResponse
 from services import budget_service
@@ -9,7 +9,7 @@ router = APIRouter(prefix="/api/schedules", tags=["budgets"])
 @router.post("/budgets", response_model=BudgetResponse)
 async def calculate_budget_from_schedule_data(
     request: BudgetRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     raw_result = await budget_service.calculate_total_budget_from_plan(db, request)
 
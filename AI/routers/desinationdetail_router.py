@@ -1,31 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
 from database import get_db
 from pydantic import BaseModel
 from typing import List, Optional
 from models import Meal, Destination, Accommodation, Review
+from services import llm_cache
 import json
-import openai
-from dotenv import load_dotenv
-import os
 import asyncio
 
 router = APIRouter(prefix="/api")
 
-# Load environment variables
-load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
-
-# 캐시 딕셔너리
-ai_comment_cache = {}
-
 # AI comment generation
 async def get_ai_comment_cached(place_name: str, reviews: List[str], emotions: List[str], companions: List[str], people_count: int) -> str:
-    key = f"{place_name}-{','.join(emotions)}-{','.join(companions)}-{people_count}"
-    if key in ai_comment_cache:
-        return ai_comment_cache[key]
-
     review_text = " ".join(reviews)
     prompt = f"""
     {place_name}에 대해 {emotions} 감정을 가진 {companions}와 함께 {people_count}명이 여행을 간다고 상상해보세요.
@@ -40,7 +27,9 @@ async def get_ai_comment_cached(place_name: str, reviews: List[str], emotions: L
     예: "이곳은 여유롭게 혼자만의 시간을 보낼 수 있는 곳이에요 🌿", "친구들과 함께 와서 즐길 수 있는 활기찬 장소예요 🕺", "가족과 함께 가기 좋은 편안한 분위기의 여행지입니다 👨‍👩‍👧"
     """
     try:
-        completion = await asyncio.to_thread(openai.chat.completions.create,
+        # 프롬프트 지문 기반 공용 LLM 캐시 (TTL/크기 제한)
+        return await llm_cache.cached_chat_text(
+            "place_comment",
             model="gpt-4o-mini",
             messages=[{
                 "role": "system",
@@ -51,9 +40,6 @@ async def get_ai_comment_cached(place_name: str, reviews: List[str], emotions: L
             }],
             temperature=0.8,
         )
-        ai_comment = completion.choices[0].message.content.strip()
-        ai_comment_cache[key] = ai_comment
-        return ai_comment
     except asyncio.CancelledError:
         raise
     except Exception:
@@ -108,41 +94,45 @@ def parse_keywords(raw_keywords):
     except Exception:
         return raw_keywords.split(",")
 
-def fetch_reviews_for_ai(db: Session, place_id: str, place_type: str):
-    reviews = []
-    if place_type == "meal":
-        meal = db.query(Meal).filter(Meal.place_id == place_id).first()
-        if meal:
-            reviews = db.query(Review).filter(Review.meal_id == meal.id).all()
-    elif place_type == "destination":
-        destination = db.query(Destination).filter(Destination.place_id == place_id).first()
-        if destination:
-            reviews = db.query(Review).filter(Review.destination_id == destination.id).all()
-    elif place_type == "accommodation":
-        accommodation = db.query(Accommodation).filter(Accommodation.place_id == place_id).first()
-        if accommodation:
-            reviews = db.query(Review).filter(Review.accommodation_id == accommodation.id).all()
+# 장소 타입별 reviews 테이블 FK 컬럼
+review_fk_map = {
+    "meal": Review.meal_id,
+    "destination": Review.destination_id,
+    "accommodation": Review.accommodation_id,
+}
+
+async def fetch_reviews_for_ai(db: AsyncSession, place_pk: int, place_type: str):
+    fk_column = review_fk_map.get(place_type)
+    if fk_column is None:
+        return []
+    reviews = (await db.execute(select(Review).where(fk_column == place_pk))).scalars().all()
     return [review.comment for review in reviews]
 
-def fetch_random_review(db: Session, column_name: str, id_value: int):
-    query = text(f"SELECT created_at, comment FROM reviews WHERE {column_name} = :id ORDER BY RANDOM() LIMIT 1")
-    result = db.execute(query, {"id": id_value}).fetchone()
+async def fetch_random_review(db: AsyncSession, column_name: str, id_value: int):
+    # ORM 컬럼으로 조회해야 created_at이 DB 종류와 관계없이 datetime으로 옴 (벤치마크용 SQLite 포함)
+    query = (
+        select(Review.created_at, Review.comment)
+        .where(getattr(Review, column_name) == id_value)
+        .order_by(func.random())
+        .limit(1)
+    )
+    result = (await db.execute(query)).fetchone()
     if result:
         return ReviewHighlight(date=result.created_at.strftime("%Y.%m.%d"), review=result.comment)
     return None
 
 @router.post("/places-detail", response_model=PlaceDetail)
-async def get_place_detail(place_request: PlaceRequest, db: Session = Depends(get_db)):
+async def get_place_detail(place_request: PlaceRequest, db: AsyncSession = Depends(get_db)):
     place_id = place_request.placeId
     emotions = place_request.emotions
     companions = place_request.companions
     people_count = place_request.peopleCount
 
-    meal = db.query(Meal).filter(Meal.place_id == place_id).first()
+    meal = (await db.execute(select(Meal).where(Meal.place_id == place_id))).scalars().first()
     if meal:
-        reviews_task = asyncio.to_thread(fetch_reviews_for_ai, db, place_id, "meal")
-        review_data_task = asyncio.to_thread(fetch_random_review, db, "meal_id", meal.id)
-        reviews, review_data = await asyncio.gather(reviews_task, review_data_task)
+        # AsyncSession은 동시 쿼리를 지원하지 않으므로 순차 조회
+        reviews = await fetch_reviews_for_ai(db, meal.id, "meal")
+        review_data = await fetch_random_review(db, "meal_id", meal.id)
         ai_comment = await get_ai_comment_cached(meal.name, reviews, emotions, companions, people_count)
         price_val = price_map.get(meal.price_level)
         return PlaceDetail(
@@ -163,11 +153,11 @@ async def get_place_detail(place_request: PlaceRequest, db: Session = Depends(ge
             placeType="meal"
         )
 
-    dest = db.query(Destination).filter(Destination.place_id == place_id).first()
+    dest = (await db.execute(select(Destination).where(Destination.place_id == place_id))).scalars().first()
     if dest:
-        reviews_task = asyncio.to_thread(fetch_reviews_for_ai, db, place_id, "destination")
-        review_data_task = asyncio.to_thread(fetch_random_review, db, "destination_id", dest.id)
-        reviews, review_data = await asyncio.gather(reviews_task, review_data_task)
+        # AsyncSession은 동시 쿼리를 지원하지 않으므로 순차 조회
+        reviews = await fetch_reviews_for_ai(db, dest.id, "destination")
+        review_data = await fetch_random_review(db, "destination_id", dest.id)
         ai_comment = await get_ai_comment_cached(dest.name, reviews, emotions, companions, people_count)
         price_val = price_map.get(dest.price_level)
         return PlaceDetail(
@@ -188,11 +178,11 @@ async def get_place_detail(place_request: PlaceRequest, db: Session = Depends(ge
             placeType="destination"
         )
 
-    accom = db.query(Accommodation).filter(Accommodation.place_id == place_id).first()
+    accom = (await db.execute(select(Accommodation).where(Accommodation.place_id == place_id))).scalars().first()
     if accom:
-        reviews_task = asyncio.to_thread(fetch_reviews_for_ai, db, place_id, "accommodation")
-        review_data_task = asyncio.to_thread(fetch_random_review, db, "accommodation_id", accom.id)
-        reviews, review_data = await asyncio.gather(reviews_task, review_data_task)
+        # AsyncSession은 동시 쿼리를 지원하지 않으므로 순차 조회
+        reviews = await fetch_reviews_for_ai(db, accom.id, "accommodation")
+        review_data = await fetch_random_review(db, "accommodation_id", accom.id)
         ai_comment = await get_ai_comment_cached(accom.name, reviews, emotions, companions, people_count)
         return PlaceDetail(
             image=accom.image_url,
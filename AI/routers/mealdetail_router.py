@@ -1,21 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
 from database import get_db  
 from pydantic import BaseModel
 from typing import List, Optional
 from models import Meal, Review
+from services import llm_cache
 import json
-import openai
-from dotenv import load_dotenv
-import os
 import asyncio
 
 router = APIRouter(prefix="/api")
 
-load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
-
 # 요청 모델
 class FoodPlaceRequest(BaseModel):
     placeId: str
@@ -67,7 +62,7 @@ def parse_keywords(raw_keywords):
         return raw_keywords.split(",")
 
 # AI 코멘트 생성 함수
-def generate_ai_comment_from_reviews(place_name: str, reviews: List[str], companions: List[str], atmospheres: List[str]) -> str:
+async def generate_ai_comment_from_reviews(place_name: str, reviews: List[str], companions: List[str], atmospheres: List[str]) -> str:
     review_text = " ".join(reviews)
     
     prompt = f"""
@@ -85,7 +80,8 @@ def generate_ai_comment_from_reviews(place_name: str, reviews: List[str], compan
     - 리뷰가 없는 경우에는 내용을 만들어내지 말고, 대신 사용자가 선택한 분위기나 동반자 정보를 기반으로 따뜻하고 공감 가는 추천 문장을 작성해주세요.
     """
     try:
-        completion = openai.chat.completions.create(
+        return await llm_cache.cached_chat_text(
+            "meal_comment",
             model="gpt-4o-mini",
             messages=[{
                 "role": "system",
@@ -96,17 +92,19 @@ def generate_ai_comment_from_reviews(place_name: str, reviews: List[str], compan
             }],
             temperature=0.8,
         )
-        return completion.choices[0].message.content.strip()
     except asyncio.CancelledError:
         raise
     except Exception:
         return "추천 사유를 생성하는 데 문제가 발생했습니다."
 
-def fetch_random_review(db: Session, meal_id: int) -> Optional[ReviewHighlight]:
-    result = db.execute(
-        text("SELECT created_at, comment FROM reviews WHERE meal_id = :id ORDER BY RANDOM() LIMIT 1"),
-        {"id": meal_id}
-    ).fetchone()
+async def fetch_random_review(db: AsyncSession, meal_id: int) -> Optional[ReviewHighlight]:
+    # ORM 컬럼으로 조회해야 created_at이 DB 종류와 관계없이 datetime으로 옴 (벤치마크용 SQLite 포함)
+    result = (await db.execute(
+        select(Review.created_at, Review.comment)
+        .where(Review.meal_id == meal_id)
+        .order_by(func.random())
+        .limit(1)
+    )).fetchone()
     if result:
         return ReviewHighlight(
             date=result.created_at.strftime("%Y.%m.%d"),
@@ -114,26 +112,26 @@ def fetch_random_review(db: Session, meal_id: int) -> Optional[ReviewHighlight]:
         )
     return None
 
-def fetch_reviews_for_meal(db: Session, meal_id: int) -> List[str]:
-    reviews = db.query(Review).filter(Review.meal_id == meal_id).all()
+async def fetch_reviews_for_meal(db: AsyncSession, meal_id: int) -> List[str]:
+    reviews = (await db.execute(select(Review).where(Review.meal_id == meal_id))).scalars().all()
     return [r.comment for r in reviews]
 
 @router.post("/food-places-detail", response_model=PlaceDetail)
-async def get_meal_detail(request: FoodPlaceRequest, db: Session = Depends(get_db)):
+async def get_meal_detail(request: FoodPlaceRequest, db: AsyncSession = Depends(get_db)):
     place_id = request.placeId
     companions = request.companions
     atmospheres = request.atmospheres
 
     # meal 데이터 조회
-    meal = db.query(Meal).filter(Meal.place_id == place_id).first()
+    meal = (await db.execute(select(Meal).where(Meal.place_id == place_id))).scalars().first()
     if not meal:
         raise HTTPException(status_code=404, detail="Place not found")
 
 
-    reviews = fetch_reviews_for_meal(db, meal.id)
-    ai_comment = await asyncio.to_thread(generate_ai_comment_from_reviews, meal.name, reviews, companions, atmospheres)
+    reviews = await fetch_reviews_for_meal(db, meal.id)
+    ai_comment = await generate_ai_comment_from_reviews(meal.name, reviews, companions, atmospheres)
 
-    review_data = fetch_random_review(db, meal.id) #리뷰랜덤으로 선정
+    review_data = await fetch_random_review(db, meal.id) #리뷰랜덤으로 선정
 
     # 가격 문자열
     price_val = price_map.get(meal.price_level)
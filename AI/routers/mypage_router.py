@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import schemas, models
 from database import get_db
 from auth import get_current_user
@@ -7,7 +8,7 @@ from auth import get_current_user
 router = APIRouter(prefix="/mypage", tags=["mypage"])
 
 @router.get("/", response_model=schemas.MyPageResponse)
-def get_mypage_info(
+async def get_mypage_info(
     current_user: models.User = Depends(get_current_user)
 ):
     return {
@@ -16,9 +17,9 @@ def get_mypage_info(
     }
 
 @router.get("/schedules", response_model=list[schemas.MySimplePlan])
-def get_my_schedules(
-    db: Session = Depends(get_db),
+async def get_my_schedules(
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    schedules = db.query(models.Schedule).filter_by(user_id=current_user.id).all()
-    return schedules
+    result = await db.execute(select(models.Schedule).where(models.Schedule.user_id == current_user.id))
+    return result.scalars().all()
@@ -1,14 +1,27 @@
 # routers/popular_router.py
 
-from fastapi import APIRouter
-import json
-from config import redis_client
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_db
+from services import popular_service, popularity
 
 router = APIRouter()
 
 @router.get("/popular-places")
-def get_popular_places():
-    data = redis_client.get("popular_places")
-    if data:
-        return json.loads(data)
-    return []
+async def get_popular_places(
+    window: str = Query("7d", description="집계 구간 (24h, 7d, 30d), 최근일수록 가중치가 큼"),
+    city: Optional[str] = Query(None, description="도시 (예: 서울, 부산광역시)"),
+    type: Optional[str] = Query(None, description="destination/meal/accommodation 또는 관광지/맛집/숙소"),
+    limit: int = Query(16, ge=1, le=50),
+    db: AsyncSession = Depends(get_db)
+):
+    if window not in popularity.WINDOWS:
+        raise HTTPException(status_code=400, detail=f"window는 {', '.join(popularity.WINDOWS)} 중 하나여야 합니다")
+    try:
+        place_type = popular_service.parse_place_type(type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await popular_service.get_popular_places(db, window, city, place_type, limit)
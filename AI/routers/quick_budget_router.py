@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, Body, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
 from services.quick_budget_service import quick_budget
 import schemas
@@ -14,20 +14,20 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/budgets", tags=["budgets"])
 
 @router.post("", response_model=schemas.PlanBudgetResponse)
-def quick_budget_api(
+async def quick_budget_api(
     startCity: str = Body(...),
     endCity: str = Body(...),
     startDate: str = Body(...),
     endDate: str = Body(...),
     peopleNum: int = Body(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     try:
         # 문자열 → 날짜 변환
         start_date_dt = datetime.strptime(startDate, "%Y-%m-%d").date()
         end_date_dt = datetime.strptime(endDate, "%Y-%m-%d").date()
 
-        result = quick_budget(startCity, endCity, start_date_dt, end_date_dt, peopleNum, db)
+        result = await quick_budget(startCity, endCity, start_date_dt, end_date_dt, peopleNum, db)
 
         return {
             "totalBudget": result["total_cost"],
@@ -1,15 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from pydantic import BaseModel
 from typing import List
-from openai import OpenAI
-from config import settings
 from database import get_db
-import json
+from services import llm_cache, llm_json, prompt_compact, city_index, singleflight
+import math
 
 router = APIRouter()
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
 # 요청 모델
 class RestaurantRequest(BaseModel):
@@ -32,16 +30,27 @@ class RestaurantResponse(BaseModel):
     places: List[RestaurantPlace]
 
 # DB에서 meals 테이블 쿼리
-def fetch_meals_from_db(db: Session, city: str, region: str):
-    results = db.execute(text("""
+async def fetch_meals_from_db(db: AsyncSession, city: str, region: str):
+    sql = """
         SELECT place_id, name, food_type, image_url,
                rating, review_count, price_level,
                style_quiet, style_date, style_family,
                style_view, style_modern, style_traditional
         FROM meals
-        WHERE location ILIKE :region AND location ILIKE :city
+        WHERE {where}
         LIMIT 50
-    """), {"region": f"%{region}%", "city": f"%{city}%"}).fetchall()
+    """
+    results = []
+    keys = city_index.parse_city_query(city, region)
+    if keys:
+        # 정규화된 city_key/region_key 인덱스 조회
+        results = (await db.execute(text(sql.format(where=city_index.region_filter_sql(keys))), keys)).fetchall()
+    if not results:
+        # 인식하지 못한 입력이거나 지역 키가 아직 채워지지 않은 행: 기존 ILIKE 검색
+        results = (await db.execute(
+            text(sql.format(where="location ILIKE :region AND location ILIKE :city")),
+            {"region": f"%{region}%", "city": f"%{city}%"},
+        )).fetchall()
 
     style_map = {
         "style_quiet": "조용한",
@@ -68,17 +77,25 @@ def fetch_meals_from_db(db: Session, city: str, region: str):
 
     return [row_to_dict(r) for r in results]
 
+# 표에 넣을 컬럼 (이미지 URL 등 모델이 쓰지 않는 값은 제외하고 응답 후 DB 값으로 채움)
+PROMPT_COLUMNS = ["name", "food_type", "rating", "reviewCount", "priceLevel", "tags"]
+RESTAURANT_MODEL = "gpt-4o"
+
+def popularity(meal: dict) -> float:
+    return (meal["rating"] or 0) * math.log1p(meal["reviewCount"] or 0)
+
 # GPT 프롬프트 생성
-def generate_prompt(data: RestaurantRequest, meals_data: List[dict]) -> str:
-    meals_json = json.dumps(meals_data, ensure_ascii=False)
-    return f'''
+def generate_prompt(data: RestaurantRequest, meals_data: List[dict], handles: prompt_compact.HandleMap) -> str:
+    def build(rows):
+        meals_table = prompt_compact.encode_table(rows, PROMPT_COLUMNS, handles, "R", id_key="placeId")
+        return f'''
 당신은 사용자 맞춤형 맛집 추천 AI입니다.
 
 조건:
 - 응답은 반드시 JSON 형식으로만 출력하세요.
 - 마크다운, 설명 문장, 안내 문구는 절대 포함하지 마세요.
-- JSON은 중괄호 {{}}로 감싸고, 모든 key는 큰따옴표 "로 감싸야 합니다.
 - 사용자 조건을 기반으로 아래 맛집 리스트 중 **정확히 4~5개**만 선택하세요.
+- placeId에는 리스트의 id(R1, R2 등)를 그대로 사용하세요.
 
 [사용자 조건]
 도시: {data.city}
@@ -88,52 +105,64 @@ def generate_prompt(data: RestaurantRequest, meals_data: List[dict]) -> str:
 동행자: {", ".join(data.companion)}
 
 [맛집 리스트]
-{meals_json}
+{meals_table}
 
 [응답 예시]
-{{
-  "aiComment": "추천 요약 코멘트",
-  "places": [
-    {{
-      "name": "맛집 이름",
-      "aiFoodComment": "해당 음식에 대한 짧은 설명",
-      "tags": ["데이트", "가성비"],
-      "placeId": "ChIJxxxxxx",
-      "imageUrl": "https://example.com/image.jpg"
-    }}
-  ]
-}}
-'''
+{{"aiComment": "추천 요약 코멘트", "places": [{{"placeId": "R1", "aiFoodComment": "해당 음식에 대한 짧은 설명", "tags": ["데이트", "가성비"]}}]}}
+'''.strip()
+
+    # 토큰 상한을 넘으면 평점·리뷰 수가 낮은 후보부터 제외
+    ranked = sorted(meals_data, key=popularity, reverse=True)
+    return prompt_compact.fit_rows(build, ranked, "restaurant", RESTAURANT_MODEL, min_rows=5)
+
+def restore_places(result: dict, meals: List[dict], handles: prompt_compact.HandleMap) -> dict:
+    """핸들을 place_id로 되돌리고 이름/이미지는 DB 값 사용 (목록에 없는 장소는 제외)"""
+    meals_by_id = {m["placeId"]: m for m in meals}
+    places = []
+    for place in result.get("places") or []:
+        if not isinstance(place, dict):
+            continue
+        meal = meals_by_id.get(handles.resolve(place.get("placeId")))
+        if not meal:
+            continue
+        places.append({
+            "name": meal["name"],
+            "aiFoodComment": place.get("aiFoodComment") or "",
+            "tags": place.get("tags") or meal["tags"],
+            "placeId": meal["placeId"],
+            "imageUrl": meal["imageUrl"] or "",
+        })
+    return {"aiComment": result.get("aiComment") or "", "places": places}
 
 # 라우터 엔드포인트
 @router.post("/ai/restaurant", response_model=RestaurantResponse)
-async def ai_recommend_restaurant(data: RestaurantRequest, db: Session = Depends(get_db)):
-    meals = fetch_meals_from_db(db, data.city, data.region)
+async def ai_recommend_restaurant(data: RestaurantRequest, db: AsyncSession = Depends(get_db)):
+    meals = await fetch_meals_from_db(db, data.city, data.region)
     if not meals:
         raise HTTPException(status_code=404, detail="해당 지역 맛집 정보가 없습니다.")
 
-    prompt = generate_prompt(data, meals)
+    handles = prompt_compact.HandleMap()
+    prompt = generate_prompt(data, meals, handles)
+
+    params = dict(
+        model=RESTAURANT_MODEL,
+        messages=[
+            {"role": "system", "content": "넌 사용자 맞춤 맛집 추천 AI야. 반드시 JSON 형식으로 응답해."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.7,
+        max_tokens=3000,
+        response_format=llm_json.JSON_MODE
+    )
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "넌 사용자 맞춤 맛집 추천 AI야. 반드시 JSON 형식으로 응답해."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=3000
-        )
-
-        content = response.choices[0].message.content.strip()
-        print("GPT raw response:\n", content)  # 디버깅 출력
-
-        json_start = content.find('{')
-        json_end = content.rfind('}') + 1
-        parsed_json = content[json_start:json_end]
-        return json.loads(parsed_json)
-
-    except json.JSONDecodeError:
+        content = await singleflight.do("restaurant", singleflight.prompt_key("restaurant", params),
+                                        lambda: llm_cache.cached_chat_text("restaurant", **params))
+        return restore_places(llm_json.parse_llm_json(content, "restaurant"), meals, handles)
+
+    except llm_json.LLMJSONError:
+        # 깨진 응답이 캐시에 남아 같은 요청이 계속 실패하지 않도록 삭제
+        await llm_cache.invalidate("restaurant", **params)
         raise HTTPException(status_code=500, detail="GPT 응답이 JSON 형식이 아닙니다.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"GPT 오류: {str(e)}")
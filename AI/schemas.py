@@ -136,6 +136,13 @@ class PlanBudgetResponse(BaseModel):
     categoryBreakdown: CategoryBreakdown
     aiComment: str
 
+class ScheduleJobResponse(BaseModel):
+    jobId: str
+    status: str  # queued / running / done / failed
+    queueDepth: Optional[int] = None
+    result: Optional[ScheduleResponse] = None
+    error: Optional[str] = None
+
 #예산요청 스키마
 class SchedulePlace(BaseModel):
     time: str
@@ -0,0 +1,15 @@
+import sys
+import os
+
+# 루트 경로 추가 (프로젝트 최상위)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from database import engine
+from migrations import upgrade
+
+
+if __name__ == "__main__":
+    # 지역 키 마이그레이션: 배포 시 웹/워커 시작 전에 1회, 이후 Node 수집 직후 실행 (--all: 전체 재계산)
+    with engine.begin() as conn:
+        for table, (targets, updated) in upgrade(conn, refill_all="--all" in sys.argv).items():
+            print(f"{table}: {targets}건 중 {updated}건 지역 키 갱신")
@@ -0,0 +1,138 @@
+import sys
+import os
+import json
+import argparse
+import asyncio
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+# 루트 경로 추가 (프로젝트 최상위)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text
+
+from crud import parse_list_field
+from database import AsyncSessionLocal, dispose_engines
+from services import http_client, geo_index, llm_gateway, itinerary_templates, prompt_compact
+from services.gpt_service import EMOTION_TO_STYLE, SCHEDULE_MODEL, get_styles_by_emotions, generate_schedule
+
+logger = logging.getLogger(__name__)
+
+
+def parse_emotions(value):
+    try:
+        return json.loads(value) if value else []
+    except (TypeError, ValueError):
+        return parse_list_field(value)
+
+
+async def popular_requests(top_cities: int, top_profiles: int):
+    """
+    최근 일정 요청에서 많이 나온 도시 / 감정 조합
+    도시는 템플릿 키(city_id) 기준으로 묶되, 생성 입력으로는 실제 요청에 쓰인 end_city를 하나 골라 반환
+    (city_id "서울-마포구"는 parse_city_query로 다시 읽히지 않음)
+    감정 조합은 스타일 프로필 기준으로 묶고, 감정 하나짜리 프로필은 요청이 없어도 항상 포함
+    """
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(text("""
+            SELECT end_city, emotions, COUNT(*) AS count
+            FROM schedules
+            GROUP BY end_city, emotions
+        """))).fetchall()
+
+    cities = Counter()
+    city_inputs = {}
+    profiles = Counter()
+    profile_emotions = {}
+    for end_city, emotions, count in rows:
+        city = itinerary_templates.city_id(end_city or "")
+        if city:
+            cities[city] += count
+            city_inputs.setdefault(city, end_city)
+        emotions = sorted(parse_emotions(emotions))
+        profile = itinerary_templates.style_profile(get_styles_by_emotions(emotions))
+        profiles[profile] += count
+        profile_emotions.setdefault(profile, emotions)
+
+    selected = {
+        itinerary_templates.style_profile(get_styles_by_emotions([emotion])): [emotion]
+        for emotion in EMOTION_TO_STYLE
+    }
+    for profile, _ in profiles.most_common(top_profiles):
+        selected.setdefault(profile, profile_emotions[profile])
+    return [city_inputs[city] for city, _ in cities.most_common(top_cities)], list(selected.values())
+
+
+async def build_one(city: str, emotions: list, days: int, semaphore: asyncio.Semaphore,
+                    stats: Counter, dry_run: bool):
+    async with semaphore:
+        start = date.today()
+        try:
+            # 동행자/인원과 무관한 공용 일정 (aiEmpathy는 요청 시점에 따로 생성)
+            async with AsyncSessionLocal() as db:
+                cleaned = await generate_schedule(
+                    db, city, start.isoformat(), (start + timedelta(days=days - 1)).isoformat(),
+                    emotions, [], 1,
+                )
+        except Exception:
+            logger.exception("템플릿 생성 실패: %s %s %d일", city, emotions, days)
+            stats["failed"] += 1
+            return
+
+        if not itinerary_templates.is_complete(cleaned["plans"], days):
+            logger.warning("템플릿 검증 실패(일자/장소 부족): %s %s %d일", city, emotions, days)
+            stats["invalid"] += 1
+            return
+
+        if not dry_run:
+            await itinerary_templates.store_template(city, get_styles_by_emotions(emotions), days, {
+                "tags": cleaned.get("tags") or [],
+                "plans": cleaned["plans"],
+                "emotions": emotions,
+                "generatedAt": datetime.utcnow().isoformat(),
+            })
+        stats["stored"] += 1
+
+
+async def main(args):
+    await prompt_compact.load_encodings([SCHEDULE_MODEL])
+    await http_client.start()
+    await geo_index.start()
+    try:
+        cities, profiles = await popular_requests(args.top_cities, args.top_profiles)
+        if args.cities:
+            cities = [c.strip() for c in args.cities.split(",") if c.strip()]
+        if not cities:
+            print("대상 도시가 없습니다. --cities 로 지정하세요.")
+            return
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+        stats = Counter()
+        await asyncio.gather(*(
+            build_one(city, emotions, days, semaphore, stats, args.dry_run)
+            for city in cities
+            for emotions in profiles
+            for days in range(1, min(args.max_days, itinerary_templates.MAX_TEMPLATE_DAYS) + 1)
+        ))
+        print(f"도시 {len(cities)}곳 × 프로필 {len(profiles)}개 × 1~{args.max_days}일: "
+              f"저장 {stats['stored']}, 검증 실패 {stats['invalid']}, 생성 실패 {stats['failed']}")
+    finally:
+        await geo_index.stop()
+        await http_client.close()
+        await llm_gateway.close()
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="도시 × 스타일 프로필 × 일수별 일정 템플릿 사전 생성 (매일 실행)")
+    parser.add_argument("--cities", help="쉼표 구분 도시 (기본: 요청이 많은 도시)")
+    parser.add_argument("--top-cities", type=int, default=10)
+    parser.add_argument("--top-profiles", type=int, default=20, help="감정 하나짜리 프로필 외에 추가할 인기 조합 수")
+    parser.add_argument("--max-days", type=int, default=itinerary_templates.MAX_TEMPLATE_DAYS)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--dry-run", action="store_true", help="생성/검증만 하고 저장하지 않음")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args))
@@ -0,0 +1,44 @@
+import sys
+import os
+import argparse
+import asyncio
+import logging
+
+# 루트 경로 추가 (프로젝트 최상위)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import settings
+from database import dispose_engines
+from services import http_client, analytics_writer, geo_index, llm_gateway, schedule_jobs, prompt_compact
+from services.gpt_service import SCHEDULE_MODEL
+
+
+async def main(workers: int):
+    """
+    웹 프로세스와 별개로 일정 생성 작업만 처리하는 워커
+    웹은 SCHEDULE_JOB_WORKERS=0 으로 두고 이 스크립트 수/워커 수로 처리량을 조절
+    """
+    await prompt_compact.load_encodings([SCHEDULE_MODEL])
+    await http_client.start()
+    await analytics_writer.start()
+    await geo_index.start()
+    try:
+        await schedule_jobs.run_forever(workers)
+    finally:
+        await geo_index.stop()
+        await analytics_writer.stop()
+        await http_client.close()
+        await llm_gateway.close()
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI 일정 생성 작업 워커")
+    parser.add_argument("--workers", type=int, default=max(settings.SCHEDULE_JOB_WORKERS, 1))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(main(args.workers))
+    except KeyboardInterrupt:
+        pass
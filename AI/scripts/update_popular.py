@@ -5,13 +5,13 @@ import json
 # 루트 경로 추가 (프로젝트 최상위)
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from services.popular_service import update_popular_destinations
+from services.popular_service import update_popular_places, LEGACY_KEY
 from config import redis_client
 
 if __name__ == "__main__":
-    update_popular_destinations()
+    update_popular_places()
 
-    cached_data = redis_client.get("popular_destinations")
+    cached_data = redis_client.get(LEGACY_KEY)
     if cached_data:
         if isinstance(cached_data, bytes):
             cached_data = cached_data.decode("utf-8")
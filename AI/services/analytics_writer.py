@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+from sqlalchemy import table, column, insert
+
+from config import settings
+from database import AsyncSessionLocal
+from services import popularity
+
+logger = logging.getLogger(__name__)
+
+# 인기 장소 집계용 분석 테이블 (ORM 모델 없이 INSERT 대상만 정의)
+ai_schedule_places = table(
+    "ai_schedule_places",
+    column("schedule_id"),
+    column("place_id"),
+    column("place_type"),
+)
+
+_queue: Optional[asyncio.Queue] = None
+_task: Optional[asyncio.Task] = None
+
+# 종료 신호: 취소 대신 큐에 넣어, 저장 중인 배치를 마친 뒤 작업이 스스로 끝나도록 함
+_STOP = object()
+
+writer_stats = {"enqueued": 0, "dropped": 0, "written": 0, "failed": 0, "batches": 0}
+
+
+def _get_queue() -> asyncio.Queue:
+    global _queue
+    if _queue is None:
+        _queue = asyncio.Queue(maxsize=settings.ANALYTICS_QUEUE_SIZE)
+    return _queue
+
+
+def enqueue(rows: List[dict]):
+    """요청 경로에서는 큐에 넣기만 하고 바로 반환 (큐가 가득 차면 버림)"""
+    queue = _get_queue()
+    for row in rows:
+        try:
+            queue.put_nowait(row)
+            writer_stats["enqueued"] += 1
+        except asyncio.QueueFull:
+            writer_stats["dropped"] += 1
+    if writer_stats["dropped"] and writer_stats["dropped"] % 1000 == 1:
+        logger.warning("ai_schedule_places 쓰기 큐 포화, 누적 %d건 버림", writer_stats["dropped"])
+
+
+async def _write_batch(rows: List[dict]):
+    # 실시간 인기 카운터 (Redis) 는 DB 저장과 별개로 갱신
+    await popularity.record(rows)
+    try:
+        async with AsyncSessionLocal() as db:
+            # 단일 multi-row INSERT ... VALUES (...), (...)
+            await db.execute(insert(ai_schedule_places).values([
+                {"schedule_id": row["schedule_id"], "place_id": row["place_id"], "place_type": row["place_type"]}
+                for row in rows
+            ]))
+            await db.commit()
+        writer_stats["written"] += len(rows)
+        writer_stats["batches"] += 1
+    except Exception:
+        # 분석용 데이터이므로 DB 장애 시 해당 배치만 버리고 계속 진행
+        writer_stats["failed"] += len(rows)
+        logger.exception("ai_schedule_places 배치 저장 실패 (%d건)", len(rows))
+
+
+async def _drain(queue: asyncio.Queue, batch: List[dict]) -> bool:
+    """배치 크기 또는 flush 주기에 도달할 때까지 batch에 행을 모음 (종료 신호를 받으면 True)"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.ANALYTICS_FLUSH_INTERVAL
+    while len(batch) < settings.ANALYTICS_BATCH_SIZE:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            row = await asyncio.wait_for(queue.get(), timeout=remaining)
+        except asyncio.TimeoutError:
+            break
+        if row is _STOP:
+            return True
+        batch.append(row)
+    return False
+
+
+async def _run():
+    queue = _get_queue()
+    stopping = False
+    while not stopping:
+        row = await queue.get()
+        if row is _STOP:
+            break
+        batch = [row]
+        stopping = await _drain(queue, batch)
+        await _write_batch(batch)
+
+
+async def flush():
+    """큐에 남은 행을 즉시 저장 (종료 시 사용)"""
+    queue = _get_queue()
+    batch = []
+    while not queue.empty():
+        batch.append(queue.get_nowait())
+        if len(batch) >= settings.ANALYTICS_BATCH_SIZE:
+            await _write_batch(batch)
+            batch = []
+    if batch:
+        await _write_batch(batch)
+
+
+async def start():
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_run())
+
+
+async def stop():
+    """모으던 배치까지 저장하고 작업 종료 후, 신호 뒤에 들어온 행도 저장"""
+    global _task
+    if _task is not None:
+        await _get_queue().put(_STOP)
+        await _task
+        _task = None
+    await flush()
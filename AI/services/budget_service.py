@@ -1,15 +1,13 @@
-import math
 import json
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
-from sqlalchemy.orm import Session
-from openai import OpenAI
-import requests
+from sqlalchemy import select, union_all, literal, null, cast, Integer
+from sqlalchemy.ext.asyncio import AsyncSession
 import sys
-from functools import lru_cache
-import aiohttp
 import asyncio
+import logging
+import numpy as np
 
 import os
 
@@ -20,10 +18,12 @@ if BASE_DIR not in sys.path:
     sys.path.append(BASE_DIR)
 
 import models
-from config import settings
+from config import settings, async_redis_client
 from schemas import BudgetRequest
+from services import llm_gateway, llm_cache, fare_cache, http_client
+from services.geo_index import haversine_km
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+logger = logging.getLogger(__name__)
 
 # pricelevel → 식사비 매핑 (평균 1인당)
 price_map = {
@@ -34,46 +34,68 @@ price_map = {
     4: 40000
 }
 
-def get_place_price_info(db: Session, place_id: str) -> Dict:
+UNKNOWN_PLACE_INFO = {
+    "type": "unknown",
+    "pricelevel": None,
+    "price": None
+}
+
+# 같은 place_id가 여러 테이블에 있으면 기존 조회 순서(식사 → 숙박 → 관광지)를 우선
+PLACE_TYPE_PRIORITY = {"meal": 0, "accommodation": 1, "destination": 2}
+
+
+def collect_place_ids(plan_data) -> List[str]:
+    return list({item.placeId for day_plan in plan_data.plans for item in day_plan.schedule if item.placeId})
+
+
+async def resolve_place_infos(db: AsyncSession, place_ids: List[str]) -> Dict[str, Dict]:
     """
-    place_id 기준으로 Meals, Accommodations, Destinations 테이블에서 pricelevel이나 price 조회
+    여러 place_id의 pricelevel/price를 Meals, Accommodations, Destinations에서 한 번의 UNION 쿼리로 조회
+    반환: {place_id: {"type", "pricelevel", "price"}}
     """
-    # Meals 조회 (식사)
-    meal = db.query(models.Meal).filter(models.Meal.place_id == place_id).first()
-    if meal:
-        return {
-            "type": "meal",
-            "pricelevel": meal.price_level,  # 주의: price_level 컬럼명
-            "price": None
-        }
+    if not place_ids:
+        return {}
+
+    query = union_all(
+        select(
+            models.Meal.place_id,
+            literal("meal").label("type"),
+            models.Meal.price_level.label("pricelevel"),  # 주의: price_level 컬럼명
+            cast(null(), Integer).label("price"),
+        ).where(models.Meal.place_id.in_(place_ids)),
+        select(
+            models.Accommodation.place_id,
+            literal("accommodation").label("type"),
+            cast(null(), Integer).label("pricelevel"),
+            models.Accommodation.price.label("price"),
+        ).where(models.Accommodation.place_id.in_(place_ids)),
+        select(
+            models.Destination.place_id,
+            literal("destination").label("type"),
+            models.Destination.price_level.label("pricelevel"),
+            cast(null(), Integer).label("price"),
+        ).where(models.Destination.place_id.in_(place_ids)),
+    )
+    rows = (await db.execute(query)).fetchall()
 
-    # Accommodations 조회 (숙박)
-    accommodation = db.query(models.Accommodation).filter(models.Accommodation.place_id == place_id).first()
-    if accommodation:
-        return {
-            "type": "accommodation",
-            "pricelevel": None,
-            "price": accommodation.price
+    place_infos = {}
+    for row in rows:
+        current = place_infos.get(row.place_id)
+        if current and PLACE_TYPE_PRIORITY[current["type"]] <= PLACE_TYPE_PRIORITY[row.type]:
+            continue
+        place_infos[row.place_id] = {
+            "type": row.type,
+            "pricelevel": row.pricelevel,
+            "price": row.price
         }
+    return place_infos
 
-    # Destinations 조회 (관광지)
-    destination = db.query(models.Destination).filter(models.Destination.place_id == place_id).first()
-    if destination:
-        return {
-            "type": "destination",
-            "pricelevel": destination.price_level,
-            "price": None
-        }
 
-    # 못 찾았을 때
-    return {
-        "type": "unknown",
-        "pricelevel": None,
-        "price": None
-    }
+def get_place_price_info(place_infos: Dict[str, Dict], place_id: str) -> Dict:
+    return place_infos.get(place_id, UNKNOWN_PLACE_INFO)
 
 
-def calculate_accommodation_cost(db: Session, plan_data, num_people: int = 1) -> int:
+def calculate_accommodation_cost(place_infos: Dict[str, Dict], plan_data, num_people: int = 1) -> int:
     total_cost = 0
 
     # 마지막 날 제외하고 숙소 계산
@@ -84,7 +106,7 @@ def calculate_accommodation_cost(db: Session, plan_data, num_people: int = 1) ->
 
         last_place = schedule[-1]
         place_id  = last_place.placeId
-        place_info = get_place_price_info(db, place_id)
+        place_info = get_place_price_info(place_infos, place_id)
 
         if place_info["type"] == "accommodation" and place_info["price"] is not None:
             price = place_info["price"]
@@ -100,47 +122,21 @@ def calculate_accommodation_cost(db: Session, plan_data, num_people: int = 1) ->
     return total_cost
 
 
-# 거리 계산 (haversine)
-def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    R = 6371
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-# 교통요금 계산 로직
-async def calculate_fare_between(loc1, loc2, num_people):
-    lat1, lon1 = getattr(loc1, "latitude", None), getattr(loc1, "longitude", None)
-    lat2, lon2 = getattr(loc2, "latitude", None), getattr(loc2, "longitude", None)
-    if None in (lat1, lon1, lat2, lon2):
-        return 0
-
-    dist = haversine(lat1, lon1, lat2, lon2)
-    if dist < 2.0:
-        return 0
-
-    fare = await async_get_public_transport_fare(lat1, lon1, lat2, lon2)
-    if fare == 0:
-        if dist < 5:
-            fare = 1450
-        elif dist < 15:
-            fare = 1850
-        else:
-            fare = 2250
+# 이동 구간 분류 기준 (km)
+WALK_MAX_KM = 2.0
 
-    return fare * num_people
+# ODSAY 요금을 못 받았을 때/가까운 구간의 거리별 추정 요금
+def estimate_fare(dist: float) -> int:
+    if dist < 5:
+        return 1450
+    elif dist < 15:
+        return 1850
+    return 2250
 
 
 # ODSAY API 호출 (실패시 0 반환)
-odsay_cache = {}
-
-async def async_get_public_transport_fare(lat1, lon1, lat2, lon2):
-    key = f"{lat1:.5f}-{lon1:.5f}-{lat2:.5f}-{lon2:.5f}"
-    if key in odsay_cache:
-        return odsay_cache[key]
-
-    url = "https://api.odsay.com/v1/api/searchPubTransPathT"
+async def request_public_transport_fare(lat1, lon1, lat2, lon2) -> int:
+    url = f"{settings.ODSAY_BASE_URL}/searchPubTransPathT"
     params = {
         "apiKey": settings.ODSAY_API_KEY,
         "SX": lon1,
@@ -150,55 +146,97 @@ async def async_get_public_transport_fare(lat1, lon1, lat2, lon2):
         "OPT": 0
     }
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as resp:
-                data = await resp.json()
-                fare = data["result"]["path"][0]["info"].get("payment", 0)
-                odsay_cache[key] = fare
-                return fare
-    except:
+        data = await http_client.get_json("odsay", url, params)
+        return data["result"]["path"][0]["info"].get("payment", 0)
+    except Exception:
         return 0
 
 
-# 교통비 전체 계산
-async def calculate_transport_cost(plan_data, num_people: int = 1) -> int:
-    tasks = []
+def extract_legs(plan_data) -> np.ndarray:
+    """
+    일정의 모든 이동 구간 좌표를 (N, 4) 배열 [lat1, lon1, lat2, lon2]로 추출
+    (전날 마지막 장소 → 오늘 첫 장소 포함, 좌표가 없으면 NaN)
+    """
+    def coords(loc):
+        lat, lon = getattr(loc, "latitude", None), getattr(loc, "longitude", None)
+        return (np.nan, np.nan) if lat is None or lon is None else (lat, lon)
 
+    legs = []
     for i, day_plan in enumerate(plan_data.plans):
         schedule = day_plan.schedule
         if not schedule:
             continue
-
-        # 하루 시작 이동 (전날 → 오늘 첫 장소)
         if i > 0:
             prev_schedule = plan_data.plans[i - 1].schedule
             if prev_schedule:
-                tasks.append(calculate_fare_between(prev_schedule[-1], schedule[0], num_people))
-
-        # 당일 내 이동
+                legs.append(coords(prev_schedule[-1]) + coords(schedule[0]))
         for j in range(len(schedule) - 1):
-            loc1, loc2 = schedule[j], schedule[j + 1]
-            tasks.append(calculate_fare_between(loc1, loc2, num_people))
+            legs.append(coords(schedule[j]) + coords(schedule[j + 1]))
+    return np.asarray(legs, dtype=np.float64).reshape(-1, 4)
+
+
+async def fetch_fares(legs: np.ndarray) -> Dict[str, int]:
+    """
+    API가 필요한 구간들의 요금을 격자 키 기준으로 중복 제거 후 한 번에 조회
+    캐시(L1 → Redis MGET)에 없는 키만 ODSAY로 동시에 요청
+    """
+    unique = {}
+    for lat1, lon1, lat2, lon2 in legs.tolist():
+        unique.setdefault(fare_cache.fare_key(lat1, lon1, lat2, lon2), (lat1, lon1, lat2, lon2))
+
+    fares = await fare_cache.get_fares(list(unique))
+    missing = [key for key in unique if key not in fares]
+    results = await asyncio.gather(*[request_public_transport_fare(*unique[key]) for key in missing])
+    fetched = dict(zip(missing, results))
+    fares.update(fetched)
+    # 0원(조회 실패)은 캐시하지 않음
+    await fare_cache.set_fares({key: fare for key, fare in fetched.items() if fare})
+    return fares
+
+
+# 교통비 전체 계산
+async def calculate_transport_cost(plan_data, num_people: int = 1) -> int:
+    legs = extract_legs(plan_data)
+    if not len(legs):
+        return 0
+
+    # 모든 구간 거리를 한 번에 계산 (좌표 없는 구간은 NaN → 도보 취급)
+    dists = haversine_km(legs[:, 0], legs[:, 1], legs[:, 2], legs[:, 3])
+    dists = np.nan_to_num(dists, nan=0.0)
+
+    # 도보 / 추정 / API 조회 구간으로 미리 분류
+    walk = dists < WALK_MAX_KM
+    estimate = ~walk & (dists < settings.FARE_ESTIMATE_MAX_KM)
+    needs_api = ~walk & ~estimate
+
+    total = sum(estimate_fare(d) for d in dists[estimate])
 
-    fares = await asyncio.gather(*tasks)
-    return sum(fares)
+    api_legs = legs[needs_api]
+    if len(api_legs):
+        fares = await fetch_fares(api_legs)
+        for leg, dist in zip(api_legs.tolist(), dists[needs_api]):
+            fare = fares.get(fare_cache.fare_key(*leg), 0)
+            total += fare or estimate_fare(dist)
+
+    return int(total) * num_people
 
 
 
 # 식사비 계산
-def calculate_food_cost(db: Session, plan_data, num_people: int = 1) -> int:
+def calculate_food_cost(place_infos: Dict[str, Dict], plan_data, num_people: int = 1) -> int:
     total_cost = 0
     for day_plan in plan_data.plans:
         for item in day_plan.schedule:
             place_id = item.placeId
-            place_info = get_place_price_info(db, place_id)
+            place_info = get_place_price_info(place_infos, place_id)
             if place_info["type"] == "meal":
                 pricelevel = place_info["pricelevel"]
                 avg_price = price_map.get(pricelevel, 0)
                 total_cost += avg_price * num_people
     return total_cost
 
-async def async_ask_gpt_for_entry_fee(place_name: str) -> int:
+async def async_ask_gpt_for_entry_fee(place_name: str) -> Optional[int]:
+    """GPT로 1인 입장료 추정 (실패 시 None, 캐시에 저장하지 않음)"""
     short_name = place_name[:50]
     prompt = (
         f"'{short_name}'은 한국의 관광지 또는 체험형 시설입니다. "
@@ -209,35 +247,85 @@ async def async_ask_gpt_for_entry_fee(place_name: str) -> int:
         f"반드시 숫자만 단위 없이 정수 형태로 응답해줘. "
         f"예: 15000"
     )
-    headers = {
-        "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    json_data = {
-        "model": "gpt-4o-mini",
-        "messages": [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": prompt}
-        ],
-        "max_tokens": 10,
-        "temperature": 0.3
-    }
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post("https://api.openai.com/v1/chat/completions", headers=headers, json=json_data) as resp:
-                result = await resp.json()
-                content = result["choices"][0]["message"]["content"]
-                return int(re.search(r'\d+', content).group()) if content else 0
+        content = await llm_gateway.chat_text(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=10,
+            temperature=0.3
+        )
+        return int(re.search(r'\d+', content).group()) if content else 0
     except Exception as e:
         print(f"[GPT 오류] {place_name}: {e}")
-        return 0
+        return None
+
+
+# 입장료 캐시: Redis 해시(place_id → 1인 입장료)에 영구 저장
+ENTRY_FEE_HASH = "entry_fees"
+
+# 같은 place_id에 대한 진행 중인 GPT 호출 (동시 요청이 하나의 호출을 공유)
+_entry_fee_inflight: Dict[str, asyncio.Task] = {}
 
-async def estimate_entry_fees(db: Session, plan_data, num_people: int = 1) -> int:
+entry_fee_stats = {"hit": 0, "miss": 0, "coalesced": 0}
+
+
+async def _fetch_and_store_entry_fee(place_id: str, place_name: str) -> Optional[int]:
+    fee = await async_ask_gpt_for_entry_fee(place_name)
+    if fee is not None:
+        try:
+            await async_redis_client.hset(ENTRY_FEE_HASH, place_id, fee)
+        except Exception as e:
+            logger.warning("입장료 캐시 저장 실패 (%s): %s", place_id, e, exc_info=True)
+    return fee
+
+
+async def get_entry_fees(places: Dict[str, str]) -> Dict[str, int]:
+    """
+    {place_id: place_name} → {place_id: 1인 입장료}
+    Redis에서 한 번에 조회하고, 없는 장소만 GPT로 추정 (장소당 진행 중 호출은 1개)
+    """
+    if not places:
+        return {}
+    place_ids = list(places.keys())
+    try:
+        cached = await async_redis_client.hmget(ENTRY_FEE_HASH, place_ids)
+    except Exception as e:
+        logger.warning("입장료 캐시 조회 실패: %s", e, exc_info=True)
+        cached = [None] * len(place_ids)
+
+    fees = {}
+    pending = {}
+    for place_id, value in zip(place_ids, cached):
+        if value is not None:
+            entry_fee_stats["hit"] += 1
+            fees[place_id] = int(value)
+            continue
+        task = _entry_fee_inflight.get(place_id)
+        if task is None:
+            entry_fee_stats["miss"] += 1
+            task = asyncio.create_task(_fetch_and_store_entry_fee(place_id, places[place_id]))
+            _entry_fee_inflight[place_id] = task
+            task.add_done_callback(lambda _, pid=place_id: _entry_fee_inflight.pop(pid, None))
+        else:
+            entry_fee_stats["coalesced"] += 1
+        pending[place_id] = task
+
+    if pending:
+        # shield: 한 요청이 취소돼도 공유 중인 호출은 계속 진행
+        results = await asyncio.gather(*(asyncio.shield(t) for t in pending.values()))
+        for place_id, fee in zip(pending.keys(), results):
+            fees[place_id] = fee or 0
+    return fees
+
+
+async def estimate_entry_fees(place_infos: Dict[str, Dict], plan_data, num_people: int = 1) -> int:
     total_fee = 0
     visited_place_ids = set()
-    tasks = []
-    people_counts = []
-    
+    unknown_fee_places = {}
+
     for day_plan in plan_data.plans:
         schedule = day_plan.schedule
         for item in schedule[:-1]:  # 마지막은 숙소일 가능성 높으므로 제외
@@ -248,27 +336,25 @@ async def estimate_entry_fees(db: Session, plan_data, num_people: int = 1) -> in
                 continue
             visited_place_ids.add(place_id)
 
-            place_info = get_place_price_info(db, place_id)
+            place_info = get_place_price_info(place_infos, place_id)
 
             if place_info["type"] == "destination":
                 pricelevel = place_info["pricelevel"]
                 if pricelevel is None and place_name:
-                    tasks.append(async_ask_gpt_for_entry_fee(place_name))
-                    people_counts.append(num_people)
+                    unknown_fee_places[place_id] = place_name
                 elif pricelevel and pricelevel > 0:
                     avg_price = price_map.get(pricelevel, 0)
                     total_fee += avg_price * num_people
 
-    if tasks:
-        results = await asyncio.gather(*tasks)
-        for fee, count in zip(results, people_counts):
-            total_fee += fee * count
+    if unknown_fee_places:
+        fees = await get_entry_fees(unknown_fee_places)
+        total_fee += sum(fees.values()) * num_people
 
     return total_fee
 
 
 # GPT 예산 감성 코멘트
-def ask_gpt_budget_comment(user_budget: int, end_city: str, days: int = 2, num_people: int = 1) -> str:
+async def ask_gpt_budget_comment(user_budget: int, end_city: str, days: int = 2, num_people: int = 1) -> str:
     prompt = f"""
 {end_city} 지역을 {days}일 동안 {num_people}명이 여행하는 일정이에요.
 추천된 여행 코스를 기준으로 예상 여행 비용은 총 {user_budget}원이에요.
@@ -283,7 +369,8 @@ def ask_gpt_budget_comment(user_budget: int, end_city: str, days: int = 2, num_p
 - 비용 느낌뿐 아니라, '왜 그렇게 느껴질 수 있는지'를 센스 있게 살짝 덧붙여줘.
 """
     try:
-        response = client.chat.completions.create(
+        return await llm_cache.cached_chat_text(
+            "budget_comment",
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "너는 센스 있는 감성 여행 가이드야. 감성적인 코멘트를 친구에게 말하듯 써줘."},
@@ -292,29 +379,31 @@ def ask_gpt_budget_comment(user_budget: int, end_city: str, days: int = 2, num_p
             max_tokens=500,
             temperature=0.7
         )
-        return response.choices[0].message.content.strip()
     except Exception as e:
         print("GPT 예산 코멘트 생성 실패:", e)
         return "예산 분석에 실패했어요. 다음에 다시 시도해 주세요."
 
 # 전체 예산 계산
-async def calculate_total_budget_from_plan(db: Session, plan_data: BudgetRequest) -> Dict:
+async def calculate_total_budget_from_plan(db: AsyncSession, plan_data: BudgetRequest) -> Dict:
     num_people = plan_data.peopleCount
 
-    # 동기 함수 그대로 호출
-    food_cost = calculate_food_cost(db, plan_data, num_people)
-    transport_cost = await calculate_transport_cost(plan_data, num_people)
-    accommodation_cost = calculate_accommodation_cost(db, plan_data, num_people)
+    # 일정의 모든 장소 정보를 한 번에 조회해 세 비용 계산이 공유
+    place_infos = await resolve_place_infos(db, collect_place_ids(plan_data))
 
-    # 비동기 함수 호출
-    entry_fees = await estimate_entry_fees(db, plan_data, num_people)
+    food_cost = calculate_food_cost(place_infos, plan_data, num_people)
+    accommodation_cost = calculate_accommodation_cost(place_infos, plan_data, num_people)
+
+    # DB를 더 쓰지 않으므로 외부 호출(ODSAY, GPT)은 동시에 진행
+    transport_cost, entry_fees = await asyncio.gather(
+        calculate_transport_cost(plan_data, num_people),
+        estimate_entry_fees(place_infos, plan_data, num_people),
+    )
 
     total_cost = food_cost + entry_fees + transport_cost + accommodation_cost
 
     end_city = getattr(plan_data, "endCity", "여행지")
 
-    # 감성 코멘트는 여전히 동기로 처리
-    budget_comment = ask_gpt_budget_comment(
+    budget_comment = await ask_gpt_budget_comment(
         user_budget=total_cost,
         end_city=end_city,
         days=len(plan_data.plans),
@@ -0,0 +1,101 @@
+import re
+from typing import Dict, Optional, Tuple
+
+# 광역 시/도 정규화 키 → 별칭 (주소 표기, 사용자 입력, 영문 표기)
+CITY_ALIASES = {
+    "서울": ["서울", "서울시", "서울특별시", "seoul"],
+    "부산": ["부산", "부산시", "부산광역시", "busan"],
+    "대구": ["대구", "대구시", "대구광역시", "daegu"],
+    "인천": ["인천", "인천시", "인천광역시", "incheon"],
+    "광주": ["광주", "광주시", "광주광역시", "gwangju"],
+    "대전": ["대전", "대전시", "대전광역시", "daejeon"],
+    "울산": ["울산", "울산시", "울산광역시", "ulsan"],
+    "세종": ["세종", "세종시", "세종특별자치시", "sejong"],
+    "경기": ["경기", "경기도", "gyeonggi", "gyeonggi-do"],
+    "강원": ["강원", "강원도", "강원특별자치도", "gangwon", "gangwon-do"],
+    "충북": ["충북", "충청북도", "chungcheongbuk-do"],
+    "충남": ["충남", "충청남도", "chungcheongnam-do"],
+    "전북": ["전북", "전라북도", "전북특별자치도", "jeollabuk-do"],
+    "전남": ["전남", "전라남도", "jeollanam-do"],
+    "경북": ["경북", "경상북도", "gyeongsangbuk-do"],
+    "경남": ["경남", "경상남도", "gyeongsangnam-do"],
+    "제주": ["제주", "제주도", "제주특별자치도", "jeju", "jeju-do"],
+}
+
+# 접미사(구/군) 없이 입력되는 경우가 많은 자치구 (현재 수집 데이터 기준: 서울)
+KNOWN_DISTRICTS = {
+    "강남구", "강동구", "강북구", "강서구", "관악구", "광진구", "구로구", "금천구", "노원구",
+    "도봉구", "동대문구", "동작구", "마포구", "서대문구", "서초구", "성동구", "성북구", "송파구",
+    "양천구", "영등포구", "용산구", "은평구", "종로구", "중구", "중랑구",
+}
+
+_CITY_LOOKUP = {alias: key for key, aliases in CITY_ALIASES.items() for alias in aliases}
+_DISTRICT_LOOKUP = {name[:-1]: name for name in KNOWN_DISTRICTS if len(name) > 2}
+_REGION_SUFFIX = re.compile(r"^[가-힣]{1,5}(구|군|시)$")
+_TOKEN_SPLIT = re.compile(r"[\s,]+")
+_SKIP_TOKENS = {"대한민국", "south", "korea", "republic", "of"}
+
+
+def normalize_city(token: str) -> Optional[str]:
+    return _CITY_LOOKUP.get((token or "").strip().lower())
+
+
+def normalize_region(token: str) -> Optional[str]:
+    token = (token or "").strip()
+    if not token or normalize_city(token):
+        return None
+    if token in _DISTRICT_LOOKUP:
+        return _DISTRICT_LOOKUP[token]
+    if _REGION_SUFFIX.match(token):
+        return token
+    return None
+
+
+def parse_region_keys(*texts: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    주소/지역 문자열에서 (city_key, region_key) 추출
+    예: "대한민국 서울특별시 송파구 올림픽로 300" → ("서울", "송파구")
+    앞 인자(area 등)를 우선 사용하고, 비어 있는 키만 뒤 인자(location)로 채움
+    """
+    city_key, region_key = None, None
+    for text in texts:
+        if not text:
+            continue
+        for token in _TOKEN_SPLIT.split(text):
+            if not token or token.lower() in _SKIP_TOKENS or token.isdigit():
+                continue
+            if city_key is None and normalize_city(token):
+                city_key = normalize_city(token)
+                continue
+            if region_key is None:
+                region = normalize_region(token)
+                if region:
+                    region_key = region
+                    break
+        if city_key and region_key:
+            break
+    return city_key, region_key
+
+
+def parse_city_query(*texts: Optional[str]) -> Dict[str, str]:
+    """
+    사용자 입력(도시/지역)을 인덱스 조회 조건으로 변환
+    입력 중 하나라도 인식하지 못하면 빈 dict (호출부에서 ILIKE 검색으로 대체)
+    """
+    keys = {}
+    for text in texts:
+        if not text or not text.strip():
+            continue
+        city_key, region_key = parse_region_keys(text)
+        if not city_key and not region_key:
+            return {}
+        if city_key:
+            keys.setdefault("city_key", city_key)
+        if region_key:
+            keys.setdefault("region_key", region_key)
+    return keys
+
+
+def region_filter_sql(keys: Dict[str, str]) -> str:
+    """parse_city_query 결과 → 인덱스를 타는 WHERE 조건"""
+    return " AND ".join(f"{column} = :{column}" for column in keys)
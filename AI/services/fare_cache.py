@@ -0,0 +1,72 @@
+import logging
+from typing import Dict, List, Tuple
+
+from config import settings, async_redis_client
+from services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "odsay_fare:"
+
+# L1: 워커 내 LRU/TTL, L2: 워커 간 공유 Redis
+_l1 = TTLCache(maxsize=settings.FARE_CACHE_L1_SIZE, ttl=settings.FARE_CACHE_L1_TTL)
+
+fare_cache_stats = {"l1_hit": 0, "l2_hit": 0, "miss": 0}
+
+
+def snap(lat: float, lon: float, cell: float = None) -> Tuple[int, int]:
+    """좌표를 격자 셀 인덱스로 변환 (인접 좌표는 같은 셀)"""
+    cell = cell or settings.FARE_GRID_DEG
+    return round(lat / cell), round(lon / cell)
+
+
+def fare_key(lat1: float, lon1: float, lat2: float, lon2: float) -> str:
+    a = snap(lat1, lon1)
+    b = snap(lat2, lon2)
+    # 대중교통 요금은 방향과 무관하므로 A→B, B→A를 하나의 키로 취급
+    if settings.FARE_SYMMETRIC and b < a:
+        a, b = b, a
+    return f"{KEY_PREFIX}{settings.FARE_GRID_DEG}:{a[0]}:{a[1]}:{b[0]}:{b[1]}"
+
+
+async def get_fares(keys: List[str]) -> Dict[str, int]:
+    """여러 키를 L1 → Redis(MGET 한 번) 순으로 조회, 찾은 키만 반환"""
+    fares = {}
+    remote = []
+    for key in keys:
+        fare = _l1.get(key)
+        if fare is not None:
+            fare_cache_stats["l1_hit"] += 1
+            fares[key] = fare
+        else:
+            remote.append(key)
+    if not remote:
+        return fares
+    try:
+        cached = await async_redis_client.mget(remote)
+    except Exception as e:
+        logger.warning("요금 캐시 Redis 조회 실패: %s", e)
+        cached = [None] * len(remote)
+    for key, value in zip(remote, cached):
+        if value is None:
+            fare_cache_stats["miss"] += 1
+            continue
+        fare_cache_stats["l2_hit"] += 1
+        fares[key] = int(value)
+        _l1.set(key, fares[key])
+    return fares
+
+
+async def set_fares(fares: Dict[str, int]):
+    """여러 키를 L1과 Redis(파이프라인 한 번)에 저장"""
+    if not fares:
+        return
+    for key, fare in fares.items():
+        _l1.set(key, fare)
+    try:
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            for key, fare in fares.items():
+                pipe.set(key, fare, ex=settings.FARE_CACHE_TTL)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning("요금 캐시 Redis 저장 실패 (%d건): %s", len(fares), e)
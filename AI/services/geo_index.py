@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+import models
+from config import settings
+from database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEG_LAT = 111.32
+
+PLACE_MODELS = {
+    "destination": models.Destination,
+    "meal": models.Meal,
+    "accommodation": models.Accommodation,
+}
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """한 점과 여러 점 사이의 거리(km)를 한 번에 계산"""
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class PlaceGeoIndex:
+    """
+    장소 좌표 격자 인덱스 (좌표는 numpy 배열, 격자 셀 → 배열 위치 목록)
+    k-최근접 / 반경 검색을 SQL이나 LLM 없이 메모리에서 처리
+    """
+
+    def __init__(self, cell_deg: float = 0.01):
+        self.cell_deg = cell_deg
+        self._lat = np.empty(0, dtype=np.float64)
+        self._lon = np.empty(0, dtype=np.float64)
+        self._place_ids: List[str] = []
+        self._types: List[str] = []
+        self._keys: List[Dict[str, Optional[str]]] = []
+        self._alive: List[bool] = []
+        self._positions: Dict[Tuple[str, str], int] = {}
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        # 테이블별로 읽어 온 마지막 PK (증분 갱신용)
+        self.last_ids = {place_type: 0 for place_type in PLACE_MODELS}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    def add_many(self, places: List[dict]):
+        """places: [{"place_id", "type", "latitude", "longitude", "city_key", "region_key"}]"""
+        new_lat, new_lon = [], []
+        for place in places:
+            lat, lon = place.get("latitude"), place.get("longitude")
+            if lat is None or lon is None:
+                continue
+            lat, lon = float(lat), float(lon)
+            # 같은 place_id가 여러 테이블에 있을 수 있으므로 (타입, place_id)로 구분
+            key = (place["type"], place["place_id"])
+            old = self._positions.get(key)
+            if old is not None:
+                # 좌표가 바뀐 장소는 기존 위치를 비활성화하고 새로 추가
+                self._alive[old] = False
+                self._cells[self._cell(self._lat[old], self._lon[old])].remove(old)
+            position = len(self._place_ids)
+            self._positions[key] = position
+            self._cells[self._cell(lat, lon)].append(position)
+            new_lat.append(lat)
+            new_lon.append(lon)
+            self._place_ids.append(place["place_id"])
+            self._types.append(place["type"])
+            self._keys.append({"city_key": place.get("city_key"), "region_key": place.get("region_key")})
+            self._alive.append(True)
+        if new_lat:
+            self._lat = np.concatenate([self._lat, np.asarray(new_lat)])
+            self._lon = np.concatenate([self._lon, np.asarray(new_lon)])
+
+    def _matches(self, position: int, place_type: Optional[str], keys: Optional[dict]) -> bool:
+        if not self._alive[position]:
+            return False
+        if place_type and self._types[position] != place_type:
+            return False
+        if keys:
+            place_keys = self._keys[position]
+            return all(place_keys.get(k) == v for k, v in keys.items())
+        return True
+
+    def _ring(self, center: Tuple[int, int], r: int) -> List[int]:
+        ci, cj = center
+        if r == 0:
+            return list(self._cells.get(center, ()))
+        result = []
+        for di in range(-r, r + 1):
+            for dj in (-r, r) if abs(di) != r else range(-r, r + 1):
+                result.extend(self._cells.get((ci + di, cj + dj), ()))
+        return result
+
+    def _results(self, lat: float, lon: float, positions: List[int]) -> List[dict]:
+        if not positions:
+            return []
+        idx = np.asarray(positions)
+        dists = haversine_km(lat, lon, self._lat[idx], self._lon[idx])
+        order = np.argsort(dists)
+        return [
+            {"place_id": self._place_ids[idx[i]], "type": self._types[idx[i]], "distance_km": float(dists[i])}
+            for i in order
+        ]
+
+    def nearest(self, lat: float, lon: float, k: int = 5,
+                place_type: Optional[str] = None, keys: Optional[dict] = None) -> List[dict]:
+        """가까운 순 k개 (place_type, city_key/region_key 조건으로 필터 가능)"""
+        if not self._positions:
+            return []
+        center = self._cell(lat, lon)
+        # 격자 한 칸이 보장하는 최소 반경(km)
+        cell_km = self.cell_deg * KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 0.1)
+        max_ring = int(settings.GEO_INDEX_MAX_RADIUS_KM / cell_km) + 1
+        candidates: List[int] = []
+        for r in range(0, max_ring + 1):
+            candidates.extend(p for p in self._ring(center, r) if self._matches(p, place_type, keys))
+            if len(candidates) >= k:
+                found = self._results(lat, lon, candidates)
+                # r칸까지 모두 본 상태에서 k번째 거리가 보장 반경 안이면 확정
+                if found[k - 1]["distance_km"] <= r * cell_km:
+                    return found[:k]
+        return self._results(lat, lon, candidates)[:k]
+
+    def within(self, lat: float, lon: float, radius_km: float,
+               place_type: Optional[str] = None, keys: Optional[dict] = None) -> List[dict]:
+        """반경 radius_km 안의 장소를 가까운 순으로"""
+        if not self._positions:
+            return []
+        cell_km = self.cell_deg * KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 0.1)
+        rings = int(math.ceil(radius_km / cell_km))
+        center = self._cell(lat, lon)
+        candidates = [
+            p for r in range(rings + 1) for p in self._ring(center, r)
+            if self._matches(p, place_type, keys)
+        ]
+        return [place for place in self._results(lat, lon, candidates) if place["distance_km"] <= radius_km]
+
+    def nearest_to_any(self, anchors: List[Tuple[float, float]], k: int,
+                       place_type: Optional[str] = None, keys: Optional[dict] = None) -> List[dict]:
+        """여러 기준점 중 가장 가까운 기준점까지의 거리로 정렬한 k개"""
+        best: Dict[str, dict] = {}
+        for lat, lon in anchors:
+            for place in self.nearest(lat, lon, k, place_type, keys):
+                current = best.get(place["place_id"])
+                if current is None or place["distance_km"] < current["distance_km"]:
+                    best[place["place_id"]] = place
+        return sorted(best.values(), key=lambda p: p["distance_km"])[:k]
+
+
+place_index = PlaceGeoIndex(cell_deg=settings.GEO_INDEX_CELL_DEG)
+
+_refresh_task: Optional[asyncio.Task] = None
+
+
+async def refresh(index: PlaceGeoIndex):
+    """테이블별 마지막 PK 이후에 추가된 장소만 읽어 인덱스에 반영"""
+    async with AsyncSessionLocal() as db:
+        for place_type, model in PLACE_MODELS.items():
+            rows = (await db.execute(
+                select(model.id, model.place_id, model.latitude, model.longitude,
+                       model.city_key, model.region_key)
+                .where(model.id > index.last_ids[place_type])
+                .order_by(model.id)
+            )).fetchall()
+            if not rows:
+                continue
+            index.add_many([
+                {"place_id": row.place_id, "type": place_type, "latitude": row.latitude,
+                 "longitude": row.longitude, "city_key": row.city_key, "region_key": row.region_key}
+                for row in rows
+            ])
+            index.last_ids[place_type] = rows[-1].id
+    logger.info("장소 좌표 인덱스 갱신: %d곳", len(index))
+
+
+async def rebuild():
+    """전체 재적재 후 교체 (기존 행의 좌표/지역 키 변경 반영)"""
+    global place_index
+    new_index = PlaceGeoIndex(cell_deg=settings.GEO_INDEX_CELL_DEG)
+    await refresh(new_index)
+    place_index = new_index
+
+
+async def _refresh_loop():
+    loop = asyncio.get_running_loop()
+    last_rebuild = loop.time()
+    while True:
+        await asyncio.sleep(settings.GEO_INDEX_REFRESH_SECONDS)
+        try:
+            if loop.time() - last_rebuild >= settings.GEO_INDEX_REBUILD_SECONDS:
+                await rebuild()
+                last_rebuild = loop.time()
+            else:
+                await refresh(place_index)
+        except Exception:
+            logger.exception("장소 좌표 인덱스 갱신 실패")
+
+
+async def start():
+    global _refresh_task
+    try:
+        await refresh(place_index)
+    except Exception:
+        # 인덱스가 없어도 SQL 조회로 동작하므로 기동은 계속
+        logger.exception("장소 좌표 인덱스 초기 로드 실패")
+    if _refresh_task is None:
+        _refresh_task = asyncio.create_task(_refresh_loop())
+
+
+async def stop():
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        _refresh_task = None
@@ -1,28 +1,23 @@
-import re
-import json, json5
+import time
 import uuid
+import logging
+from contextlib import aclosing
 from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 
-from fastapi import FastAPI, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
-from openai import OpenAI
+from sqlalchemy import text, select, union_all, literal
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from config import settings  # OPENAI_API_KEY, DATABASE_URL 포함
+import models
+from config import settings
+from services import llm_cache, llm_json, prompt_compact, analytics_writer, city_index, geo_index, route_planner, singleflight, itinerary_templates
+from services.json_stream import StreamingJSONParser, ANY
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+logger = logging.getLogger(__name__)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# DB 세션은 호출하는 라우터에서 database.get_db로 주입받음 (엔진은 database.py 하나만 사용)
 
 # 감정 → 추천 스타일 매핑
 EMOTION_TO_STYLE = {
@@ -42,14 +37,6 @@ def get_styles_by_emotions(emotions: List[str]) -> List[str]:
         styles += EMOTION_TO_STYLE.get(emo, [])
     return list(set(styles))
 
-class ScheduleRequest(BaseModel):
-    endCity: str
-    startDate: str
-    endDate: str
-    emotions: List[str]
-    companions: List[str]
-    peopleCount: int
-
 class SchedulePlanItem(BaseModel):
     time: Optional[str]
     place: Optional[str]
@@ -67,15 +54,6 @@ class ScheduleAIResponse(BaseModel):
     tags: Optional[List[str]]
     plans: List[ScheduleDayPlan]
 
-class ScheduleAPIResponse(BaseModel):
-    endCity: str
-    startDate: str
-    endDate: str
-    emotions: List[str]
-    companions: List[str]
-    peopleCount: int
-    aiResult: ScheduleAIResponse
-
 def calculate_trip_days(start_date: str, end_date: str) -> int:
     try:
         start = datetime.strptime(start_date, "%Y-%m-%d")
@@ -84,27 +62,50 @@ def calculate_trip_days(start_date: str, end_date: str) -> int:
     except Exception:
         return 1
 
-def fetch_places_from_db(db: Session, city: str):
-    destinations = db.execute(text("""
-        SELECT place_id, name, area, latitude, longitude 
+async def query_by_city(db: AsyncSession, sql: str, city: str, ilike_column: str):
+    """
+    sql의 {where}를 도시 조건으로 채워 실행
+    정규화 키로 인식되면 인덱스 조회, 아니면(또는 지역 키가 아직 비어 있어 결과가 없으면) 기존 ILIKE 검색
+    """
+    keys = city_index.parse_city_query(city)
+    if keys:
+        rows = (await db.execute(text(sql.format(where=city_index.region_filter_sql(keys))), keys)).fetchall()
+        if rows:
+            return rows
+    return (await db.execute(text(sql.format(where=f"{ilike_column} ILIKE :city")), {"city": f"%{city}%"})).fetchall()
+
+async def fetch_places_from_db(db: AsyncSession, city: str):
+    destinations = await query_by_city(db, """
+        SELECT place_id, name, area, latitude, longitude, city_key 
         FROM destinations 
-        WHERE area ILIKE :city 
+        WHERE {where} 
         LIMIT 6
-    """), {"city": f"%{city}%"}).fetchall()
-
-    meals = db.execute(text("""
-        SELECT place_id, name, food_type, latitude, longitude 
-        FROM meals 
-        WHERE location ILIKE :city 
-        LIMIT 6
-    """), {"city": f"%{city}%"}).fetchall()
-
-    accommodations = db.execute(text("""
-        SELECT place_id, name, location, latitude, longitude 
+    """, city, "area")
+
+    # 좌표 인덱스가 있으면 관광지와 가까운 식당 6곳을 고름 (없으면 기존 LIMIT 조회)
+    anchors = [(d.latitude, d.longitude) for d in destinations if d.latitude is not None and d.longitude is not None]
+    keys = city_index.parse_city_query(city)
+    nearby = geo_index.place_index.nearest_to_any(anchors, 6, "meal", keys) if keys and anchors else []
+    if nearby:
+        meals = (await db.execute(
+            select(models.Meal.place_id, models.Meal.name, models.Meal.food_type,
+                   models.Meal.latitude, models.Meal.longitude, models.Meal.city_key)
+            .where(models.Meal.place_id.in_([p["place_id"] for p in nearby]))
+        )).fetchall()
+    else:
+        meals = await query_by_city(db, """
+            SELECT place_id, name, food_type, latitude, longitude, city_key 
+            FROM meals 
+            WHERE {where} 
+            LIMIT 6
+        """, city, "location")
+
+    accommodations = await query_by_city(db, """
+        SELECT place_id, name, location, latitude, longitude, city_key 
         FROM accommodations 
-        WHERE location ILIKE :city 
+        WHERE {where} 
         LIMIT 2
-    """), {"city": f"%{city}%"}).fetchall()
+    """, city, "location")
 
     def row_to_dict(row):
         d = dict(row._mapping)
@@ -119,31 +120,76 @@ def fetch_places_from_db(db: Session, city: str):
         "accommodations": [row_to_dict(r) for r in accommodations],
     }
 
-def get_place_name_from_db(place_id: str, db: Session):
-    result = db.execute(
-        text("""
-            SELECT name FROM meals WHERE place_id = :id
-            UNION
-            SELECT name FROM destinations WHERE place_id = :id
-            UNION
-            SELECT name FROM accommodations WHERE place_id = :id
-        """), {"id": place_id}).fetchone()
-    return result[0] if result else None
-
-def clean_schedule(schedule: dict, db: Session):
+# 같은 place_id가 여러 테이블에 있으면 식사 → 관광지 → 숙소 순으로 우선
+PLACE_TYPE_PRIORITY = {"meal": 0, "destination": 1, "accommodation": 2}
+
+
+async def fetch_place_refs(db: AsyncSession, place_ids: List[str]) -> dict:
+    """
+    place_id 목록의 이름/좌표/타입을 meals, destinations, accommodations에서 한 번에 조회
+    반환: {place_id: {"name", "latitude", "longitude", "type", "cityKey"}}
+    """
+    if not place_ids:
+        return {}
+    query = union_all(*[
+        select(
+            model.place_id,
+            model.name,
+            model.latitude,
+            model.longitude,
+            model.city_key,
+            literal(place_type).label("place_type"),
+        ).where(model.place_id.in_(place_ids))
+        for place_type, model in (
+            ("meal", models.Meal),
+            ("destination", models.Destination),
+            ("accommodation", models.Accommodation),
+        )
+    ])
+    rows = (await db.execute(query)).fetchall()
+
+    refs = {}
+    for row in rows:
+        current = refs.get(row.place_id)
+        if current and PLACE_TYPE_PRIORITY[current["type"]] <= PLACE_TYPE_PRIORITY[row.place_type]:
+            continue
+        refs[row.place_id] = {
+            "name": row.name,
+            "latitude": float(row.latitude) if row.latitude is not None else None,
+            "longitude": float(row.longitude) if row.longitude is not None else None,
+            "type": row.place_type,
+            "cityKey": row.city_key,
+        }
+    return refs
+
+async def clean_schedule(schedule: dict, db: AsyncSession):
+    # 일정 전체의 placeId를 모아 한 번의 쿼리로 검증
+    place_ids = {
+        str(item.get("placeId", "")).strip()
+        for day in schedule.get("plans", [])
+        for item in day.get("schedule", [])
+    }
+    place_ids.discard("")
+    refs = await fetch_place_refs(db, list(place_ids))
+
     valid_plans = []
     for day in schedule.get("plans", []):
         new_schedule = []
         for item in day.get("schedule", []):
             pid = str(item.get("placeId", "")).strip()
-            if not pid:
+            ref = refs.get(pid)
+            if not ref:
                 continue
-            place_name = get_place_name_from_db(pid, db)
-            lat = item.get("latitude")
-            lng = item.get("longitude")
-            if place_name and lat is not None and lng is not None:
-                item["place"] = place_name
+            # LLM이 만든 좌표 대신 DB 좌표 사용 (없을 때만 LLM 값 유지)
+            lat = ref["latitude"] if ref["latitude"] is not None else item.get("latitude")
+            lng = ref["longitude"] if ref["longitude"] is not None else item.get("longitude")
+            if lat is not None and lng is not None:
+                item["place"] = ref["name"]
                 item["placeId"] = pid
+                item["latitude"] = lat
+                item["longitude"] = lng
+                item["placeType"] = ref["type"]
+                item["cityKey"] = ref.get("cityKey")
                 new_schedule.append(item)
         if new_schedule:
             valid_plans.append({"day": day.get("day"), "schedule": new_schedule})
@@ -153,19 +199,37 @@ def clean_schedule(schedule: dict, db: Session):
         "plans": valid_plans
     }
 
+# 프롬프트 후보 표: 그룹 → (핸들 접두어, 표에 넣을 컬럼)
+CANDIDATE_TABLES = {
+    "destinations": ("D", ["name"]),
+    "meals": ("M", ["name", "food_type"]),
+    "accommodations": ("A", ["name"]),
+}
+
+def interleave_candidates(places_data: dict) -> List[dict]:
+    """그룹별 후보를 번갈아 나열 (토큰 상한으로 뒤쪽을 줄일 때 한 그룹만 사라지지 않도록)"""
+    groups = [[{**p, "_group": g} for p in places_data[g]] for g in CANDIDATE_TABLES]
+    rows = []
+    for i in range(max((len(g) for g in groups), default=0)):
+        rows.extend(g[i] for g in groups if i < len(g))
+    return rows
+
 def generate_schedule_prompt(end_city, start_date, end_date,
-                             emotions, companions, peopleCount, places_data) -> str:
+                             emotions, companions, peopleCount, places_data,
+                             handles: prompt_compact.HandleMap, model: str) -> str:
     trip_days = calculate_trip_days(start_date, end_date)
     emotion_str = ", ".join(emotions)
     companions_str = ", ".join(companions)
     style_list = get_styles_by_emotions(emotions)
     style_str = ", ".join(style_list)
 
-    dest_json = json.dumps(places_data["destinations"], ensure_ascii=False)
-    meals_json = json.dumps(places_data["meals"], ensure_ascii=False)
-    accom_json = json.dumps(places_data["accommodations"], ensure_ascii=False)
-
-    prompt = f"""
+    def build(rows):
+        # 방문 순서/시간은 route_planner가 정하므로 좌표 등은 넣지 않고 핸들 + 필요한 컬럼만
+        tables = {
+            group: prompt_compact.encode_table([r for r in rows if r["_group"] == group], columns, handles, prefix)
+            for group, (prefix, columns) in CANDIDATE_TABLES.items()
+        }
+        return f"""
 당신은 여행 일정 AI입니다. 아래 조건을 반드시 준수하여 **JSON으로만** 출력하세요.
 도착: {end_city}
 기간: {start_date} ~ {end_date} (총 {trip_days}일)
@@ -175,58 +239,35 @@ def generate_schedule_prompt(end_city, start_date, end_date,
 인원: {peopleCount}명
 
 조건:
-- 매일 09:00 관광지 1곳, 12:00 점심 맛집 1곳, 15:00 관광지 1곳, 18:00 저녁 맛집 1곳, 21:00 숙소 1곳 포함
+- 매일 관광지 2곳, 맛집 2곳(점심/저녁), 숙소 1곳 선택
 - 마지막 날엔 숙소 제외
-- 장소는 제공된 리스트에서만 선택
-- 일정은 지리적으로 인접한 순서로 배치
+- 장소는 제공된 리스트에서만 선택하고 placeId에는 리스트의 id(D1, M1, A1 등)를 그대로 사용
+- 방문 시간/순서/좌표는 출력하지 말 것 (서버에서 동선 기준으로 배치)
 - 중복 장소 금지
 - JSON 외 텍스트 포함 금지
 
 [관광지 리스트]
-{dest_json}
+{tables["destinations"]}
 
 [맛집 리스트]
-{meals_json}
+{tables["meals"]}
 
 [숙소 리스트]
-{accom_json}
+{tables["accommodations"]}
 
 **반드시 아래 예시와 똑같은 키와 구조의 JSON만 출력하세요:**
-```json
-{{
-  "aiEmpathy": "즐거운 여정을 위한 일정입니다!",
-  "tags": ["힐링", "친구"],
-  "plans": [
-    {{
-      "day": 1,
-      "schedule": [
-        {{
-          "time": "09:00",
-          "place": "경복궁",
-          "placeId": "PLACE_ID_1",
-          "aiComment": "역사적인 장소 방문",
-          "latitude": 37.57961,
-          "longitude": 126.97704
-        }}
-      ]
-    }}
-  ]
-}}
-"""
-    return prompt.strip()
-
-def extract_json_from_ai_response(ai_text: str) -> dict:
-    match = re.search(r"```json(.*?)```", ai_text, re.DOTALL)
-    if match:
-        body = match.group(1)
-    else:
-        s = ai_text.find("{")
-        e = ai_text.rfind("}")
-        if s == -1 or e == -1:
-            raise ValueError("JSON 구조가 없습니다.")
-        body = ai_text[s:e+1]
-    return json5.loads(body)
+{{"aiEmpathy": "즐거운 여정을 위한 일정입니다!", "tags": ["힐링", "친구"], "plans": [{{"day": 1, "schedule": [{{"placeId": "D1", "aiComment": "역사적인 장소 방문"}}]}}]}}
+""".strip()
 
+    return prompt_compact.fit_rows(build, interleave_candidates(places_data), "schedule", model, min_rows=5)
+
+def restore_place_ids(schedule: dict, handles: prompt_compact.HandleMap) -> dict:
+    """응답의 핸들(D1 등)을 실제 place_id로 복원 (모르는 값은 그대로 두고 검증 단계에서 제외)"""
+    for day in schedule.get("plans", []):
+        for item in day.get("schedule", []):
+            if isinstance(item, dict):
+                item["placeId"] = handles.resolve(item.get("placeId")) or item.get("placeId")
+    return schedule
 
 def normalize_schedule_format(data: dict) -> ScheduleAIResponse:
     plans = []
@@ -240,75 +281,236 @@ def normalize_schedule_format(data: dict) -> ScheduleAIResponse:
     )
 
 
-def save_ai_schedule_places(plans: List[dict], db: Session):
+def save_ai_schedule_places(plans: List[dict]):
+    """분석용 ai_schedule_places 행을 write-behind 큐에 넣음 (응답 지연/실패와 무관)"""
     sched_id = str(uuid.uuid4())
+    rows = []
     for day in plans:
         for item in day["schedule"]:
             pid = item.get("placeId")
             if not pid:
                 continue
-            comment = item.get("aiComment", "").lower()
-            if "숙소" in comment:
-                ptype = "accommodation"
-            elif any(word in comment for word in ["점심", "저녁", "식사"]):
-                ptype = "meal"
-            else:
-                ptype = "destination"
-            db.execute(text("""
-                INSERT INTO ai_schedule_places (schedule_id, place_id, place_type)
-                VALUES (:sid, :pid, :ptype)
-            """), {"sid": sched_id, "pid": pid, "ptype": ptype})
-    db.commit()
+            rows.append({
+                "schedule_id": sched_id, "place_id": pid, "place_type": item["placeType"],
+                "city_key": item.get("cityKey"),
+            })
+    analytics_writer.enqueue(rows)
     
-def get_ai_schedule(db: Session, end_city: str, start_date: str, end_date: str,
-                    emotions: List[str], companions: List[str], peopleCount: int) -> ScheduleAIResponse:
-    places = fetch_places_from_db(db, end_city)
+SCHEDULE_MODEL = "gpt-3.5-turbo-1106"
 
+def schedule_llm_params(end_city, start_date, end_date,
+                        emotions, companions, peopleCount, places_data):
+    """반환: (chat.completions 파라미터, 핸들 매핑)"""
+    handles = prompt_compact.HandleMap()
     prompt = generate_schedule_prompt(
         end_city, start_date, end_date,
-        emotions, companions, peopleCount, places
+        emotions, companions, peopleCount, places_data,
+        handles, SCHEDULE_MODEL
     )
-    messages = [
-        {"role": "system", "content": "You are a travel planner AI."},
-        {"role": "user", "content": prompt}
-    ]
-
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo-1106",
-        messages=messages,
-        temperature=0.7,
-        max_tokens=3000
-    )
-    ai_text = resp.choices[0].message.content
-
-    parsed = extract_json_from_ai_response(ai_text)
-    cleaned = clean_schedule(parsed, db)
-    save_ai_schedule_places(cleaned["plans"], db)
+    params = {
+        "model": SCHEDULE_MODEL,
+        "messages": [
+            {"role": "system", "content": "You are a travel planner AI."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.7,
+        "max_tokens": 3000,
+        "response_format": llm_json.JSON_MODE,
+    }
+    return params, handles
+
+def format_server_timing(timings: dict) -> str:
+    """{"llm": 1234.5, ...} → Server-Timing 헤더 값"""
+    return ", ".join(f"{name};dur={duration:.1f}" for name, duration in timings.items())
+
+async def generate_schedule(db: AsyncSession, end_city: str, start_date: str, end_date: str,
+                            emotions: List[str], companions: List[str], peopleCount: int,
+                            mark=lambda name: None) -> dict:
+    """후보 조회 → LLM → 파싱/검증 → 동선 배치까지 (분석용 저장은 하지 않음, 템플릿 사전 생성에서도 사용)"""
+    places = await fetch_places_from_db(db, end_city)
+    mark("fetch_places")
+
+    params, handles = schedule_llm_params(end_city, start_date, end_date,
+                                          emotions, companions, peopleCount, places)
+    # 같은 프롬프트(후보/핸들 포함)의 요청이 동시에 들어오면 LLM 호출 한 번을 공유
+    ai_text = await singleflight.do("schedule", singleflight.prompt_key("schedule", params),
+                                    lambda: llm_cache.cached_chat_text("schedule", **params))
+    mark("llm")
 
+    try:
+        parsed = llm_json.parse_llm_json(ai_text, "schedule")
+    except llm_json.LLMJSONError:
+        # 깨진 응답이 캐시에 남아 같은 요청이 계속 실패하지 않도록 삭제
+        await llm_cache.invalidate("schedule", **params)
+        raise
+    restore_place_ids(parsed, handles)
+    mark("parse")
+    cleaned = await clean_schedule(parsed, db)
+    mark("validate")
+    cleaned["plans"] = route_planner.plan_schedule(cleaned["plans"], calculate_trip_days(start_date, end_date))
+    mark("route")
+    return cleaned
+
+async def schedule_from_template(db: AsyncSession, end_city: str, trip_days: int,
+                                 emotions: List[str], companions: List[str], peopleCount: int) -> Optional[dict]:
+    """사전 생성된 일정 템플릿이 있으면 장소를 다시 검증해 사용 (aiEmpathy만 요청별로 생성)"""
+    template = await itinerary_templates.get_template(end_city, get_styles_by_emotions(emotions), trip_days)
+    if template is None:
+        return None
+    # 템플릿 생성 이후 삭제/수정된 장소를 걸러내고 이름·좌표는 현재 DB 값으로
+    cleaned = await clean_schedule(template, db)
+    if not itinerary_templates.is_complete(cleaned["plans"], trip_days):
+        itinerary_templates.template_stats["stale"] += 1
+        return None
+    cleaned["aiEmpathy"] = await itinerary_templates.empathy_text(end_city, trip_days, emotions, companions, peopleCount)
+    return cleaned
+
+async def get_ai_schedule(db: AsyncSession, end_city: str, start_date: str, end_date: str,
+                    emotions: List[str], companions: List[str], peopleCount: int,
+                    timings: Optional[dict] = None) -> ScheduleAIResponse:
+    # 단계별 소요시간(ms) 기록용
+    timings = timings if timings is not None else {}
+    started = time.perf_counter()
+
+    def mark(name):
+        nonlocal started
+        now = time.perf_counter()
+        timings[name] = (now - started) * 1000
+        started = now
+
+    cleaned = None
+    if settings.ITINERARY_TEMPLATES_ENABLED:
+        cleaned = await schedule_from_template(db, end_city, calculate_trip_days(start_date, end_date),
+                                               emotions, companions, peopleCount)
+        mark("template")
+    if cleaned is None:
+        cleaned = await generate_schedule(db, end_city, start_date, end_date,
+                                          emotions, companions, peopleCount, mark)
+    save_ai_schedule_places(cleaned["plans"])
+    mark("save_places")
+
+    logger.info("AI 일정 생성 단계별 소요시간: %s", format_server_timing(timings))
     return normalize_schedule_format(cleaned)
 
-app = FastAPI()
 
-@app.post("/ai/schedule", response_model=ScheduleAPIResponse)
-def api_ai_schedule(req: ScheduleRequest, db: Session = Depends(get_db)):
-    try:
-        ai_res = get_ai_schedule(
-            db=db,
-            end_city=req.endCity,
-            start_date=req.startDate,
-            end_date=req.endDate,
-            emotions=req.emotions,
-            companions=req.companions,
-            peopleCount=req.peopleCount
-        )
-        return ScheduleAPIResponse(
-            endCity=req.endCity,
-            startDate=req.startDate,
-            endDate=req.endDate,
-            emotions=req.emotions,
-            companions=req.companions,
-            peopleCount=req.peopleCount,
-            aiResult=ai_res
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail="서버 에러가 발생했습니다.")
+# 스트리밍(SSE) 응답용 ------------------------------------------------------------
+
+PLACE_GROUPS = {"destinations": "destination", "meals": "meal", "accommodations": "accommodation"}
+
+
+def candidate_refs(places_data: dict) -> dict:
+    """fetch_places_from_db 결과 → {place_id: {name, latitude, longitude, type, cityKey}} (DB 재조회 없이 검증)"""
+    refs = {}
+    for group, place_type in PLACE_GROUPS.items():
+        for place in places_data[group]:
+            refs.setdefault(place["place_id"], {
+                "name": place["name"],
+                "latitude": place.get("latitude"),
+                "longitude": place.get("longitude"),
+                "type": place_type,
+                "cityKey": place.get("city_key"),
+            })
+    return refs
+
+
+def validate_item(item: dict, refs: dict, handles: prompt_compact.HandleMap) -> Optional[dict]:
+    """후보 목록에 있고 좌표가 있는 장소만 통과, 이름/좌표/타입은 DB 값으로 채움"""
+    if not isinstance(item, dict):
+        return None
+    pid = handles.resolve(item.get("placeId")) or ""
+    ref = refs.get(pid)
+    if not ref or ref["latitude"] is None or ref["longitude"] is None:
+        return None
+    return {
+        "place": ref["name"],
+        "placeId": pid,
+        "aiComment": item.get("aiComment"),
+        "latitude": ref["latitude"],
+        "longitude": ref["longitude"],
+        "placeType": ref["type"],
+        "cityKey": ref.get("cityKey"),
+    }
+
+
+def day_payload(day: dict) -> dict:
+    return ScheduleDayPlan(day=day["day"], schedule=[SchedulePlanItem(**it) for it in day["schedule"]]).dict()
+
+
+async def stream_ai_schedule(db: AsyncSession, end_city: str, start_date: str, end_date: str,
+                             emotions: List[str], companions: List[str], peopleCount: int):
+    """
+    일정을 스트리밍으로 생성하며 (event, data)를 순서대로 반환
+    - meta: aiEmpathy / tags 가 완성되는 즉시
+    - day: 하루치 장소가 모두 도착하면 검증 + 동선 배치 후
+    - done: 전체 결과 (aiEmpathy, tags, plans)
+    """
+    started = time.perf_counter()
+    places = await fetch_places_from_db(db, end_city)
+    # LLM 스트리밍 동안 커넥션을 잡고 있지 않도록 조회 트랜잭션 종료
+    await db.commit()
+
+    refs = candidate_refs(places)
+    trip_days = calculate_trip_days(start_date, end_date)
+    params, handles = schedule_llm_params(end_city, start_date, end_date,
+                                          emotions, companions, peopleCount, places)
+
+    parser = StreamingJSONParser(watch=[
+        ("aiEmpathy",), ("tags",), ("plans", ANY, "schedule", ANY), ("plans", ANY),
+    ])
+    meta = {"aiEmpathy": None, "tags": None}
+    day_items = {}
+    builder = route_planner.ItineraryBuilder()
+    plans = []
+    first_event = None
+
+    # 클라이언트가 끊기면(aclose) LLM 스트림도 바로 닫음
+    async with aclosing(llm_cache.cached_chat_stream("schedule", **params)) as stream:
+        async for piece in stream:
+            for path, value in parser.feed(piece):
+                if path[0] in meta and len(path) == 1:
+                    meta[path[0]] = value
+                    yield "meta", {path[0]: value}
+                elif len(path) == 4:
+                    # 장소 하나가 완성되는 즉시 후보 목록으로 검증
+                    item = validate_item(value, refs, handles)
+                    if item:
+                        day_items.setdefault(path[1], []).append(item)
+                elif len(path) == 2:
+                    day_num = value.get("day") if isinstance(value, dict) else None
+                    day_num = day_num or path[1] + 1
+                    planned = builder.add_day(day_num, day_items.pop(path[1], []), is_last_day=day_num >= trip_days)
+                    if planned:
+                        plans.append(planned)
+                        if first_event is None:
+                            first_event = (time.perf_counter() - started) * 1000
+                        yield "day", day_payload(planned)
+
+    # 일자 객체가 깨져 파서가 건너뛴 날: 이미 검증된 장소로 배치
+    for index in sorted(day_items):
+        planned = builder.add_day(index + 1, day_items.pop(index), is_last_day=index + 1 >= trip_days)
+        if planned:
+            plans.append(planned)
+            yield "day", day_payload(planned)
+
+    if not plans:
+        # 스트림이 JSON 구조로 오지 않은 경우 전체 텍스트로 기존 방식 파싱
+        try:
+            parsed = llm_json.parse_llm_json(parser.buffer, "schedule")
+        except llm_json.LLMJSONError:
+            await llm_cache.invalidate("schedule", **params)
+            raise
+        restore_place_ids(parsed, handles)
+        cleaned = await clean_schedule(parsed, db)
+        meta = {"aiEmpathy": cleaned.get("aiEmpathy"), "tags": cleaned.get("tags")}
+        plans = route_planner.plan_schedule(cleaned["plans"], trip_days)
+        for planned in plans:
+            yield "day", day_payload(planned)
+
+    save_ai_schedule_places(plans)
+    logger.info("AI 일정 스트리밍 완료: 첫 일자 %.1fms, 전체 %.1fms",
+                first_event or -1, (time.perf_counter() - started) * 1000)
+    yield "done", {
+        "aiEmpathy": meta["aiEmpathy"],
+        "tags": meta["tags"],
+        "plans": [day_payload(planned) for planned in plans],
+    }
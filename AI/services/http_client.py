@@ -0,0 +1,83 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+import aiohttp
+
+import metrics
+import profiling
+from config import settings
+
+# 앱 수명 동안 공유하는 aiohttp 세션 (main.lifespan 에서 생성/종료)
+_session: Optional[aiohttp.ClientSession] = None
+
+# 외부 API별 동시 호출 수 / 호출당 타임아웃(초)
+UPSTREAMS = {
+    "odsay": {
+        "concurrency": settings.ODSAY_MAX_CONCURRENCY,
+        "timeout": settings.ODSAY_TIMEOUT,
+    },
+}
+
+# 세마포어는 처음 사용한 이벤트 루프에 묶이므로 루프가 바뀌면 새로 만듦
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+_semaphores_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def start():
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_MAX_CONNECTIONS,
+            limit_per_host=settings.HTTP_LIMIT_PER_HOST,
+            ttl_dns_cache=300,
+        )
+        _session = aiohttp.ClientSession(connector=connector)
+
+
+async def close():
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    # lifespan 밖(스크립트 등)에서 호출돼도 동작하도록 지연 생성
+    if _session is None or _session.closed:
+        await start()
+    return _session
+
+
+def _semaphore(upstream: str) -> asyncio.Semaphore:
+    global _semaphores_loop
+    loop = asyncio.get_running_loop()
+    if _semaphores_loop is not loop:
+        _semaphores.clear()
+        _semaphores_loop = loop
+    semaphore = _semaphores.get(upstream)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(UPSTREAMS[upstream]["concurrency"])
+        _semaphores[upstream] = semaphore
+    return semaphore
+
+
+async def get_json(upstream: str, url: str, params: dict = None) -> dict:
+    """동시 호출 수와 타임아웃이 제한된 GET 요청"""
+    session = await get_session()
+    timeout = aiohttp.ClientTimeout(total=UPSTREAMS[upstream]["timeout"])
+    async with _semaphore(upstream):
+        started = time.perf_counter()
+        status = "error"
+        try:
+            async with session.get(url, params=params, timeout=timeout) as resp:
+                status = str(resp.status)
+                resp.raise_for_status()
+                return await resp.json(content_type=None)
+        except asyncio.TimeoutError:
+            status = "timeout"
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.UPSTREAM_REQUEST_SECONDS.labels(upstream, status).observe(elapsed)
+            profiling.record_http(elapsed)
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import logging
+from typing import List, Optional
+
+from config import settings, async_redis_client
+from services import llm_cache, city_index
+
+logger = logging.getLogger(__name__)
+
+# 사전 생성 일정 템플릿 (scripts/precompute_templates.py 가 매일 생성)
+# 키: itinerary_template:{도시 키}:{스타일 프로필}:{일수}
+TEMPLATE_PREFIX = "itinerary_template:"
+MAX_TEMPLATE_DAYS = 5
+MIN_ITEMS_PER_DAY = 3
+
+EMPATHY_MODEL = "gpt-3.5-turbo-1106"
+DEFAULT_EMPATHY = "즐거운 여정을 위한 일정입니다!"
+
+template_stats = {"hit": 0, "miss": 0, "stale": 0}
+
+
+def city_id(end_city: str) -> Optional[str]:
+    """도시 입력 → 템플릿용 정규화 키 (예: "서울특별시" → "서울", "서울 마포구" → "서울-마포구")"""
+    keys = city_index.parse_city_query(end_city)
+    parts = [keys[k] for k in ("city_key", "region_key") if k in keys]
+    return "-".join(parts) or None
+
+
+def style_profile(styles: List[str]) -> str:
+    """감정에서 나온 스타일 집합의 지문 (감정 조합이 달라도 스타일이 같으면 같은 템플릿)"""
+    styles = sorted(set(styles))
+    if not styles:
+        return "default"
+    return hashlib.sha1(",".join(styles).encode("utf-8")).hexdigest()[:12]
+
+
+def template_key(city: str, profile: str, days: int) -> str:
+    return f"{TEMPLATE_PREFIX}{city}:{profile}:{days}"
+
+
+def is_complete(plans: List[dict], days: int) -> bool:
+    """일수만큼의 일자가 있고, 매일 관광지와 맛집이 포함된 최소 장소 수를 채웠는지"""
+    if len(plans) != days:
+        return False
+    for day in plans:
+        items = day.get("schedule", [])
+        types = {item.get("placeType") for item in items}
+        if len(items) < MIN_ITEMS_PER_DAY or not {"destination", "meal"} <= types:
+            return False
+    return True
+
+
+async def get_template(end_city: str, styles: List[str], days: int) -> Optional[dict]:
+    city = city_id(end_city)
+    if city is None or not 1 <= days <= MAX_TEMPLATE_DAYS:
+        template_stats["miss"] += 1
+        return None
+    try:
+        raw = await async_redis_client.get(template_key(city, style_profile(styles), days))
+    except Exception as e:
+        logger.warning("일정 템플릿 Redis 조회 실패: %s", e)
+        raw = None
+    if raw is None:
+        template_stats["miss"] += 1
+        return None
+    template_stats["hit"] += 1
+    return json.loads(raw)
+
+
+async def store_template(end_city: str, styles: List[str], days: int, template: dict):
+    city = city_id(end_city)
+    if city is None:
+        raise ValueError(f"템플릿 도시 키를 만들 수 없습니다: {end_city}")
+    await async_redis_client.set(
+        template_key(city, style_profile(styles), days),
+        json.dumps(template, ensure_ascii=False),
+        ex=settings.ITINERARY_TEMPLATE_TTL,
+    )
+
+
+async def empathy_text(end_city: str, days: int, emotions: List[str], companions: List[str], people_count: int) -> str:
+    """템플릿 응답에 붙일 요청별 공감 문구 (같은 조건이면 LLM 캐시에서)"""
+    prompt = (
+        f"{end_city}로 {days}일 동안 {', '.join(companions) or '혼자'}({people_count}명) 떠나는 여행자의 "
+        f"감정은 '{', '.join(emotions)}'이야. 이 여행자에게 건넬 공감 한 문장을 친구에게 말하듯 써줘. "
+        f"이모지 1개 이내, 따옴표 없이 문장만."
+    )
+    try:
+        text = await llm_cache.cached_chat_text(
+            "empathy",
+            model=EMPATHY_MODEL,
+            messages=[
+                {"role": "system", "content": "너는 다정한 여행 플래너야."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=100
+        )
+        return text.strip().strip('"') or DEFAULT_EMPATHY
+    except Exception:
+        logger.exception("공감 문구 생성 실패")
+        return DEFAULT_EMPATHY
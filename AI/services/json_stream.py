@@ -0,0 +1,128 @@
+import json
+from typing import Iterable, List, Tuple
+
+from services.llm_json import lenient_loads
+
+# 경로 패턴에서 배열 인덱스 자리에 쓰는 와일드카드
+ANY = "*"
+
+
+class StreamingJSONParser:
+    """
+    스트리밍으로 들어오는 JSON 텍스트를 조금씩 받아, 관심 경로의 값이 완성되는 즉시 꺼내는 파서
+    예: watch=[("plans", ANY)] 이면 plans 배열의 각 원소(객체)가 닫힐 때마다 반환
+    JSON 앞뒤의 설명 문장이나 ```json 펜스는 무시 (첫 '{' 부터 파싱)
+    """
+
+    def __init__(self, watch: Iterable[Tuple]):
+        self.watch = [tuple(p) for p in watch]
+        self.buffer = ""
+        self._pos = 0
+        self._started = False
+        self._done = False
+        # 열린 컨테이너: {"type": "{" | "[", "start", "key", "index", "expect"}
+        self._stack: List[dict] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        # 진행 중인 숫자/true/false/null 값의 시작 위치
+        self._scalar_start = None
+        # 파싱에 실패해 건너뛴 관심 경로 값 수
+        self.skipped = 0
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def _path(self) -> Tuple:
+        path = []
+        for entry in self._stack:
+            path.append(entry["key"] if entry["type"] == "{" else entry["index"])
+        return tuple(path)
+
+    def _watched(self, path: Tuple) -> bool:
+        for pattern in self.watch:
+            if len(pattern) == len(path) and all(p == ANY or p == v for p, v in zip(pattern, path)):
+                return True
+        return False
+
+    def feed(self, chunk: str) -> List[Tuple[Tuple, object]]:
+        """chunk를 이어 붙이고 새로 완성된 (경로, 값) 목록 반환"""
+        self.buffer += chunk
+        completed = []
+        buf = self.buffer
+        i = self._pos
+        while i < len(buf) and not self._done:
+            ch = buf[i]
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._stack.append({"type": "{", "start": i, "key": None, "index": 0, "expect": "key"})
+                i += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    top = self._stack[-1]
+                    try:
+                        value = json.loads(buf[self._string_start:i + 1])
+                    except ValueError:
+                        # 잘못된 이스케이프 등: 따옴표 안쪽 원문 그대로 사용
+                        value = buf[self._string_start + 1:i]
+                    if top["type"] == "{" and top["expect"] == "key":
+                        top["key"] = value
+                    elif self._watched(self._path()):
+                        completed.append((self._path(), value))
+                i += 1
+                continue
+
+            top = self._stack[-1]
+            if self._scalar_start is not None:
+                if ch not in ",}]" and not ch.isspace():
+                    i += 1
+                    continue
+                # 스칼라는 구분자가 와야 끝난 것을 알 수 있음 (청크 끝의 "12"는 "123"일 수 있음)
+                self._complete_scalar(buf[self._scalar_start:i], completed)
+                self._scalar_start = None
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                self._stack.append({"type": ch, "start": i, "key": None, "index": 0, "expect": "key"})
+            elif ch in "}]":
+                entry = self._stack.pop()
+                if not self._stack:
+                    self._done = True
+                elif self._watched(self._path()):
+                    try:
+                        completed.append((self._path(), lenient_loads(buf[entry["start"]:i + 1])))
+                    except Exception:
+                        # 깨진 원소는 건너뜀 (스트림은 계속, 필요하면 호출부가 전체 텍스트로 다시 파싱)
+                        self.skipped += 1
+            elif ch == ":" and top["type"] == "{":
+                top["expect"] = "value"
+            elif ch == ",":
+                if top["type"] == "{":
+                    top["expect"] = "key"
+                else:
+                    top["index"] += 1
+            elif not ch.isspace() and (top["type"] == "[" or top["expect"] == "value"):
+                self._scalar_start = i
+            i += 1
+        self._pos = i
+        return completed
+
+    def _complete_scalar(self, text: str, completed: List[Tuple[Tuple, object]]):
+        path = self._path()
+        if not self._watched(path):
+            return
+        try:
+            completed.append((path, json.loads(text)))
+        except ValueError:
+            self.skipped += 1
@@ -0,0 +1,144 @@
+import re
+import json
+import hashlib
+import logging
+from collections import defaultdict
+from contextlib import aclosing
+from typing import AsyncIterator, Optional
+
+from config import settings, async_redis_client
+from services import llm_gateway
+from services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# 엔드포인트별 Redis TTL (초)
+LLM_CACHE_TTLS = {
+    "schedule": 6 * 3600,
+    "restaurant": 6 * 3600,
+    "quick_budget": 24 * 3600,
+    "budget_comment": 3600,
+    "place_comment": 24 * 3600,
+    "meal_comment": 24 * 3600,
+    "empathy": 24 * 3600,
+}
+DEFAULT_TTL = 3600
+
+KEY_PREFIX = "llm_cache:"
+
+# L1: 프로세스 내 캐시 (Redis 왕복도 생략)
+_l1 = TTLCache(maxsize=settings.LLM_CACHE_L1_SIZE, ttl=settings.LLM_CACHE_L1_TTL)
+
+# 엔드포인트별 hit/miss 카운터
+_stats = defaultdict(lambda: {"l1_hit": 0, "l2_hit": 0, "miss": 0})
+
+_whitespace = re.compile(r"\s+")
+
+
+def normalize_prompt(text: str) -> str:
+    # 들여쓰기/줄바꿈 차이만 있는 프롬프트를 같은 키로 취급
+    return _whitespace.sub(" ", text or "").strip()
+
+
+def make_cache_key(params: dict) -> str:
+    """model, 생성 파라미터, 정규화된 메시지로 만든 프롬프트 지문"""
+    payload = {k: v for k, v in params.items() if k != "messages"}
+    payload["messages"] = [
+        {"role": m.get("role"), "content": normalize_prompt(m.get("content", ""))}
+        for m in params.get("messages", [])
+    ]
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+async def _lookup(key: str, ttl: int, stats: dict) -> Optional[str]:
+    cached = _l1.get(key)
+    if cached is not None:
+        stats["l1_hit"] += 1
+        return cached
+
+    try:
+        cached = await async_redis_client.get(key)
+    except Exception as e:
+        logger.warning("LLM 캐시 Redis 조회 실패: %s", e)
+        cached = None
+    if cached is not None:
+        stats["l2_hit"] += 1
+        _l1.set(key, cached, ttl=min(ttl, _l1.ttl))
+        return cached
+
+    stats["miss"] += 1
+    return None
+
+
+async def _store(key: str, text: str, ttl: int):
+    if not text:
+        return
+    _l1.set(key, text, ttl=min(ttl, _l1.ttl))
+    try:
+        await async_redis_client.set(key, text, ex=ttl)
+    except Exception as e:
+        logger.warning("LLM 캐시 Redis 저장 실패: %s", e)
+
+
+async def cached_chat_text(endpoint: str, ttl: Optional[int] = None, **params) -> str:
+    """LLM 게이트웨이 앞단 캐시: L1(프로세스) → L2(Redis) → OpenAI 순으로 조회"""
+    if not settings.LLM_CACHE_ENABLED:
+        return await llm_gateway.chat_text(**params)
+
+    ttl = ttl or LLM_CACHE_TTLS.get(endpoint, DEFAULT_TTL)
+    key = f"{KEY_PREFIX}{endpoint}:{make_cache_key(params)}"
+
+    cached = await _lookup(key, ttl, _stats[endpoint])
+    if cached is not None:
+        return cached
+
+    text = await llm_gateway.chat_text(**params)
+    await _store(key, text, ttl)
+    return text
+
+
+async def cached_chat_stream(endpoint: str, ttl: Optional[int] = None, **params) -> AsyncIterator[str]:
+    """
+    스트리밍 버전: 캐시 hit이면 전체 텍스트를 한 번에, miss이면 조각 단위로 전달
+    스트림이 끝까지 완료된 경우에만 cached_chat_text와 같은 키로 저장
+    """
+    if not settings.LLM_CACHE_ENABLED:
+        async with aclosing(llm_gateway.stream_chat(**params)) as stream:
+            async for piece in stream:
+                yield piece
+        return
+
+    ttl = ttl or LLM_CACHE_TTLS.get(endpoint, DEFAULT_TTL)
+    key = f"{KEY_PREFIX}{endpoint}:{make_cache_key(params)}"
+
+    cached = await _lookup(key, ttl, _stats[endpoint])
+    if cached is not None:
+        yield cached
+        return
+
+    pieces = []
+    async with aclosing(llm_gateway.stream_chat(**params)) as stream:
+        async for piece in stream:
+            pieces.append(piece)
+            yield piece
+    await _store(key, "".join(pieces).strip(), ttl)
+
+
+async def invalidate(endpoint: str, **params):
+    """파싱에 실패한 응답 등, 캐시에 남으면 안 되는 결과 삭제"""
+    key = f"{KEY_PREFIX}{endpoint}:{make_cache_key(params)}"
+    _l1.delete(key)
+    try:
+        await async_redis_client.delete(key)
+    except Exception as e:
+        logger.warning("LLM 캐시 Redis 삭제 실패: %s", e)
+
+
+def cache_stats() -> dict:
+    result = {}
+    for endpoint, stats in _stats.items():
+        total = stats["l1_hit"] + stats["l2_hit"] + stats["miss"]
+        hits = stats["l1_hit"] + stats["l2_hit"]
+        result[endpoint] = {**stats, "hitRatio": round(hits / total, 3) if total else 0.0}
+    return result
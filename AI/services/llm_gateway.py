@@ -0,0 +1,135 @@
+import asyncio
+import time
+from typing import AsyncIterator, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+import metrics
+import profiling
+from config import settings
+
+# 프로세스 전체에서 공유하는 OpenAI 클라이언트 (keep-alive 커넥션 재사용)
+_client: Optional[AsyncOpenAI] = None
+
+# 동시에 진행 중인 OpenAI 호출 수 상한 (레이트리밋/커넥션 고갈 방지)
+# 세마포어는 처음 사용한 이벤트 루프에 묶이므로 루프별로 지연 생성
+_semaphore: Optional[asyncio.Semaphore] = None
+_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """실행 중인 루프의 동시 호출 제한 (스크립트/테스트에서 asyncio.run을 여러 번 호출해도 안전)"""
+    global _semaphore, _semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore_loop is not loop:
+        _semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+        _semaphore_loop = loop
+    return _semaphore
+
+
+def get_client() -> AsyncOpenAI:
+    global _client
+    if _client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE,
+                keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY,
+            ),
+            timeout=settings.OPENAI_TIMEOUT,
+        )
+        _client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            http_client=http_client,
+            timeout=settings.OPENAI_TIMEOUT,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+        )
+    return _client
+
+
+async def chat_completion(**params):
+    """chat.completions.create 를 그대로 감싼 비동기 호출"""
+    model = params.get("model", "unknown")
+    async with _get_semaphore():
+        started = time.perf_counter()
+        try:
+            response = await get_client().chat.completions.create(**params)
+        except Exception:
+            metrics.observe_llm(model, time.perf_counter() - started, "error")
+            profiling.record_llm(time.perf_counter() - started)
+            raise
+    elapsed = time.perf_counter() - started
+    metrics.observe_llm(model, elapsed, "ok", response.usage)
+    profiling.record_llm(elapsed)
+    return response
+
+
+async def chat_text(**params) -> str:
+    """응답 본문 텍스트만 필요한 호출용"""
+    response = await chat_completion(**params)
+    return (response.choices[0].message.content or "").strip()
+
+
+# 스트림 종료 표시 (stream_chat 내부 큐용)
+_END = object()
+
+
+async def _pump_stream(params: dict, queue: asyncio.Queue):
+    """OpenAI 스트림을 끝까지 읽어 큐에 넣음 (소비 속도와 무관하게 수신이 끝나면 슬롯 반환)"""
+    model = params.get("model", "unknown")
+    usage = None
+    status = "error"
+    try:
+        async with _get_semaphore():
+            started = time.perf_counter()
+            try:
+                # 마지막 청크로 토큰 사용량을 받음
+                stream = await get_client().chat.completions.create(
+                    stream=True, stream_options={"include_usage": True}, **params
+                )
+                try:
+                    async for chunk in stream:
+                        if chunk.usage is not None:
+                            usage = chunk.usage
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            queue.put_nowait(chunk.choices[0].delta.content)
+                finally:
+                    # 취소(클라이언트 이탈) 시에도 업스트림 HTTP 응답을 바로 닫음
+                    await stream.close()
+                status = "ok"
+            finally:
+                elapsed = time.perf_counter() - started
+                metrics.observe_llm(model, elapsed, status, usage)
+                profiling.record_llm(elapsed)
+    finally:
+        queue.put_nowait(_END)
+
+
+async def stream_chat(**params) -> AsyncIterator[str]:
+    """
+    stream=True 호출, 도착하는 텍스트 조각을 순서대로 반환
+    수신은 별도 태스크에서 진행하므로 느린 SSE 클라이언트가 동시 호출 슬롯을 잡고 있지 않음
+    소비 쪽이 중단(aclose/취소)되면 수신도 취소
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    producer = asyncio.create_task(_pump_stream(params, queue))
+    try:
+        while True:
+            piece = await queue.get()
+            if piece is _END:
+                break
+            yield piece
+        # 업스트림 오류는 소비 쪽으로 전달
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+
+
+async def close():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,93 @@
+import json
+import logging
+from collections import defaultdict
+
+import json5
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json(C 확장)으로 동작
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# chat.completions 호출에 넘기는 JSON 모드 옵션 (프롬프트에 "JSON" 단어가 있어야 함)
+JSON_MODE = {"type": "json_object"}
+
+# 엔드포인트별 파싱 결과 카운터
+# ok: 응답 전체가 바로 JSON / stripped: 코드펜스·설명 제거 후 성공 / repaired: json5로 복구 / failed: 실패
+_stats = defaultdict(lambda: {"ok": 0, "stripped": 0, "repaired": 0, "failed": 0})
+
+
+class LLMJSONError(ValueError):
+    """LLM 응답에서 JSON 객체를 복구하지 못함"""
+
+
+def fast_loads(text: str):
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def lenient_loads(text: str):
+    """빠른 파서 → 실패 시 json5(후행 쉼표, 작은따옴표, 주석 허용)"""
+    try:
+        return fast_loads(text)
+    except ValueError:
+        return json5.loads(text)
+
+
+def strip_to_object(text: str) -> str:
+    """```json 펜스나 앞뒤 설명 문장을 제거하고 첫 '{' ~ 마지막 '}' 구간만 남김"""
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end < start:
+        raise LLMJSONError("JSON 구조가 없습니다.")
+    return text[start:end + 1]
+
+
+def parse_llm_json(text: str, endpoint: str) -> dict:
+    """
+    LLM 응답 → dict
+    JSON 모드 응답은 첫 단계에서 끝나고, 펜스 제거/json5 복구는 실패했을 때만 수행
+    """
+    stats = _stats[endpoint]
+    text = (text or "").strip()
+
+    try:
+        result = fast_loads(text)
+        if isinstance(result, dict):
+            stats["ok"] += 1
+            return result
+    except ValueError:
+        pass
+
+    try:
+        body = strip_to_object(text)
+        try:
+            result = fast_loads(body)
+            stats["stripped"] += 1
+        except ValueError:
+            result = json5.loads(body)
+            stats["repaired"] += 1
+    except (ValueError, LLMJSONError) as e:
+        stats["failed"] += 1
+        logger.warning("[%s] LLM 응답 JSON 파싱 실패: %s / 응답 앞부분: %s", endpoint, e, text[:200])
+        raise LLMJSONError(str(e)) from e
+
+    if not isinstance(result, dict):
+        stats["failed"] += 1
+        raise LLMJSONError("JSON 객체가 아닙니다.")
+    return result
+
+
+def parse_stats() -> dict:
+    result = {}
+    for endpoint, stats in _stats.items():
+        total = sum(stats.values())
+        result[endpoint] = {
+            **stats,
+            "repairRate": round((stats["stripped"] + stats["repaired"]) / total, 3) if total else 0.0,
+            "failureRate": round(stats["failed"] / total, 3) if total else 0.0,
+        }
+    return result
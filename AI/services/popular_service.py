@@ -1,58 +1,147 @@
 import json
-from sqlalchemy import text
-from config import redis_client
-from database import get_db
+import logging
+from typing import Dict, List, Optional
+
+from sqlalchemy import text, select, union_all, literal, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+from config import settings, redis_client, async_redis_client
+from database import SessionLocal
+from services import popularity, city_index
+from services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_IMAGE = "https://cdn.example.com/images/default.jpg"
 
+# cron(update_popular_places)이 채우는 누적 집계 키: 실시간 카운터가 비어 있을 때(배포 직후 등) 사용
+LEGACY_KEY = "popular_places"
+
+TYPE_LABELS = {"destination": "관광지", "meal": "맛집", "accommodation": "숙소"}
+PLACE_MODELS = (
+    ("meal", models.Meal),
+    ("destination", models.Destination),
+    ("accommodation", models.Accommodation),
+)
+# 같은 place_id가 여러 테이블에 있으면 관광지 → 맛집 → 숙소 순으로 우선 (기존 cron 조회 순서)
+TYPE_PRIORITY = {"destination": 0, "meal": 1, "accommodation": 2}
+
+# 구간/도시/타입/개수별 응답 (프로세스 내, POPULAR_CACHE_TTL 동안 재사용)
+_cache = TTLCache(maxsize=256, ttl=settings.POPULAR_CACHE_TTL)
+popular_cache_stats = {"hit": 0, "miss": 0}
+
+
+def place_cards_query(place_ids: List[str]):
+    """place_id 목록의 이름/이미지/타입을 세 테이블에서 한 번에 조회하는 쿼리"""
+    return union_all(*[
+        select(
+            model.place_id,
+            model.name,
+            func.coalesce(model.image_url, "").label("image_url"),
+            literal(place_type).label("place_type"),
+        ).where(model.place_id.in_(place_ids))
+        for place_type, model in PLACE_MODELS
+    ])
+
+
+def to_cards(ranked: List[tuple], rows) -> List[dict]:
+    """[(place_id, count)] 순서대로 조회 결과를 붙여 응답 형식으로 (DB에 없는 장소는 제외)"""
+    places: Dict[str, tuple] = {}
+    for row in rows:
+        current = places.get(row.place_id)
+        if current and TYPE_PRIORITY[current.place_type] <= TYPE_PRIORITY[row.place_type]:
+            continue
+        places[row.place_id] = row
+    cards = []
+    for place_id, count in ranked:
+        place = places.get(place_id)
+        if place is None:
+            continue
+        cards.append({
+            "placeId": place_id,
+            "name": place.name,
+            "type": TYPE_LABELS[place.place_type],
+            "count": count,
+            "imageUrl": place.image_url or DEFAULT_IMAGE,
+        })
+    return cards
+
+
 def update_popular_places():
-    db = next(get_db())
+    # cron 스크립트에서 호출되므로 동기 세션 사용
+    db = SessionLocal()
+    try:
+        _update_popular_places(db)
+    finally:
+        db.close()
 
-    result = db.execute(text("""
+
+def _update_popular_places(db):
+    ranked = [tuple(row) for row in db.execute(text("""
         SELECT place_id, COUNT(*) as count
         FROM ai_schedule_places
         GROUP BY place_id
         ORDER BY count DESC
         LIMIT 16
-    """)).fetchall()
-
-    popular = []
-    for row in result:
-        place_id = row[0]
-        count = row[1]
-
-        # 관광지에서 조회
-        place = db.execute(text("""
-            SELECT name, COALESCE(image_url, '') as image_url, '관광지' as type
-            FROM destinations
-            WHERE place_id = :pid
-        """), {"pid": place_id}).fetchone()
-
-        # 맛집에서 조회
-        if not place:
-            place = db.execute(text("""
-                SELECT name, COALESCE(image_url, '') as image_url, '맛집' as type
-                FROM meals
-                WHERE place_id = :pid
-            """), {"pid": place_id}).fetchone()
-
-        # 숙소에서 조회
-        if not place:
-            place = db.execute(text("""
-                SELECT name, COALESCE(image_url, '') as image_url, '숙소' as type
-                FROM accommodations
-                WHERE place_id = :pid
-            """), {"pid": place_id}).fetchone()
-
-        if place:
-            name, image_url, place_type = place
-            popular.append({
-                "placeId": place_id,
-                "name": name,
-                "type": place_type,
-                "count": count,
-                "imageUrl": image_url if image_url else DEFAULT_IMAGE
-            })
-
-    redis_client.set("popular_places", json.dumps(popular, ensure_ascii=False))
+    """)).fetchall()]
+    rows = db.execute(place_cards_query([pid for pid, _ in ranked])).fetchall() if ranked else []
+    popular = to_cards(ranked, rows)
+
+    redis_client.set(LEGACY_KEY, json.dumps(popular, ensure_ascii=False))
     print("인기 장소 Redis 캐싱 완료")
+
+
+def parse_place_type(value: Optional[str]) -> Optional[str]:
+    """destination/meal/accommodation 또는 관광지/맛집/숙소 → 내부 타입 (모르는 값은 ValueError)"""
+    if not value:
+        return None
+    if value in TYPE_LABELS:
+        return value
+    for place_type, label in TYPE_LABELS.items():
+        if value == label:
+            return place_type
+    raise ValueError(f"알 수 없는 장소 타입: {value}")
+
+
+async def _legacy_places() -> List[dict]:
+    try:
+        data = await async_redis_client.get(LEGACY_KEY)
+    except Exception as e:
+        logger.warning("인기 장소 Redis 조회 실패: %s", e)
+        return []
+    return json.loads(data) if data else []
+
+
+async def get_popular_places(db: AsyncSession, window: str = "7d", city: Optional[str] = None,
+                             place_type: Optional[str] = None, limit: int = 16) -> List[dict]:
+    """
+    최근 window 동안 일정에 많이 포함된 장소 (시간 감쇠 점수 순)
+    count는 감쇠 점수를 반올림한 값, 필터 없는 조회에서 실시간 카운터가 비어 있으면 cron 집계 사용
+    """
+    city_key = city_index.parse_city_query(city).get("city_key") if city else None
+    if city and city_key is None:
+        return []
+    cache_key = (window, city_key, place_type, limit)
+    cached = _cache.get(cache_key)
+    if cached is not None:
+        popular_cache_stats["hit"] += 1
+        return cached
+    popular_cache_stats["miss"] += 1
+
+    try:
+        ranked = await popularity.top(window, city_key, place_type, limit)
+    except Exception as e:
+        logger.warning("인기 장소 카운터 조회 실패: %s", e)
+        ranked = []
+
+    if ranked:
+        rows = (await db.execute(place_cards_query([pid for pid, _ in ranked]))).fetchall()
+        popular = to_cards([(pid, max(round(score), 1)) for pid, score in ranked], rows)
+    elif city_key is None and place_type is None:
+        popular = (await _legacy_places())[:limit]
+    else:
+        popular = []
+
+    _cache.set(cache_key, popular)
+    return popular
@@ -0,0 +1,108 @@
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import async_redis_client
+
+logger = logging.getLogger(__name__)
+
+# 실시간 인기 장소 카운터 (Redis sorted set, member=place_id, score=일정에 포함된 횟수)
+# 키: popular:{범위}:h:{YYYYMMDDHH} (시간 버킷), popular:{범위}:d:{YYYYMMDD} (일 버킷), UTC 기준
+# 범위: all, type:{placeType}, city:{city_key}, city:{city_key}:type:{placeType}
+KEY_PREFIX = "popular:"
+HOUR_BUCKET_TTL = 26 * 3600
+DAY_BUCKET_TTL = 31 * 24 * 3600
+WINDOW_KEY_TTL = 60
+
+# 조회 구간: (버킷 단위, 버킷 수, 반감기(버킷 수))
+# 최근 버킷일수록 가중치가 높도록 0.5 ** (경과 버킷 / 반감기) 로 합산
+WINDOWS = {
+    "24h": ("h", 24, 6),
+    "7d": ("d", 7, 2),
+    "30d": ("d", 30, 7),
+}
+PLACE_TYPES = ("destination", "meal", "accommodation")
+
+popularity_stats = {"recorded": 0, "failed": 0}
+
+
+def scope(city_key: Optional[str] = None, place_type: Optional[str] = None) -> str:
+    parts = []
+    if city_key:
+        parts.append(f"city:{city_key}")
+    if place_type:
+        parts.append(f"type:{place_type}")
+    return ":".join(parts) or "all"
+
+
+def _bucket_key(scope_name: str, unit: str, at: datetime) -> str:
+    suffix = at.strftime("%Y%m%d%H" if unit == "h" else "%Y%m%d")
+    return f"{KEY_PREFIX}{scope_name}:{unit}:{suffix}"
+
+
+def bucket_increments(rows: Iterable[dict], now: Optional[datetime] = None) -> Dict[str, Counter]:
+    """
+    ai_schedule_places 행 → {버킷 키: Counter(place_id → 증가량)}
+    한 배치에서 같은 장소가 여러 번 나와도 키당 ZINCRBY 한 번으로 합침
+    """
+    now = now or datetime.utcnow()
+    increments: Dict[str, Counter] = defaultdict(Counter)
+    for row in rows:
+        pid, place_type, city_key = row.get("place_id"), row.get("place_type"), row.get("city_key")
+        if not pid:
+            continue
+        scopes = {scope(), scope(place_type=place_type)}
+        if city_key:
+            scopes.update((scope(city_key), scope(city_key, place_type)))
+        for scope_name in scopes:
+            increments[_bucket_key(scope_name, "h", now)][pid] += 1
+            increments[_bucket_key(scope_name, "d", now)][pid] += 1
+    return increments
+
+
+def _bucket_ttl(key: str) -> int:
+    return HOUR_BUCKET_TTL if ":h:" in key else DAY_BUCKET_TTL
+
+
+async def record(rows: List[dict]):
+    """일정에 포함된 장소를 현재 시간/일 버킷에 더함 (파이프라인 한 번)"""
+    increments = bucket_increments(rows)
+    if not increments:
+        return
+    try:
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            for key, counts in increments.items():
+                for pid, count in counts.items():
+                    pipe.zincrby(key, count, pid)
+                pipe.expire(key, _bucket_ttl(key))
+            await pipe.execute()
+        popularity_stats["recorded"] += len(rows)
+    except Exception as e:
+        # 집계용이므로 Redis 장애 시 해당 배치만 버림 (DB의 ai_schedule_places는 별도로 저장됨)
+        popularity_stats["failed"] += len(rows)
+        logger.warning("인기 장소 카운터 갱신 실패 (%d건): %s", len(rows), e)
+
+
+def window_weights(scope_name: str, window: str, now: Optional[datetime] = None) -> Dict[str, float]:
+    """구간에 포함된 버킷 키 → 감쇠 가중치"""
+    unit, buckets, half_life = WINDOWS[window]
+    now = now or datetime.utcnow()
+    step = timedelta(hours=1) if unit == "h" else timedelta(days=1)
+    return {
+        _bucket_key(scope_name, unit, now - step * age): 0.5 ** (age / half_life)
+        for age in range(buckets)
+    }
+
+
+async def top(window: str = "7d", city_key: Optional[str] = None, place_type: Optional[str] = None,
+              limit: int = 16) -> List[Tuple[str, float]]:
+    """감쇠 가중 합산 점수 상위 limit개 [(place_id, score)]"""
+    scope_name = scope(city_key, place_type)
+    dest = f"{KEY_PREFIX}{scope_name}:win:{window}"
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        pipe.zunionstore(dest, window_weights(scope_name, window))
+        pipe.expire(dest, WINDOW_KEY_TTL)
+        pipe.zrevrange(dest, 0, limit - 1, withscores=True)
+        _, _, ranked = await pipe.execute()
+    return [(pid, float(score)) for pid, score in ranked]
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken이 없으면 글자 수 기반 근사치 사용 (count_tokens)
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# 엔드포인트별 프롬프트(사용자 메시지) 토큰 상한
+PROMPT_TOKEN_BUDGETS = {
+    "schedule": 1500,
+    "restaurant": 2000,
+}
+
+
+class HandleMap:
+    """
+    긴 Google place_id ↔ 프롬프트용 짧은 핸들(D1, M1 ...) 매핑
+    응답 파싱 후 resolve로 원래 place_id 복원
+    """
+
+    def __init__(self):
+        self._to_handle: Dict[str, str] = {}
+        self._to_place_id: Dict[str, str] = {}
+        self._counters: Dict[str, int] = {}
+
+    def add(self, place_id: str, prefix: str) -> str:
+        handle = self._to_handle.get(place_id)
+        if handle:
+            return handle
+        self._counters[prefix] = self._counters.get(prefix, 0) + 1
+        handle = f"{prefix}{self._counters[prefix]}"
+        self._to_handle[place_id] = handle
+        self._to_place_id[handle] = place_id
+        return handle
+
+    def resolve(self, value) -> Optional[str]:
+        """핸들 → place_id (모델이 원래 place_id를 그대로 적은 경우도 허용)"""
+        value = str(value or "").strip()
+        if value in self._to_place_id:
+            return self._to_place_id[value]
+        if value.upper() in self._to_place_id:
+            return self._to_place_id[value.upper()]
+        if value in self._to_handle:
+            return value
+        return None
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        value = round(value, 1)
+    if isinstance(value, (list, tuple)):
+        value = ",".join(str(v) for v in value)
+    # 구분자와 줄바꿈은 표 형식을 깨뜨리므로 치환
+    return str(value).replace("|", "/").replace("\n", " ").strip()
+
+
+def encode_table(rows: Sequence[dict], columns: Sequence[str], handles: HandleMap, prefix: str,
+                 id_key: str = "place_id") -> str:
+    """
+    후보 목록을 헤더 1줄 + 행당 1줄의 '|' 구분 표로 변환 (JSON 대비 키 반복이 없음)
+    예: id|name|food_type
+        M1|을지면옥|냉면
+    """
+    lines = ["|".join(["id", *columns])]
+    for row in rows:
+        handle = handles.add(str(row[id_key]), prefix)
+        lines.append("|".join([handle, *(_cell(row.get(c)) for c in columns)]))
+    return "\n".join(lines)
+
+
+# 모델 → tiktoken 인코딩 (시작 시 load_encodings로 채움, 로드 실패 시 None)
+_encodings: Dict[str, object] = {}
+
+
+def _load_encoding(model: str):
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # 인코딩 파일을 받지 못하는 환경(오프라인 등)에서는 근사치로 동작
+        logger.warning("tiktoken 인코딩 로드 실패(%s), 글자 수 기반 근사치 사용: %s", model, e)
+        return None
+
+
+async def load_encodings(models: Iterable[str]):
+    """
+    인코딩 파일은 처음 쓸 때 네트워크로 받으므로(TIKTOKEN_CACHE_DIR에 캐시) 시작 시 스레드에서 미리 로드
+    요청 경로(count_tokens)에서는 로드하지 않음
+    """
+    for model in models:
+        if model not in _encodings:
+            _encodings[model] = await asyncio.to_thread(_load_encoding, model)
+
+
+def count_tokens(text: str, model: str) -> int:
+    encoding = _encodings.get(model)
+    if encoding is None:
+        # 한글 위주 프롬프트 기준 대략 2글자당 1토큰
+        return math.ceil(len(text) / 2)
+    return len(encoding.encode(text))
+
+
+def fit_rows(build: Callable[[List[dict]], str], rows: List[dict], endpoint: str, model: str,
+             min_rows: int = 1) -> str:
+    """
+    build(rows)로 만든 프롬프트가 엔드포인트 토큰 상한을 넘으면 뒤쪽(우선순위 낮은) 후보부터 줄임
+    rows는 우선순위 순으로 정렬되어 있어야 함
+    """
+    budget = PROMPT_TOKEN_BUDGETS.get(endpoint)
+    prompt = build(rows)
+    if budget is None or count_tokens(prompt, model) <= budget:
+        return prompt
+
+    # 상한 안에 들어가는 최대 후보 수를 이분 탐색
+    lo, hi = min(min_rows, len(rows)), len(rows)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(build(rows[:mid]), model) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    logger.info("[%s] 프롬프트 토큰 상한(%d) 초과로 후보 %d → %d개", endpoint, budget, len(rows), lo)
+    return build(rows[:lo])
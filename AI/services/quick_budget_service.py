@@ -1,27 +1,22 @@
 from datetime import datetime, date
 from typing import List
-import json
 import logging
 
-from sqlalchemy.orm import Session
-from openai import OpenAI
+from sqlalchemy.ext.asyncio import AsyncSession
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import settings 
+from services import llm_cache, llm_json, singleflight
 
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-# OpenAI 클라이언트 초기화
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
-
-def ask_gpt_budget_comment(total_cost: int, end_city: str, days: int, num_people: int) -> str:
+async def ask_gpt_budget_comment(total_cost: int, end_city: str, days: int, num_people: int) -> str:
     prompt = f"""
 {end_city}에서 {days}일간 {num_people}명이 여행할 때 예상 총 비용은 약 {total_cost:,}원입니다.
 숙소비를 제외한 식비, 입장료 및 체험비, 그리고 지역 내 대중교통비만 포함한 비용입니다.
@@ -35,7 +30,8 @@ def ask_gpt_budget_comment(total_cost: int, end_city: str, days: int, num_people
 """
 
     try:
-        response = client.chat.completions.create(
+        return await llm_cache.cached_chat_text(
+            "budget_comment",
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": "여행 예산 평가 도우미"},
@@ -44,19 +40,18 @@ def ask_gpt_budget_comment(total_cost: int, end_city: str, days: int, num_people
             temperature=0.5,
             max_tokens=150
         )
-        return response.choices[0].message.content.strip()
     except Exception:
         logger.exception("GPT 코멘트 생성 실패")
         return "예산에 대한 평가를 불러오는 데 실패했습니다."
 
 
-def quick_budget(
+async def quick_budget(
     start_city: str,
     end_city: str,
     start_date: date,
     end_date: date,
     num_people: int,
-    db: Session
+    db: AsyncSession
 ) -> dict:
     days = (end_date - start_date).days + 1  # 여행 기간 계산 (포함)
 
@@ -70,33 +65,32 @@ def quick_budget(
 {{"food": 10000, "entry": 12000, "transport": 7000}}
 """
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "너는 똑똑한 여행 비용 추정 도우미야. 정확하고 간결하게 응답해줘."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=150
-        )
-
-        raw_content = response.choices[0].message.content.strip()
+    params = dict(
+        model="gpt-4o",
+        messages=[
+            {"role": "system", "content": "너는 똑똑한 여행 비용 추정 도우미야. 정확하고 간결하게 응답해줘."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.3,
+        max_tokens=150,
+        response_format=llm_json.JSON_MODE
+    )
 
-        # 코드블록 제거 처리
-        if raw_content.startswith("```json"):
-            raw_content = raw_content[len("```json"):].strip()
-        if raw_content.endswith("```"):
-            raw_content = raw_content[:-3].strip()
-
-        cost_json = json.loads(raw_content)
+    try:
+        raw_content = await singleflight.do("quick_budget", singleflight.prompt_key("quick_budget", params),
+                                            lambda: llm_cache.cached_chat_text("quick_budget", **params))
+        try:
+            cost_json = llm_json.parse_llm_json(raw_content, "quick_budget")
+        except llm_json.LLMJSONError:
+            await llm_cache.invalidate("quick_budget", **params)
+            raise
 
         food_cost = cost_json["food"] * num_people * days
         entry_fees = cost_json["entry"] * num_people * days
         transport_cost = cost_json["transport"] * num_people * days
         total_cost = food_cost + entry_fees + transport_cost
 
-        comment = ask_gpt_budget_comment(total_cost, end_city, days=days, num_people=num_people)
+        comment = await ask_gpt_budget_comment(total_cost, end_city, days=days, num_people=num_people)
 
         return {
             "food_cost": food_cost,
@@ -106,8 +100,8 @@ def quick_budget(
             "comment": comment
         }
 
-    except json.JSONDecodeError:
-        logger.error("GPT 응답 JSON 파싱 실패: %s", response.choices[0].message.content)
+    except llm_json.LLMJSONError:
+        # 응답 내용은 llm_json에서 로깅
         raise
     except Exception:
         logger.exception("GPT quick budget 실패")
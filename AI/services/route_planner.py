@@ -0,0 +1,177 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from services.geo_index import haversine_km
+
+# 하루 일정 슬롯 (시간, 장소 타입) - 마지막 날은 숙소 제외
+DAY_SLOTS = [
+    ("09:00", "destination"),
+    ("12:00", "meal"),
+    ("15:00", "destination"),
+    ("18:00", "meal"),
+    ("21:00", "accommodation"),
+]
+
+
+def distance_matrix(points: List[Tuple[float, float]]) -> np.ndarray:
+    """[(lat, lon), ...] → 모든 쌍의 거리(km) 행렬"""
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    lats, lons = coords[:, 0], coords[:, 1]
+    return haversine_km(lats[:, None], lons[:, None], lats[None, :], lons[None, :])
+
+
+def path_length(route: List[int], dist: np.ndarray) -> float:
+    if len(route) < 2:
+        return 0.0
+    route = np.asarray(route)
+    return float(dist[route[:-1], route[1:]].sum())
+
+
+def nearest_neighbor(dist: np.ndarray, start: int = 0) -> List[int]:
+    n = len(dist)
+    route = [start]
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, dist[route[-1]])
+        nxt = int(np.argmin(row))
+        route.append(nxt)
+        visited[nxt] = True
+    return route
+
+
+def two_opt(route: List[int], dist: np.ndarray) -> List[int]:
+    """시작점을 고정한 열린 경로에 대한 2-opt 개선"""
+    route = list(route)
+    n = len(route)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n - 1):
+            for j in range(i + 1, n):
+                a, b, c = route[i - 1], route[i], route[j]
+                delta = dist[a, c] - dist[a, b]
+                if j + 1 < n:
+                    d = route[j + 1]
+                    delta += dist[b, d] - dist[c, d]
+                if delta < -1e-9:
+                    route[i:j + 1] = reversed(route[i:j + 1])
+                    improved = True
+    return route
+
+
+def order_points(points: List[Tuple[float, float]], start: Optional[Tuple[float, float]] = None) -> List[int]:
+    """
+    최근접 이웃 + 2-opt로 방문 순서를 정함
+    start가 있으면 (전날 숙소 등) 그 지점에서 출발하는 경로로 계산
+    반환: points의 인덱스 순서
+    """
+    if len(points) < 2:
+        return list(range(len(points)))
+    nodes = ([start] if start else []) + list(points)
+    dist = distance_matrix(nodes)
+    route = two_opt(nearest_neighbor(dist), dist)
+    if start:
+        return [i - 1 for i in route[1:]]
+    return route
+
+
+def _slot_length(slotted: List[dict], start: Optional[Tuple[float, float]]) -> float:
+    points = ([start] if start else []) + [(item["latitude"], item["longitude"]) for item in slotted]
+    if len(points) < 2:
+        return 0.0
+    return path_length(list(range(len(points))), distance_matrix(points))
+
+
+def _improve_same_type(slotted: List[dict], start: Optional[Tuple[float, float]]) -> List[dict]:
+    """같은 타입끼리 슬롯을 맞바꿔 총 이동거리가 줄면 반영"""
+    best = _slot_length(slotted, start)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(len(slotted)):
+            for j in range(i + 1, len(slotted)):
+                if slotted[i]["placeType"] != slotted[j]["placeType"]:
+                    continue
+                slotted[i], slotted[j] = slotted[j], slotted[i]
+                length = _slot_length(slotted, start)
+                if length < best - 1e-9:
+                    best = length
+                    improved = True
+                else:
+                    slotted[i], slotted[j] = slotted[j], slotted[i]
+    return slotted
+
+
+def plan_day(items: List[dict], start: Optional[Tuple[float, float]], is_last_day: bool) -> List[dict]:
+    """
+    LLM이 고른 하루치 장소를 이동거리 기준으로 정렬한 뒤 고정 슬롯(09/12/15/18/21시)에 배치
+    items: clean_schedule 결과 (latitude/longitude/placeType 포함)
+    """
+    order = order_points([(item["latitude"], item["longitude"]) for item in items], start)
+    ordered = [items[i] for i in order]
+
+    slots = DAY_SLOTS[:-1] if is_last_day else DAY_SLOTS
+    used = set()
+    slotted, times = [], []
+    for slot_time, place_type in slots:
+        # 경로 순서상 가장 앞에 있는 해당 타입 장소를 슬롯에 배치
+        idx = next((i for i, it in enumerate(ordered)
+                    if i not in used and it["placeType"] == place_type), None)
+        if idx is None:
+            continue
+        used.add(idx)
+        slotted.append(ordered[idx])
+        times.append(slot_time)
+
+    slotted = _improve_same_type(slotted, start)
+    for item, slot_time in zip(slotted, times):
+        item["time"] = slot_time
+    return slotted
+
+
+class ItineraryBuilder:
+    """
+    일자별로 장소가 들어오는 대로 배치 (스트리밍 응답에서도 사용)
+    다음 날은 전날 숙소에서 출발하도록 계산
+    """
+
+    def __init__(self):
+        self.seen = set()
+        self.start: Optional[Tuple[float, float]] = None
+
+    def add_day(self, day: int, items: List[dict], is_last_day: bool) -> Optional[dict]:
+        # 중복 장소는 처음 나온 곳만 유지 (숙소는 연박 가능)
+        unique, day_ids = [], set()
+        for item in items:
+            if item["placeId"] in self.seen or item["placeId"] in day_ids:
+                continue
+            day_ids.add(item["placeId"])
+            unique.append(item)
+        schedule = plan_day(unique, self.start, is_last_day)
+        if not schedule:
+            return None
+        self.seen.update(item["placeId"] for item in schedule if item["placeType"] != "accommodation")
+        lodging = next((item for item in schedule if item["placeType"] == "accommodation"), None)
+        if lodging:
+            self.start = (lodging["latitude"], lodging["longitude"])
+        return {"day": day, "schedule": schedule}
+
+
+def plan_schedule(plans: List[dict], trip_days: Optional[int] = None) -> List[dict]:
+    """
+    일자별로 순서/시간을 정함
+    마지막 날 판단은 스트리밍 응답과 같은 규칙 (day >= trip_days, 일자가 없으면 순서로)
+    trip_days가 없으면 받은 일자 수를 여행 일수로 봄
+    """
+    plans = sorted(plans, key=lambda d: d.get("day") or 0)
+    trip_days = trip_days or len(plans)
+    builder = ItineraryBuilder()
+    result = []
+    for idx, day in enumerate(plans):
+        day_num = day.get("day") or idx + 1
+        planned = builder.add_day(day_num, day["schedule"], is_last_day=day_num >= trip_days)
+        if planned:
+            result.append(planned)
+    return result
@@ -0,0 +1,274 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import List, Optional
+
+from prometheus_client import Gauge, Histogram
+
+import metrics
+import schemas
+from config import settings, async_redis_client
+from database import AsyncSessionLocal
+from services import schedule_service
+
+logger = logging.getLogger(__name__)
+
+# 대기 중인 job_id 목록 (LPUSH로 넣고 BLMOVE로 꺼냄 → FIFO)
+QUEUE_KEY = "schedule_jobs:queue"
+# 워커별 처리 중 목록: BLMOVE로 대기열에서 원자적으로 옮기고 끝나면 LREM
+# 워커 프로세스가 죽어도 작업이 남아 있어 다른 프로세스가 대기열로 되돌림
+PROCESSING_PREFIX = "schedule_jobs:processing:"
+# 처리 중 목록 키 전체 (회수 대상 탐색용 SET)
+PROCESSING_SET_KEY = "schedule_jobs:processing"
+# 프로세스 생존 표시 (SCHEDULE_JOB_HEARTBEAT_TTL 동안 갱신 없으면 죽은 것으로 봄)
+ALIVE_PREFIX = "schedule_jobs:alive:"
+
+# 재시작해도 겹치지 않도록 프로세스마다 새로 만듦
+PROCESS_ID = uuid.uuid4().hex[:12]
+
+JOB_QUEUE_DEPTH = Gauge("t4p_schedule_job_queue_depth", "대기 중인 일정 생성 작업 수 (마지막 관측값)")
+JOB_RUNNING = Gauge("t4p_schedule_jobs_running", "이 프로세스에서 처리 중인 일정 생성 작업 수")
+JOB_WAIT_SECONDS = Histogram(
+    "t4p_schedule_job_wait_seconds", "작업 등록부터 워커가 꺼낼 때까지 대기 시간", buckets=metrics.LATENCY_BUCKETS,
+)
+JOB_RUN_SECONDS = Histogram(
+    "t4p_schedule_job_run_seconds", "작업 처리 시간", ["status"], buckets=metrics.LATENCY_BUCKETS,
+)
+
+job_stats = {"enqueued": 0, "rejected": 0, "done": 0, "failed": 0, "requeued": 0, "reaped": 0}
+
+_tasks: List[asyncio.Task] = []
+_heartbeat_task: Optional[asyncio.Task] = None
+_processing_keys: List[str] = []
+_stopping: Optional[asyncio.Event] = None
+
+
+class QueueFullError(Exception):
+    pass
+
+
+def job_key(job_id: str) -> str:
+    return f"schedule_job:{job_id}"
+
+
+async def enqueue(schedule: schemas.ScheduleCreate, user_id: Optional[int]) -> dict:
+    """작업을 Redis에 등록하고 바로 반환 (대기열이 상한을 넘으면 QueueFullError)"""
+    depth = await async_redis_client.llen(QUEUE_KEY)
+    JOB_QUEUE_DEPTH.set(depth)
+    if depth >= settings.SCHEDULE_JOB_MAX_QUEUE:
+        job_stats["rejected"] += 1
+        raise QueueFullError(f"일정 생성 대기열이 가득 찼습니다 ({depth}건)")
+
+    job_id = uuid.uuid4().hex
+    async with async_redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(job_key(job_id), mapping={
+            "status": "queued",
+            "payload": schedule.json(),
+            "user_id": "" if user_id is None else str(user_id),
+            "created_at": f"{time.time():.3f}",
+        })
+        pipe.expire(job_key(job_id), settings.SCHEDULE_JOB_TTL)
+        pipe.lpush(QUEUE_KEY, job_id)
+        _, _, depth = await pipe.execute()
+    JOB_QUEUE_DEPTH.set(depth)
+    job_stats["enqueued"] += 1
+    return {"jobId": job_id, "status": "queued", "queueDepth": depth}
+
+
+async def get_job(job_id: str) -> Optional[dict]:
+    """작업 상태 조회 (없거나 TTL이 지났으면 None)"""
+    raw = await async_redis_client.hgetall(job_key(job_id))
+    if not raw:
+        return None
+    return {
+        "jobId": job_id,
+        "status": raw["status"],
+        "userId": int(raw["user_id"]) if raw.get("user_id") else None,
+        "result": json.loads(raw["result"]) if raw.get("result") else None,
+        "error": raw.get("error"),
+    }
+
+
+async def wait_job(job_id: str, timeout: float) -> Optional[dict]:
+    """완료(done/failed)되거나 timeout이 지날 때까지 폴링 (롱 폴링용)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = await get_job(job_id)
+        if job is None or job["status"] in ("done", "failed") or time.monotonic() >= deadline:
+            return job
+        await asyncio.sleep(settings.SCHEDULE_JOB_POLL_INTERVAL)
+
+
+def processing_key(worker: int) -> str:
+    return f"{PROCESSING_PREFIX}{PROCESS_ID}:{worker}"
+
+
+async def _finish(job_id: str, processing: str, status: str, **fields):
+    # 결과 저장과 처리 중 목록에서 제거를 한 트랜잭션으로
+    async with async_redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(job_key(job_id), mapping={"status": status, "finished_at": f"{time.time():.3f}", **fields})
+        pipe.expire(job_key(job_id), settings.SCHEDULE_JOB_TTL)
+        pipe.lrem(processing, 1, job_id)
+        await pipe.execute()
+
+
+async def _process(job_id: str, processing: str):
+    raw = await async_redis_client.hgetall(job_key(job_id))
+    if not raw or raw.get("status") != "queued":
+        # TTL 만료 또는 다른 워커가 이미 처리
+        await async_redis_client.lrem(processing, 1, job_id)
+        return
+    JOB_WAIT_SECONDS.observe(max(time.time() - float(raw["created_at"]), 0))
+    await async_redis_client.hset(job_key(job_id), mapping={"status": "running", "started_at": f"{time.time():.3f}"})
+
+    schedule = schemas.ScheduleCreate.parse_raw(raw["payload"])
+    user_id = int(raw["user_id"]) if raw.get("user_id") else None
+    # 종료 중 취소/워커 장애로 다시 들어온 작업이면 이전 시도가 저장한 일정을 이어서 사용 (중복 저장 방지)
+    schedule_id = int(raw["schedule_id"]) if raw.get("schedule_id") else None
+
+    async def remember_schedule(new_id: int):
+        await async_redis_client.hset(job_key(job_id), "schedule_id", str(new_id))
+
+    started = time.perf_counter()
+    status = "failed"
+    JOB_RUNNING.inc()
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await asyncio.wait_for(
+                schedule_service.create_ai_schedule(
+                    db, schedule, user_id, schedule_id=schedule_id, on_created=remember_schedule,
+                ),
+                timeout=settings.SCHEDULE_JOB_TIMEOUT,
+            )
+        await _finish(job_id, processing, "done", result=result.json(by_alias=True))
+        status = "done"
+    except asyncio.CancelledError:
+        # 종료 중 취소된 작업은 대기열 맨 앞으로 되돌려 다른 워커/재시작 후 처리
+        status = "requeued"
+        async with async_redis_client.pipeline(transaction=True) as pipe:
+            pipe.hset(job_key(job_id), "status", "queued")
+            pipe.lrem(processing, 1, job_id)
+            pipe.rpush(QUEUE_KEY, job_id)
+            await pipe.execute()
+        raise
+    except asyncio.TimeoutError:
+        await _finish(job_id, processing, "failed",
+                      error=f"AI 일정 생성 시간 초과 ({settings.SCHEDULE_JOB_TIMEOUT:.0f}초)")
+    except Exception as e:
+        logger.exception("일정 생성 작업 실패 (%s)", job_id)
+        await _finish(job_id, processing, "failed", error=f"AI 호출 또는 저장 실패: {str(e)}")
+    finally:
+        JOB_RUNNING.dec()
+        job_stats[status] += 1
+        JOB_RUN_SECONDS.labels(status).observe(time.perf_counter() - started)
+
+
+async def _worker(stopping: asyncio.Event, processing: str):
+    while not stopping.is_set():
+        try:
+            job_id = await async_redis_client.blmove(QUEUE_KEY, processing, 1, "RIGHT", "LEFT")
+            if job_id is None:
+                continue
+            JOB_QUEUE_DEPTH.set(await async_redis_client.llen(QUEUE_KEY))
+            await _process(job_id, processing)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Redis 장애 등: 잠시 쉬고 재시도
+            logger.exception("일정 생성 워커 오류")
+            await asyncio.sleep(1)
+
+
+async def requeue_processing(key: str) -> int:
+    """처리 중 목록에 남은 작업을 대기열 맨 앞으로 되돌림 (반환: 되돌린 수)"""
+    job_ids = await async_redis_client.lrange(key, 0, -1)
+    # 대기열에 들어가기 전에 상태를 먼저 queued로 (running인 채로 꺼내면 _process가 건너뜀)
+    for job_id in job_ids:
+        status = await async_redis_client.hget(job_key(job_id), "status")
+        if status in ("queued", "running"):
+            await async_redis_client.hset(job_key(job_id), "status", "queued")
+    moved = 0
+    # LMOVE는 원자적이므로 여러 프로세스가 동시에 회수해도 작업이 중복되지 않음
+    while await async_redis_client.lmove(key, QUEUE_KEY, "RIGHT", "RIGHT") is not None:
+        moved += 1
+    await async_redis_client.srem(PROCESSING_SET_KEY, key)
+    return moved
+
+
+async def reap_dead_workers() -> int:
+    """생존 표시가 끊긴 프로세스의 처리 중 작업을 대기열로 되돌림"""
+    reaped = 0
+    for key in await async_redis_client.smembers(PROCESSING_SET_KEY):
+        process_id = key[len(PROCESSING_PREFIX):].rsplit(":", 1)[0]
+        if process_id == PROCESS_ID or await async_redis_client.exists(f"{ALIVE_PREFIX}{process_id}"):
+            continue
+        moved = await requeue_processing(key)
+        if moved:
+            logger.warning("응답 없는 워커(%s)의 일정 생성 작업 %d건을 대기열로 복귀", process_id, moved)
+        reaped += moved
+    job_stats["reaped"] += reaped
+    return reaped
+
+
+async def _heartbeat(stopping: asyncio.Event):
+    """생존 표시 갱신 + 죽은 워커 작업 회수 (TTL의 1/3 주기)"""
+    interval = settings.SCHEDULE_JOB_HEARTBEAT_TTL / 3
+    while not stopping.is_set():
+        try:
+            await async_redis_client.set(f"{ALIVE_PREFIX}{PROCESS_ID}", "1", ex=settings.SCHEDULE_JOB_HEARTBEAT_TTL)
+            await reap_dead_workers()
+        except Exception:
+            logger.exception("일정 생성 워커 heartbeat 오류")
+        try:
+            await asyncio.wait_for(stopping.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def start(workers: Optional[int] = None):
+    """워커 workers개 시작 (기본 SCHEDULE_JOB_WORKERS, 0이면 이 프로세스에서는 처리하지 않음)"""
+    global _stopping, _heartbeat_task
+    workers = settings.SCHEDULE_JOB_WORKERS if workers is None else workers
+    if _tasks or workers <= 0:
+        return
+    _stopping = asyncio.Event()
+    _processing_keys[:] = [processing_key(n) for n in range(workers)]
+    # 워커가 작업을 꺼내기 전에 생존 표시/회수 대상 등록
+    await async_redis_client.set(f"{ALIVE_PREFIX}{PROCESS_ID}", "1", ex=settings.SCHEDULE_JOB_HEARTBEAT_TTL)
+    await async_redis_client.sadd(PROCESSING_SET_KEY, *_processing_keys)
+    _heartbeat_task = asyncio.create_task(_heartbeat(_stopping))
+    _tasks.extend(asyncio.create_task(_worker(_stopping, key)) for key in _processing_keys)
+
+
+async def stop():
+    """새 작업을 그만 꺼내고 처리 중인 작업은 유예 시간만큼 기다린 뒤 취소 (취소된 작업은 대기열로 복귀)"""
+    global _heartbeat_task
+    if not _tasks:
+        return
+    _stopping.set()
+    _, pending = await asyncio.wait(_tasks, timeout=settings.SCHEDULE_JOB_SHUTDOWN_GRACE)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
+    await asyncio.gather(_heartbeat_task, return_exceptions=True)
+    _heartbeat_task = None
+    try:
+        # BLMOVE 직후 취소되어 처리 중 목록에만 남은 작업도 되돌림
+        for key in _processing_keys:
+            await requeue_processing(key)
+        await async_redis_client.delete(f"{ALIVE_PREFIX}{PROCESS_ID}")
+    except Exception:
+        logger.exception("일정 생성 처리 중 목록 정리 실패 (다른 프로세스가 heartbeat 만료 후 회수)")
+    _processing_keys.clear()
+
+
+async def run_forever(workers: Optional[int] = None):
+    """전용 워커 프로세스용 (scripts/schedule_worker.py)"""
+    await start(workers)
+    try:
+        await asyncio.gather(*_tasks)
+    finally:
+        await stop()
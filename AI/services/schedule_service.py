@@ -0,0 +1,121 @@
+import json
+from typing import Awaitable, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import crud
+import models
+import schemas
+from services.gpt_service import get_ai_schedule
+
+
+def plans_as_list(plans_raw) -> List[dict]:
+    """{"day1": {...}, "day2": {...}} 또는 [...] 형식의 plans → day 순으로 정렬된 리스트"""
+    if isinstance(plans_raw, list):
+        plans = plans_raw
+    elif isinstance(plans_raw, dict):
+        plans = []
+        for day_key, day in plans_raw.items():
+            try:
+                day_num = int(''.join(filter(str.isdigit, day_key)))
+            except Exception:
+                day_num = 1
+            plans.append({
+                "day": day_num,
+                "schedule": day.get("schedule", []) if isinstance(day, dict) else []
+            })
+        plans.sort(key=lambda x: x["day"])
+    else:
+        plans = []
+
+    if not plans or all(len(day.get("schedule", [])) == 0 for day in plans):
+        plans = [{"day": 1, "schedule": []}]
+    return plans
+
+
+async def create_ai_schedule(db: AsyncSession, schedule: schemas.ScheduleCreate, user_id: Optional[int],
+                             timings: Optional[dict] = None, schedule_id: Optional[int] = None,
+                             on_created: Optional[Callable[[int], Awaitable]] = None) -> schemas.ScheduleResponse:
+    """
+    기본 일정 저장 → AI 일정 생성 → AI 결과로 갱신
+    /ai/schedule(동기 응답)과 schedule_jobs 워커(백그라운드)가 같이 사용
+    schedule_id: 이전 시도에서 이미 저장한 기본 일정 (재시도 시 새로 만들지 않음)
+    on_created: 기본 일정 저장 직후 id로 호출 (재시도용 기록)
+    """
+    # 1) DB에 기본 일정 데이터 저장 (AI 코멘트 제외)
+    new_schedule = await db.get(models.Schedule, schedule_id) if schedule_id is not None else None
+    if new_schedule is None:
+        new_schedule = await crud.create_schedule(db, schedule, user_id)
+        if on_created is not None:
+            await on_created(new_schedule.id)
+
+    # 2) 저장된 기본 일정 schedule_json 파싱
+    base_schedule_json = new_schedule.schedule_json
+    if isinstance(base_schedule_json, str):
+        base_schedule_data = json.loads(base_schedule_json)
+    elif isinstance(base_schedule_json, dict):
+        base_schedule_data = base_schedule_json
+    else:
+        raise ValueError("schedule_json 필드가 올바른 형식이 아님")
+
+    base_plans_list = plans_as_list(base_schedule_data.get("plans", None) or {})
+
+    # 3) AI 호출
+    ai_response = await get_ai_schedule(
+        db=db,
+        end_city=schedule.endCity,
+        start_date=schedule.startDate,
+        end_date=schedule.endDate,
+        emotions=schedule.emotions,
+        companions=schedule.companions or [],
+        peopleCount=schedule.peopleCount,
+        timings=timings if timings is not None else {}
+    )
+
+    if isinstance(ai_response, str):
+        ai_response_data = json.loads(ai_response)
+    elif hasattr(ai_response, "dict"):
+        ai_response_data = ai_response.dict()
+    else:
+        ai_response_data = ai_response
+
+    ai_plans_list = plans_as_list(ai_response_data.get("plans", {}) or {})
+
+    # 4) aiComment 붙이기 (base_plans_list 안에 aiComment 추가)
+    for base_day in base_plans_list:
+        day_num = base_day["day"]
+        ai_day = next((d for d in ai_plans_list if d["day"] == day_num), None)
+        if ai_day:
+            for idx, base_place in enumerate(base_day["schedule"]):
+                if idx < len(ai_day["schedule"]):
+                    ai_comment = ai_day["schedule"][idx].get("aiComment", "")
+                    base_place["aiComment"] = ai_comment
+
+    # 5) AI plans를 DB에 저장할 형식으로 변환 (dict로 day1, day2 ...)
+    plans_to_save = {}
+    for day in ai_plans_list:
+        day_key = f"day{day['day']}"
+        plans_to_save[day_key] = day
+
+    # 6) GPT 응답에서 받은 aiEmpathy와 tags도 저장
+    update_data = {
+        "schedule_json": {
+            "plans": plans_to_save
+        },
+        "aiEmpathy": ai_response_data.get("aiEmpathy", ""),
+        "tags": ai_response_data.get("tags", [])
+    }
+
+    await crud.update_schedule(db, new_schedule.id, user_id, update_data)
+
+    # 7) 최종 응답을 위한 dict → list 변환
+    plans_list_for_response = []
+    for day_key in sorted(plans_to_save.keys(), key=lambda x: int(''.join(filter(str.isdigit, x)))):
+        plans_list_for_response.append(plans_to_save[day_key])
+
+    # 8) 최종 응답 생성
+    return schemas.ScheduleResponse(
+        aiEmpathy=ai_response_data.get("aiEmpathy", ""),
+        tags=ai_response_data.get("tags", []),
+        plans=plans_list_for_response
+    )
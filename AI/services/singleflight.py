@@ -0,0 +1,124 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Awaitable, Callable, Dict
+
+from prometheus_client import Counter
+
+from config import settings, async_redis_client
+from services import llm_cache
+
+logger = logging.getLogger(__name__)
+
+# 동일 요청 합치기 결과
+# leader: 실제로 호출, shared_local: 같은 프로세스의 진행 중 호출 결과를 공유,
+# shared_remote: 다른 워커(프로세스)의 결과를 Redis로 받음, fallback: 대기 실패로 직접 호출
+# shared_local + shared_remote 가 절약된 업스트림 호출 수
+SINGLEFLIGHT_CALLS = Counter(
+    "t4p_singleflight_calls", "동일 요청 합치기(singleflight) 결과", ["endpoint", "result"],
+)
+
+LOCK_PREFIX = "singleflight:lock:"
+RESULT_PREFIX = "singleflight:result:"
+
+# 프로세스 내 진행 중 호출: key → 호출 태스크
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+def prompt_key(endpoint: str, params: dict) -> str:
+    """
+    LLM 호출 파라미터(프롬프트 지문) 기준 합치기 키
+    후보 목록과 핸들(D1/M1...) 배정까지 같은 요청끼리만 결과를 공유 (요청 필드가 같아도 후보가 다르면 별도 호출)
+    """
+    return f"{endpoint}:{llm_cache.make_cache_key(params)}"
+
+
+async def _wait_remote(key: str):
+    """다른 워커가 잡은 락이 풀리거나 결과가 올라올 때까지 대기 (결과가 없으면 None)"""
+    deadline = time.monotonic() + settings.SINGLEFLIGHT_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            pipe.get(RESULT_PREFIX + key)
+            pipe.exists(LOCK_PREFIX + key)
+            result, locked = await pipe.execute()
+        if result is not None:
+            return json.loads(result)
+        if not locked:
+            # 리더가 실패했거나 결과 보관 시간이 지남
+            return None
+        await asyncio.sleep(settings.SINGLEFLIGHT_POLL_INTERVAL)
+    return None
+
+
+async def _lead(endpoint: str, key: str, fn: Callable[[], Awaitable]):
+    """Redis 락을 잡으면 직접 호출 후 결과 공유, 못 잡으면 다른 워커의 결과를 기다림"""
+    token = uuid.uuid4().hex
+    try:
+        acquired = await async_redis_client.set(
+            LOCK_PREFIX + key, token, nx=True, px=int(settings.SINGLEFLIGHT_LOCK_TTL * 1000),
+        )
+    except Exception as e:
+        # Redis 장애 시 프로세스 내 합치기만 동작
+        logger.warning("singleflight Redis 락 실패: %s", e)
+        SINGLEFLIGHT_CALLS.labels(endpoint, "leader").inc()
+        return await fn()
+
+    if not acquired:
+        try:
+            result = await _wait_remote(key)
+        except Exception as e:
+            logger.warning("singleflight Redis 결과 대기 실패: %s", e)
+            result = None
+        if result is not None:
+            SINGLEFLIGHT_CALLS.labels(endpoint, "shared_remote").inc()
+            return result
+        SINGLEFLIGHT_CALLS.labels(endpoint, "fallback").inc()
+        return await fn()
+
+    SINGLEFLIGHT_CALLS.labels(endpoint, "leader").inc()
+    try:
+        result = await fn()
+        try:
+            await async_redis_client.set(
+                RESULT_PREFIX + key, json.dumps(result, ensure_ascii=False), ex=settings.SINGLEFLIGHT_RESULT_TTL,
+            )
+        except Exception as e:
+            logger.warning("singleflight 결과 저장 실패: %s", e)
+        return result
+    finally:
+        try:
+            # 락 TTL이 지나 다른 워커가 새로 잡은 락은 지우지 않음
+            if await async_redis_client.get(LOCK_PREFIX + key) == token:
+                await async_redis_client.delete(LOCK_PREFIX + key)
+        except Exception as e:
+            logger.warning("singleflight 락 해제 실패: %s", e)
+
+
+def _forget(key: str, task: asyncio.Task):
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    # 기다리던 요청이 모두 취소된 경우 "exception was never retrieved" 경고 방지
+    if not task.cancelled():
+        task.exception()
+
+
+async def do(endpoint: str, key: str, fn: Callable[[], Awaitable]):
+    """
+    같은 key의 호출이 진행 중이면 새로 호출하지 않고 그 결과를 같이 받음
+    fn의 결과는 워커 간 공유를 위해 JSON 직렬화 가능해야 함 (LLM 응답 텍스트 등)
+    리더 호출이 실패하면 같은 프로세스에서 기다리던 요청도 같은 예외를 받음
+    """
+    if not settings.SINGLEFLIGHT_ENABLED:
+        return await fn()
+
+    task = _inflight.get(key)
+    if task is not None:
+        SINGLEFLIGHT_CALLS.labels(endpoint, "shared_local").inc()
+    else:
+        # 처음 요청한 쪽이 끊겨도 기다리는 요청을 위해 호출은 별도 태스크로 계속 진행
+        task = asyncio.create_task(_lead(endpoint, key, fn))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _forget(key, t))
+    return await asyncio.shield(task)
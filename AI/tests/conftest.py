@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# 루트 경로 추가 (프로젝트 최상위)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# 테스트는 실제 DB 대신 임시 SQLite 샘플 DB 사용 (config가 import 시 DATABASE_URL을 요구함)
+DB_PATH = os.path.join(tempfile.gettempdir(), "t4p_test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["DATABASE_URL_ASYNC"] = f"sqlite+aiosqlite:///{DB_PATH}"
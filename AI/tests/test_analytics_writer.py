@@ -0,0 +1,26 @@
+import asyncio
+
+from services import analytics_writer
+
+
+def test_stop_keeps_batch_being_written(monkeypatch):
+    written = []
+
+    async def slow_write(rows):
+        # 종료 신호가 저장 도중에 도착하도록 지연
+        await asyncio.sleep(0.05)
+        written.extend(rows)
+
+    monkeypatch.setattr(analytics_writer, "_write_batch", slow_write)
+    monkeypatch.setattr(analytics_writer.settings, "ANALYTICS_FLUSH_INTERVAL", 0)
+    monkeypatch.setattr(analytics_writer, "_queue", None)
+
+    async def scenario():
+        await analytics_writer.start()
+        analytics_writer.enqueue([{"schedule_id": 1, "place_id": "A", "place_type": "meal"}])
+        await asyncio.sleep(0.01)
+        analytics_writer.enqueue([{"schedule_id": 1, "place_id": "B", "place_type": "meal"}])
+        await analytics_writer.stop()
+
+    asyncio.run(scenario())
+    assert [row["place_id"] for row in written] == ["A", "B"]
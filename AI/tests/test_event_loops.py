@@ -0,0 +1,24 @@
+import asyncio
+
+from services import http_client, llm_gateway
+
+
+async def contend(get_semaphore):
+    # 슬롯보다 많은 태스크가 기다려야 세마포어가 루프에 묶임
+    semaphore = get_semaphore()
+
+    async def hold():
+        async with semaphore:
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(hold() for _ in range(semaphore._value + 2)))
+
+
+def test_llm_semaphore_survives_multiple_event_loops():
+    for _ in range(2):
+        asyncio.run(contend(llm_gateway._get_semaphore))
+
+
+def test_upstream_semaphore_survives_multiple_event_loops():
+    for _ in range(2):
+        asyncio.run(contend(lambda: http_client._semaphore("odsay")))
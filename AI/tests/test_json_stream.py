@@ -0,0 +1,79 @@
+import json
+
+from services.json_stream import ANY, StreamingJSONParser
+
+SCHEDULE = {
+    "aiEmpathy": "\"설렘\" 가득한\n여행 \\ 되세요 é",
+    "tags": ["힐링", "맛집"],
+    "plans": [
+        {"day": 1, "schedule": [{"placeId": "D1"}, {"placeId": "M1"}]},
+        {"day": 2, "schedule": [{"placeId": "D2"}]},
+    ],
+}
+WATCH = [("aiEmpathy",), ("tags",), ("plans", ANY, "schedule", ANY), ("plans", ANY)]
+
+
+def feed_all(parser, chunks):
+    completed = []
+    for chunk in chunks:
+        completed.extend(parser.feed(chunk))
+    return completed
+
+
+def split_every(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_same_values_for_any_chunk_size():
+    # ensure_ascii=True 로 \\uXXXX 이스케이프까지 포함, 크기 1이면 모든 이스케이프 중간에서 끊김
+    text = json.dumps(SCHEDULE, ensure_ascii=True)
+    expected = feed_all(StreamingJSONParser(WATCH), [text])
+    for size in (1, 2, 3, 7):
+        assert feed_all(StreamingJSONParser(WATCH), split_every(text, size)) == expected
+    assert dict(expected)[("aiEmpathy",)] == SCHEDULE["aiEmpathy"]
+
+
+def test_string_split_after_backslash_waits_for_closing_quote():
+    parser = StreamingJSONParser([("aiEmpathy",)])
+    assert parser.feed('{"aiEmpathy": "a\\') == []
+    assert parser.feed('"b') == []
+    assert parser.feed('"}') == [(("aiEmpathy",), 'a"b')]
+    assert parser.done
+
+
+def test_any_matches_each_index_in_order():
+    text = json.dumps(SCHEDULE, ensure_ascii=False)
+    completed = feed_all(StreamingJSONParser(WATCH), split_every(text, 5))
+    paths = [path for path, _ in completed]
+    assert paths == [
+        ("aiEmpathy",), ("tags",),
+        ("plans", 0, "schedule", 0), ("plans", 0, "schedule", 1), ("plans", 0),
+        ("plans", 1, "schedule", 0), ("plans", 1),
+    ]
+    assert completed[2][1] == {"placeId": "D1"}
+    assert completed[4][1] == SCHEDULE["plans"][0]
+
+
+def test_scalars_at_watched_paths():
+    parser = StreamingJSONParser([("count",), ("flags", ANY), ("plans", ANY, "day")])
+    chunks = ['{"count": 1', '23, "flags": [true, fa', 'lse,null], "plans": [{"day": 2}]', '}']
+    completed = feed_all(parser, chunks)
+    assert completed == [
+        (("count",), 123),
+        (("flags", 0), True), (("flags", 1), False), (("flags", 2), None),
+        (("plans", 0, "day"), 2),
+    ]
+
+
+def test_ignores_prose_and_fences_before_json():
+    parser = StreamingJSONParser([("tags",)])
+    completed = feed_all(parser, ['여행 일정입니다.\n```json\n{"ta', 'gs": ["힐링"]}\n```'])
+    assert completed == [(("tags",), ["힐링"])]
+    assert parser.done
+
+
+def test_broken_watched_value_is_skipped():
+    parser = StreamingJSONParser([("plans", ANY), ("count",)])
+    completed = feed_all(parser, ['{"plans": [{"day": }, {"day": 2}], "count": 1x}'])
+    assert completed == [(("plans", 1), {"day": 2})]
+    assert parser.skipped == 2
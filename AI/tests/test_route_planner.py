@@ -0,0 +1,69 @@
+from services import route_planner
+
+
+def place(place_id, place_type, lat, lon):
+    return {"placeId": place_id, "placeType": place_type, "latitude": lat, "longitude": lon}
+
+
+def full_day(prefix, lat=37.55, lon=126.98):
+    # 관광지 2, 맛집 2, 숙소 1 (서로 조금씩 떨어진 좌표)
+    return [
+        place(f"{prefix}-D1", "destination", lat, lon),
+        place(f"{prefix}-M1", "meal", lat + 0.01, lon),
+        place(f"{prefix}-D2", "destination", lat + 0.02, lon),
+        place(f"{prefix}-M2", "meal", lat + 0.03, lon),
+        place(f"{prefix}-A1", "accommodation", lat + 0.04, lon),
+    ]
+
+
+def slots(schedule):
+    return [(item["time"], item["placeType"]) for item in schedule]
+
+
+def test_plan_day_fills_fixed_slots_by_type():
+    schedule = route_planner.plan_day(full_day("d1"), None, is_last_day=False)
+    assert slots(schedule) == route_planner.DAY_SLOTS
+
+
+def test_plan_day_last_day_skips_lodging():
+    schedule = route_planner.plan_day(full_day("d1"), None, is_last_day=True)
+    assert slots(schedule) == route_planner.DAY_SLOTS[:-1]
+    assert all(item["placeType"] != "accommodation" for item in schedule)
+
+
+def test_plan_day_leaves_missing_types_empty():
+    items = [place("D1", "destination", 37.55, 126.98), place("A1", "accommodation", 37.56, 126.98)]
+    schedule = route_planner.plan_day(items, None, is_last_day=False)
+    assert slots(schedule) == [("09:00", "destination"), ("21:00", "accommodation")]
+
+
+def test_builder_starts_next_day_from_lodging():
+    builder = route_planner.ItineraryBuilder()
+    first = builder.add_day(1, full_day("d1"), is_last_day=False)
+    lodging = first["schedule"][-1]
+    assert builder.start == (lodging["latitude"], lodging["longitude"])
+
+    # 전날 숙소(위도 37.59)에 가까운 관광지가 첫 슬롯에 옴
+    second = builder.add_day(2, [
+        place("far", "destination", 37.40, 126.98),
+        place("near", "destination", 37.60, 126.98),
+    ], is_last_day=True)
+    assert [item["placeId"] for item in second["schedule"]] == ["near", "far"]
+
+
+def test_builder_drops_repeated_places_but_keeps_lodging():
+    builder = route_planner.ItineraryBuilder()
+    builder.add_day(1, full_day("d1"), is_last_day=False)
+    second = builder.add_day(2, full_day("d1"), is_last_day=False)
+    # 관광지/맛집은 전날과 겹쳐 빠지고 숙소(연박)만 남음
+    assert [item["placeId"] for item in second["schedule"]] == ["d1-A1"]
+
+
+def test_plan_schedule_uses_trip_days_for_last_day():
+    plans = [{"day": 1, "schedule": full_day("d1")}, {"day": 2, "schedule": full_day("d2", lat=37.45)}]
+    # 3일 여행에서 LLM이 2일치만 준 경우 2일차는 마지막 날이 아니므로 숙소 유지
+    planned = route_planner.plan_schedule(plans, trip_days=3)
+    assert slots(planned[1]["schedule"]) == route_planner.DAY_SLOTS
+
+    planned = route_planner.plan_schedule(plans, trip_days=2)
+    assert slots(planned[1]["schedule"]) == route_planner.DAY_SLOTS[:-1]
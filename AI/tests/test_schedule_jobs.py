@@ -0,0 +1,80 @@
+import asyncio
+from contextlib import nullcontext
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+import schemas
+from services import schedule_jobs
+
+REQUEST = schemas.ScheduleCreate(endCity="서울", startDate="2026-10-20", endDate="2026-10-21", emotions=["기쁜"])
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(schedule_jobs, "async_redis_client", client)
+    return client
+
+
+async def orphan_job(redis, process_id: str) -> tuple:
+    """다른 프로세스가 꺼내 처리하던 중인 작업을 만듦"""
+    job = await schedule_jobs.enqueue(REQUEST, None)
+    key = f"{schedule_jobs.PROCESSING_PREFIX}{process_id}:0"
+    await redis.lmove(schedule_jobs.QUEUE_KEY, key, "RIGHT", "LEFT")
+    await redis.hset(schedule_jobs.job_key(job["jobId"]), "status", "running")
+    await redis.sadd(schedule_jobs.PROCESSING_SET_KEY, key)
+    return job["jobId"], key
+
+
+def test_dead_worker_jobs_return_to_queue(redis):
+    async def scenario():
+        job_id, key = await orphan_job(redis, "dead")
+        assert await schedule_jobs.reap_dead_workers() == 1
+        return job_id, key, await redis.lrange(schedule_jobs.QUEUE_KEY, 0, -1)
+
+    job_id, key, queue = asyncio.run(scenario())
+    assert queue == [job_id]
+
+    async def check():
+        return (await redis.hget(schedule_jobs.job_key(job_id), "status"),
+                await redis.exists(key), await redis.smembers(schedule_jobs.PROCESSING_SET_KEY))
+
+    assert asyncio.run(check()) == ("queued", 0, set())
+
+
+def test_live_worker_jobs_are_kept(redis):
+    async def scenario():
+        _, key = await orphan_job(redis, "alive")
+        await redis.set(f"{schedule_jobs.ALIVE_PREFIX}alive", "1", ex=30)
+        assert await schedule_jobs.reap_dead_workers() == 0
+        return await redis.llen(key), await redis.llen(schedule_jobs.QUEUE_KEY)
+
+    assert asyncio.run(scenario()) == (1, 0)
+
+
+def test_worker_finishes_job_and_clears_processing_list(redis, monkeypatch):
+    class Result:
+        def json(self, **kwargs):
+            return '{"scheduleId": 1}'
+
+    async def create_ai_schedule(db, schedule, user_id, **kwargs):
+        return Result()
+
+    monkeypatch.setattr(schedule_jobs.schedule_service, "create_ai_schedule", create_ai_schedule)
+    monkeypatch.setattr(schedule_jobs, "AsyncSessionLocal", nullcontext)
+
+    async def scenario():
+        job = await schedule_jobs.enqueue(REQUEST, None)
+        await schedule_jobs.start(1)
+        try:
+            done = await schedule_jobs.wait_job(job["jobId"], timeout=5)
+        finally:
+            await schedule_jobs.stop()
+        return done, await redis.smembers(schedule_jobs.PROCESSING_SET_KEY), await redis.llen(schedule_jobs.QUEUE_KEY)
+
+    done, processing, depth = asyncio.run(scenario())
+    assert done["status"] == "done"
+    assert done["result"] == {"scheduleId": 1}
+    assert processing == set() and depth == 0
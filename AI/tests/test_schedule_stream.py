@@ -0,0 +1,85 @@
+import json
+import asyncio
+
+import pytest
+
+# 벤치마크와 같은 오프라인 환경: SQLite 샘플 DB(conftest) + fakeredis + OpenAI/ODSAY 대역
+pytest.importorskip("aiosqlite")
+pytest.importorskip("fakeredis")
+
+import httpx
+
+from bench import seed, standins
+
+standins.use_fake_redis()
+seed.ensure_seeded()
+
+import main
+from services import popularity
+
+REQUEST = {
+    "startDate": "2026-10-20",
+    "endDate": "2026-10-22",
+    "startCity": "서울",
+    "endCity": "서울",
+    "emotions": ["기쁜"],
+    "companions": ["친구"],
+    "peopleCount": 2,
+}
+
+
+def parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def run_requests():
+    # Redis 클라이언트 커넥션이 이벤트 루프에 묶이므로 모든 요청을 한 루프/lifespan에서 실행
+    async with main.app.router.lifespan_context(main.app):
+        standins.install(standins.Latency(5, 1), standins.Latency(5, 1))
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+            plain = await client.post("/ai/schedule", json=REQUEST)
+            streamed = await client.post("/ai/schedule/stream", json=REQUEST)
+    # lifespan 종료 시 ai_schedule_places 쓰기 큐가 flush되어 인기 카운터까지 반영됨
+    return plain, streamed, await popularity.top("24h", "서울", None, 50)
+
+
+@pytest.fixture(scope="module")
+def responses():
+    return asyncio.run(run_requests())
+
+
+def test_schedule_server_timing_names_are_unique(responses):
+    response = responses[0]
+    assert response.status_code == 200
+    # 라우터 단계별 시간 + 프로파일링 미들웨어 요청 합계가 한 헤더에 합쳐짐
+    names = [entry.split(";", 1)[0].strip() for entry in response.headers["server-timing"].split(",")]
+    assert len(names) == len(set(names)), names
+    assert {"llm", "req-llm", "req-db", "req-total"} <= set(names)
+
+
+def test_schedule_stream_emits_days_and_records_popularity(responses):
+    _, response, ranked = responses
+    assert response.status_code == 200
+
+    events = parse_sse(response.text)
+    names = [event for event, _ in events]
+    assert "error" not in names, events
+    assert names[-1] == "done"
+
+    days = [data for event, data in events if event == "day"]
+    assert [day["day"] for day in days] == [1, 2, 3]
+    assert all(day["schedule"] for day in days)
+    assert all(item["placeId"] for day in days for item in day["schedule"])
+    # 응답 스키마에는 분석용 cityKey가 나가지 않음
+    assert all("cityKey" not in item for day in days for item in day["schedule"])
+
+    done = events[-1][1]
+    assert len(done["plans"]) == 3
+
+    streamed = {item["placeId"] for day in days for item in day["schedule"]}
+    assert streamed <= {place_id for place_id, _ in ranked}